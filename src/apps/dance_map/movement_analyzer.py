@@ -16,9 +16,19 @@ from src.constants import (
 
 class MovementAnalyzer(BaseMovementAnalyzer):
     """Analyzes pose landmarks to detect specific movements"""
+
+    state_fields = BaseMovementAnalyzer.state_fields + (
+        "is_feet_stable", "feet_stable_counter",
+        "left_foot_stable", "left_foot_stable_counter", "left_foot_unstable_counter",
+        "right_foot_stable", "right_foot_stable_counter", "right_foot_unstable_counter",
+        "left_foot_square", "right_foot_square", "squares", "square_size", "has_mapped_squares",
+    )
     
     def __init__(self, config: MovementConfig, mp_pose, debug: bool = False):
         super().__init__(config, mp_pose, debug)
+
+        # The feet state below is updated on every analyzed frame
+        self.analyzer_landmarks = [LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX]
         
         # Initialize movement detectors
         self.movement_detectors = [
@@ -27,6 +37,7 @@ class MovementAnalyzer(BaseMovementAnalyzer):
 
         self.is_feet_stable = False;
         self.required_feet_stable_frames = 150
+        self.required_feet_stable_frames_per_30_fps = 20
         self.feet_stable_counter = 0
 
         # Threshold for feet proximity
@@ -41,6 +52,10 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         self.right_foot_square = None
 
         self.foot_stable_threshold = 0.007
+        self.left_foot_x = self.stability.add(LEFT_FOOT_INDEX, X_COORDINATE_INDEX, self.foot_stable_threshold)
+        self.left_foot_y = self.stability.add(LEFT_FOOT_INDEX, Y_COORDINATE_INDEX, self.foot_stable_threshold)
+        self.right_foot_x = self.stability.add(RIGHT_FOOT_INDEX, X_COORDINATE_INDEX, self.foot_stable_threshold)
+        self.right_foot_y = self.stability.add(RIGHT_FOOT_INDEX, Y_COORDINATE_INDEX, self.foot_stable_threshold)
 
         self.left_foot_stable = False
         self.left_foot_stable_counter = 0
@@ -62,24 +77,15 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         }
         self.has_mapped_squares = False
 
-    def _log_debug_info(self):
-        """Override of base class method for custom debug logging"""
-        if not self.debug:
-            return
-            
-        # Log foot positions and distances
-        left_foot = self.current_landmark_points[LEFT_FOOT_INDEX]
-        right_foot = self.current_landmark_points[RIGHT_FOOT_INDEX]
-        
-        # Get X, Y and Z distances for both feet
-        left_foot_x_dist, _ = self.get_points_distance(LEFT_FOOT_INDEX, X_COORDINATE_INDEX)
-        left_foot_y_dist, _ = self.get_points_distance(LEFT_FOOT_INDEX, Y_COORDINATE_INDEX)
-        left_foot_z_dist, _ = self.get_points_distance(LEFT_FOOT_INDEX, Z_COORDINATE_INDEX)
-        right_foot_x_dist, _ = self.get_points_distance(RIGHT_FOOT_INDEX, X_COORDINATE_INDEX)
-        right_foot_y_dist, _ = self.get_points_distance(RIGHT_FOOT_INDEX, Y_COORDINATE_INDEX)
-        right_foot_z_dist, _ = self.get_points_distance(RIGHT_FOOT_INDEX, Z_COORDINATE_INDEX)
-        
-        self.logger.debug(f"MovementAnalyzer: Foot distances - Left X: {left_foot_x_dist:.4f}, Y: {left_foot_y_dist:.4f}, Z: {left_foot_z_dist:.4f}, Right X: {right_foot_x_dist:.4f}, Y: {right_foot_y_dist:.4f}, Z: {right_foot_z_dist:.4f}")
+        # Per-frame feet values (foot distances are in the analyzer's distance trace)
+        self.feet_trace = None
+        if self.trace is not None:
+            self.feet_trace = self.trace.channel("feet", (
+                "feet_distance", "left_movement", "right_movement", "feet_close",
+                "stable_counter", "feet_stable",
+                "left_stable", "left_stable_counter", "left_unstable_counter",
+                "right_stable", "right_stable_counter", "right_unstable_counter",
+            ))
 
     def _update_feet_stability(self):
         """
@@ -90,11 +96,7 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         # Calculate distance between feet in all dimensions
         left_foot = self.current_landmark_points[LEFT_FOOT_INDEX]
         right_foot = self.current_landmark_points[RIGHT_FOOT_INDEX]
-        
-        if self.debug:
-            self.logger.debug(f"MovementAnalyzer: Left foot position: {left_foot}, Right foot position: {right_foot}")
-            self.logger.debug(f"MovementAnalyzer: Using proximity threshold: {self.feet_proximity_threshold}, movement threshold: {self.feet_movement_threshold}")
-        
+
         # Calculate Euclidean distance between feet
         feet_distance = np.linalg.norm(left_foot - right_foot)
         
@@ -106,54 +108,39 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         right_foot_movement_x, right_direction_x = self.get_points_distance(RIGHT_FOOT_INDEX, X_COORDINATE_INDEX)
         right_foot_movement_y, right_direction_y = self.get_points_distance(RIGHT_FOOT_INDEX, Y_COORDINATE_INDEX)
         # right_foot_movement_z, right_direction_z = self.get_points_distance(RIGHT_FOOT_INDEX, Z_COORDINATE_INDEX)
-        
-        if self.debug:
-            self.logger.debug(f"MovementAnalyzer: Left foot movement - X: {left_foot_movement_x:.4f} ({('smaller' if left_direction_x else 'larger')}), Y: {left_foot_movement_y:.4f} ({('smaller' if left_direction_y else 'larger')})")
-            self.logger.debug(f"MovementAnalyzer: Right foot movement - X: {right_foot_movement_x:.4f} ({('smaller' if right_direction_x else 'larger')}), Y: {right_foot_movement_y:.4f} ({('smaller' if right_direction_y else 'larger')})")
-        
+
         # Calculate total movement for each foot
         left_foot_movement = left_foot_movement_x + left_foot_movement_y
         right_foot_movement = right_foot_movement_x + right_foot_movement_y
         
         # Update individual foot stability status
-        self._update_foot_stability(LEFT_FOOT_INDEX, left_foot_movement_x, left_foot_movement_y)
-        self._update_foot_stability(RIGHT_FOOT_INDEX, right_foot_movement_x, right_foot_movement_y)
+        stability = self.stability
+        self.left_foot_stable, self.left_foot_stable_counter, self.left_foot_unstable_counter = self._update_foot_stability(
+            stability.held(self.left_foot_x) and stability.held(self.left_foot_y),
+            self.left_foot_stable, self.left_foot_stable_counter, self.left_foot_unstable_counter)
+        self.right_foot_stable, self.right_foot_stable_counter, self.right_foot_unstable_counter = self._update_foot_stability(
+            stability.held(self.right_foot_x) and stability.held(self.right_foot_y),
+            self.right_foot_stable, self.right_foot_stable_counter, self.right_foot_unstable_counter)
 
-        if self.debug:
-            self.logger.debug(f"MovementAnalyzer: Total movements - Left: {left_foot_movement:.4f}, Right: {right_foot_movement:.4f}, Distance between feet: {feet_distance:.4f}")
-            self.logger.debug(f"MovementAnalyzer: Feet movement threshold: {self.feet_movement_threshold}")
-        
         # Check if feet are close and not moving
         feet_close = feet_distance < self.feet_proximity_threshold
         left_foot_stable = left_foot_movement < self.feet_movement_threshold
         right_foot_stable = right_foot_movement < self.feet_movement_threshold
-        
-        if self.debug:
-            self.logger.debug(f"MovementAnalyzer: Stability conditions - Feet close: {feet_close}, Left foot stable: {left_foot_stable}, Right foot stable: {right_foot_stable}")
-        
+
         if (feet_close and left_foot_stable and right_foot_stable):
             
             self.feet_stable_counter += 1
-            
-            if self.debug:
-                self.logger.debug(f"MovementAnalyzer: All stability conditions met! Feet stability counter: {self.feet_stable_counter}/{self.required_feet_stable_frames}")
-                if self.feet_stable_counter % 10 == 0 or self.feet_stable_counter == 1:  # Print less frequently for long counts
-                    self.logger.debug(f"MovementAnalyzer: Feet distance: {feet_distance:.4f}, Left movement: {left_foot_movement:.4f}, Right movement: {right_foot_movement:.4f}")
-            
+
             # Check if stable for required frames
-            if self.feet_stable_counter >= self.required_feet_stable_frames:
+            if self.held_long_enough(self.feet_stable_counter, self.required_feet_stable_frames,
+                                     self.required_feet_stable_frames_per_30_fps):
                 was_stable = self.is_feet_stable
                 self.is_feet_stable = True
-                if self.debug:
-                    if not was_stable:
-                        self.logger.debug("MovementAnalyzer: STABILITY ACHIEVED - Feet are now stable")
-                    else:
-                        self.logger.debug("MovementAnalyzer: Feet remain stable")
+                if self.debug and not was_stable:
+                    self.logger.debug("MovementAnalyzer: STABILITY ACHIEVED - Feet are now stable")
         else:
             # Reset counter if feet are moving or not close
             if self.feet_stable_counter > 0:
-                if self.debug:
-                    self.logger.debug(f"MovementAnalyzer: Reset feet stability counter ({self.feet_stable_counter} frames). Reason(s): {'Feet too far apart' if not feet_close else ''}{', Left foot moving' if not left_foot_stable else ''}{', Right foot moving' if not right_foot_stable else ''}")
                 self.feet_stable_counter = 0
                 
             if self.is_feet_stable:
@@ -162,52 +149,33 @@ class MovementAnalyzer(BaseMovementAnalyzer):
                     self.logger.debug("MovementAnalyzer: STABILITY LOST - Feet are no longer stable")
                 # Reset square mapping when stability is lost
 
-    def _update_foot_stability(self, foot_index, x_movement, y_movement):
+        if self.feet_trace is not None:
+            self.feet_trace.record((
+                feet_distance, left_foot_movement, right_foot_movement, feet_close,
+                self.feet_stable_counter, self.is_feet_stable,
+                self.left_foot_stable, self.left_foot_stable_counter, self.left_foot_unstable_counter,
+                self.right_foot_stable, self.right_foot_stable_counter, self.right_foot_unstable_counter,
+            ))
+
+    def _update_foot_stability(self, is_foot_stable: bool, stable: bool, stable_counter: int,
+                               unstable_counter: int) -> Tuple[bool, int, int]:
         """
-        Updates the stability status for an individual foot based on x and y coordinate movement
+        Advances the stability state of an individual foot
         
         Args:
-            foot_index (int): The index of the foot to check (LEFT_FOOT_INDEX or RIGHT_FOOT_INDEX)
-            x_movement (float): The movement in x coordinate
-            y_movement (float): The movement in y coordinate
+            is_foot_stable (bool): Whether the foot's x and y movement are both below foot_stable_threshold
+            stable, stable_counter, unstable_counter: Current state of the foot
+
+        Returns:
+            The new (stable, stable_counter, unstable_counter)
         """
-        # Check if x and y movements are below threshold
-        is_foot_stable = (x_movement < self.foot_stable_threshold and 
-                          y_movement < self.foot_stable_threshold)
-        
-        # Handle left foot
-        if foot_index == LEFT_FOOT_INDEX:
-            if is_foot_stable:
-                # Only consider foot as stable if it was unstable for at least 2 frames
-                if self.left_foot_unstable_counter >= 2 or self.left_foot_stable:
-                    self.left_foot_stable_counter += 1
-                    self.left_foot_stable = True
-                    # Reset unstable counter when foot becomes stable
-                    self.left_foot_unstable_counter = 0
-            else:
-                # Increment unstable counter
-                self.left_foot_unstable_counter += 1
-                if self.left_foot_stable_counter > 0:
-                    self.left_foot_stable_counter = 0
-                if self.left_foot_stable:
-                    self.left_foot_stable = False
-                          
-        # Handle right foot
-        elif foot_index == RIGHT_FOOT_INDEX:
-            if is_foot_stable:
-                # Only consider foot as stable if it was unstable for at least 2 frames
-                if self.right_foot_unstable_counter >= 2 or self.right_foot_stable:
-                    self.right_foot_stable_counter += 1
-                    self.right_foot_stable = True
-                    # Reset unstable counter when foot becomes stable
-                    self.right_foot_unstable_counter = 0
-            else:
-                # Increment unstable counter
-                self.right_foot_unstable_counter += 1
-                if self.right_foot_stable_counter > 0:
-                    self.right_foot_stable_counter = 0
-                if self.right_foot_stable:
-                    self.right_foot_stable = False
+        if is_foot_stable:
+            # Only consider foot as stable if it was unstable for at least 2 frames
+            if unstable_counter >= 2 or stable:
+                # Reset unstable counter when foot becomes stable
+                return True, stable_counter + 1, 0
+            return stable, stable_counter, unstable_counter
+        return False, 0, unstable_counter + 1
 
     def set_square_dimensions(self, square_name, width=None, height=None):
         """
@@ -366,12 +334,7 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         
         left_foot = self.current_landmark_points[LEFT_FOOT_INDEX]
         right_foot = self.current_landmark_points[RIGHT_FOOT_INDEX]
-        
-        if self.debug:
-            # Log foot stability status
-            self.logger.debug(f"MovementAnalyzer: Left foot stable: {self.left_foot_stable}, stable counter: {self.left_foot_stable_counter}, unstable counter: {self.left_foot_unstable_counter}")
-            self.logger.debug(f"MovementAnalyzer: Right foot stable: {self.right_foot_stable}, stable counter: {self.right_foot_stable_counter}, unstable counter: {self.right_foot_unstable_counter}")
-        
+
         # Original commented code below
         # if self.debug:
         #     if left_foot_square != "outside":
@@ -386,7 +349,7 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         pass
     
     def update_before_detect(self, landmark_points):
-        self.required_feet_stable_frames = self.get_per_30_fps(20)
+        self.required_feet_stable_frames = self.get_per_30_fps(self.required_feet_stable_frames_per_30_fps)
         self._update_feet_stability()
         
         # Map squares and track feet positions when stability is achieved
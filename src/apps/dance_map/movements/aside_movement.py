@@ -8,6 +8,10 @@ if TYPE_CHECKING:
 class AsideMovement(BaseMovement):
     """Detects step movements (left or right)."""
 
+    required_joints = (LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX)
+    state_fields = ("stable_counter_left_foot", "stable_counter_right_foot", "is_left_foot_stable_x",
+                    "is_right_foot_stable_x", "is_stable_for_detection")
+
     def __init__(self, analyzer: 'MovementAnalyzer', debug: bool = False):
         super().__init__(analyzer, debug)
 
@@ -1,9 +1,22 @@
+import copy
 from abc import ABC, abstractmethod
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Tuple, Dict
 
 class BaseMovement(ABC):
     """Abstract base class for movement detection."""
 
+    # When detect() cannot succeed, so the analyzer's DetectorScheduler can skip it
+    min_motion_energy: Optional[float] = None  # Every detectable move needs a tracked joint coordinate to move more than this
+    idle_in_motion: bool = False  # detect() returns None while is_in_motion
+    cooldown: float = 0.0  # Seconds after a detection before detect() may fire again
+
+    # Landmarks the detector reads: the analyzer tracks their movement and only updates and runs the
+    # detector on frames where all of them are visible
+    required_joints: Tuple[int, ...] = ()
+
+    # Attributes that change while detecting, saved by snapshot() along with is_in_motion
+    state_fields: Tuple[str, ...] = ()
+
     def __init__(self, analyzer: Any, debug: bool = False):
         self.analyzer = analyzer
         self.config = analyzer.config
@@ -37,6 +50,16 @@ class BaseMovement(ABC):
         pass
     
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the detector's state, restorable with restore()"""
+        return {name: copy.deepcopy(getattr(self, name)) for name in ("is_in_motion",) + self.state_fields}
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Restore a state returned by snapshot(); attributes missing from it are left as they are"""
+        for name in ("is_in_motion",) + self.state_fields:
+            if name in state:
+                setattr(self, name, copy.deepcopy(state[name]))
+
     def on_movement_detected(self) -> None:
         """Called by MovementAnalyzer when this movement is detected."""
         self.is_in_motion = True
@@ -8,6 +8,8 @@ if TYPE_CHECKING:
 class LinearMovement(BaseMovement):
     """Detects step movements (left or right)."""
 
+    required_joints = (LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX)
+
     def __init__(self, analyzer: 'MovementAnalyzer', debug: bool = False):
         super().__init__(analyzer, debug)
 
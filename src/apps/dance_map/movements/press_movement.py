@@ -1,6 +1,6 @@
 from typing import Optional, Tuple, TYPE_CHECKING, List
 from .base_movement import BaseMovement
-from src.constants import STEP_RIGHT, STEP_LEFT, FORWARD, BACKWARD
+from src.constants import LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX, STEP_RIGHT, STEP_LEFT, FORWARD, BACKWARD
 
 if TYPE_CHECKING:
     from src.apps.dance_map.movement_analyzer import MovementAnalyzer # To avoid circular import
@@ -8,6 +8,10 @@ if TYPE_CHECKING:
 class PressMovement(BaseMovement):
     """Detects step movements (left or right)."""
 
+    # Reads the analyzer's per-foot state
+    required_joints = (LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX)
+    state_fields = ("last_detected_move", "last_detection_time")
+
     def __init__(self, analyzer: 'MovementAnalyzer', debug: bool = False):
         super().__init__(analyzer, debug)
         
@@ -0,0 +1,233 @@
+import time
+import logging
+from dataclasses import replace
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import MovementConfig
+from .movement_analyzer import MovementAnalyzer
+
+
+class BatchMovementAnalyzer:
+    """Analyzes K pose streams in lockstep, one frame of every stream per call
+
+    State is kept as (K, ...) arrays for all streams together:
+    - a landmark history ring per stream, with hidden landmarks held at their
+      last visible position
+    - the distance/direction table
+    - the stability counters
+    - the detectors' in-motion flags
+
+    analyze_frame() moves every stream whose frame passes its visibility gate
+    forward with the same array operations. Streams whose frame is dropped
+    keep their state, as a MovementAnalyzer does.
+
+    Detection follows the app's rules file, the declarative form of the
+    step, jump and bend detectors. The stability counters of all streams
+    advance in one StabilityTracker.step, and the rules are then evaluated
+    for all streams in one pass of MovementRules.evaluate.
+    The rules, the stability pairs, the tracked joints and the per-detector
+    visibility masks are compiled once by a single-stream MovementAnalyzer
+    and read through its public interface (compiled_layout(), its rules and
+    its stability tracker). Each stream then gets the events that analyzer
+    would report for the same frames.
+
+    Only frame-based windows are supported. Time-based windows and landmark
+    smoothing step each stream with its own timing, and the onset jump
+    detector has no rule form. Base height, which no detector reads, is not
+    tracked.
+    """
+
+    def __init__(self, config: MovementConfig, mp_pose, num_streams: int, fps: float = 30.0):
+        if num_streams < 1:
+            raise ValueError("num_streams must be at least 1")
+        if config.time_based_windows:
+            raise ValueError("BatchMovementAnalyzer supports frame-based windows only")
+        if config.landmark_smoothing:
+            raise ValueError("BatchMovementAnalyzer does not support landmark_smoothing")
+        if config.jump_detector != "window":
+            raise ValueError("BatchMovementAnalyzer only supports the window jump detector")
+
+        self.config = config
+        self.num_streams = num_streams
+        self.logger = logging.getLogger('BatchMovementAnalyzer')
+
+        # Compiles the rules and registers their stability pairs; its arrays are shared by all streams
+        self._template = MovementAnalyzer(
+            replace(config, movement_rules=True, detector_scheduling=False, trace_enabled=False, sound_enabled=False),
+            mp_pose,
+        )
+        template = self._template
+        layout = template.compiled_layout(fps)
+        self.rules = template.rules
+        self.stability = template.stability
+        self.window = layout.window
+        self._joints = layout.tracked_joints
+        self._required_masks = layout.required_masks
+        self._analyzer_landmarks = layout.analyzer_landmarks
+
+        # Rule outputs of each detector, and the detector whose in-motion state a move sets
+        detectors = template.movement_detectors
+        self.detector_names = [detector.name for detector in detectors]
+        self._resets = [detector.rule.reset for detector in detectors]
+        self._readies = [detector.rule.ready for detector in detectors]
+        self.move_names: List[str] = []
+        self._detector_moves: List[List[Tuple[int, int]]] = []  # (move index, condition) per detector
+        for detector in detectors:
+            moves = []
+            for move, condition in detector.rule.moves:
+                if move not in self.move_names:
+                    self.move_names.append(move)
+                moves.append((self.move_names.index(move), condition))
+            self._detector_moves.append(moves)
+        # Like MovementAnalyzer.movement_type_map: the last detector listing a move owns it
+        owners = {}
+        for index, detector in enumerate(detectors):
+            for move in detector.detectable_moves:
+                owners[move] = index
+        self._move_owner = np.array([owners[move] for move in self.move_names], dtype=np.intp)
+
+        num_landmarks = len(template.landmark_array)
+        num_joints = len(self._joints)
+        self._frames = np.zeros((num_streams, self.window, num_landmarks, 3))
+        self._newest = np.full(num_streams, self.window - 1, dtype=np.intp)  # Ring slot of each stream's newest frame
+        self.last_visible_points = np.zeros((num_streams, num_landmarks, 3))
+        self.landmark_seen = np.zeros((num_streams, num_landmarks), dtype=bool)
+        self.frame_counter = np.zeros(num_streams, dtype=np.int64)  # Analyzed frames per stream
+        self.frame_time = np.zeros(num_streams)
+        self.last_detection_time = np.zeros(num_streams)
+        self.points_delta = np.zeros((num_streams, num_joints, 3))
+        self.points_direction = np.zeros((num_streams, num_joints, 3), dtype=bool)
+        self.counters = np.zeros((num_streams, len(template.stability)), dtype=np.int64)
+        self.in_motion = np.zeros((num_streams, len(detectors)), dtype=bool)
+
+    def reset_stream(self, stream: int) -> None:
+        """Forget one stream's state, e.g. when a new player takes over its station"""
+        self._newest[stream] = self.window - 1
+        self.last_visible_points[stream] = 0.0
+        self.landmark_seen[stream] = False
+        self.frame_counter[stream] = 0
+        self.frame_time[stream] = 0.0
+        self.last_detection_time[stream] = 0.0
+        self.points_delta[stream] = 0.0
+        self.points_direction[stream] = False
+        self.counters[stream] = 0
+        self.in_motion[stream] = False
+
+    def analyze_frame(self, landmarks: np.ndarray, timestamps: Optional[np.ndarray] = None) -> List[Optional[str]]:
+        """Analyze one frame of every stream and return each stream's movement (or None)
+
+        Args:
+            landmarks: (K, 33, 4) array of x, y, z, visibility per stream; streams
+                without a pose in this frame can be all NaN
+            timestamps: (K,) capture times in seconds (defaults to now)
+        """
+        landmarks = np.asarray(landmarks)
+        if landmarks.shape[0] != self.num_streams:
+            raise ValueError(f"expected landmarks for {self.num_streams} streams, got {landmarks.shape[0]}")
+        if timestamps is None:
+            timestamps = np.full(self.num_streams, time.time())
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        movements: List[Optional[str]] = [None] * self.num_streams
+
+        # Visibility gate per stream and detector (NaN compares as not visible)
+        visible = landmarks[:, :, 3].astype(np.float64) >= self.config.visibility_threshold
+        detector_visible = (visible[:, None, :] >= self._required_masks).all(axis=2)
+        analyzed = visible[:, self._analyzer_landmarks].all(axis=1)
+        if len(self._resets):
+            analyzed &= detector_visible.any(axis=1)
+        streams = np.flatnonzero(analyzed)
+        if not len(streams):
+            return movements
+        detector_visible = detector_visible[streams]
+        visible = visible[streams]
+        times = timestamps[streams]
+        self.frame_counter[streams] += 1
+        self.frame_time[streams] = times
+
+        # Hidden landmarks keep their last visible position, as in MovementAnalyzer
+        points = landmarks[streams, :, :3].astype(np.float64)
+        seen = self.landmark_seen[streams]
+        held = seen & ~visible
+        last_visible_points = self.last_visible_points[streams]
+        points[held] = last_visible_points[held]
+        np.copyto(last_visible_points, points, where=visible[:, :, None])
+        self.last_visible_points[streams] = last_visible_points
+        first_seen = np.nonzero(visible & ~seen)
+        self.landmark_seen[streams] = seen | visible
+
+        # History: push the frame, backfill landmarks seen for the first time, then compare
+        # the tracked joints with the start of the distance window
+        slots = (self._newest[streams] + 1) % self.window
+        self._frames[streams, slots] = points
+        self._newest[streams] = slots
+        if len(first_seen[0]):
+            self._frames[streams[first_seen[0]], :, first_seen[1]] = points[first_seen][:, None, :]
+        frames_back = np.minimum(self.frame_counter[streams], self.window) - 1
+        oldest_slots = (slots - frames_back) % self.window
+        current = self._frames[streams[:, None], slots[:, None], self._joints]
+        oldest = self._frames[streams[:, None], oldest_slots[:, None], self._joints]
+        directions = current < oldest
+        deltas = np.round(np.abs(current - oldest), 3)
+        self.points_delta[streams] = deltas
+        self.points_direction[streams] = directions
+
+        # Stability counters, then the rule outputs on them
+        num_analyzed = len(streams)
+        counters, held = self.stability.step(self.counters[streams], deltas, directions, visible)
+        self.counters[streams] = counters
+        values = self.rules.evaluate(deltas.reshape(num_analyzed, -1), directions.reshape(num_analyzed, -1),
+                                     counters, held)
+
+        # Detector updates: reset conditions clear the in-motion state
+        in_motion = self.in_motion[streams]
+        in_motion &= ~(detector_visible & values[:, self._resets])
+
+        # Detection: the first ready detector with a holding move, unless a movement is in motion
+        if self.config.allow_multiple_movements:
+            free = np.ones(num_analyzed, dtype=bool)
+        else:
+            free = ~in_motion.any(axis=1)
+        detected = np.full(num_analyzed, -1, dtype=np.intp)
+        for index, moves in enumerate(self._detector_moves):
+            ready = free & detector_visible[:, index] & ~in_motion[:, index] & values[:, self._readies[index]]
+            for move, condition in moves:
+                hit = ready & values[:, condition]
+                detected[hit] = move
+                ready &= ~hit
+                free &= ~hit
+
+        hits = np.flatnonzero(detected >= 0)
+        if len(hits):
+            in_motion[hits, self._move_owner[detected[hits]]] = True
+            self.last_detection_time[streams[hits]] = times[hits]
+            for position, move in zip(hits.tolist(), detected[hits].tolist()):
+                movements[streams[position]] = self.move_names[move]
+        self.in_motion[streams] = in_motion
+        return movements
+
+    def analyze_sequences(self, landmarks: np.ndarray,
+                          timestamps: Optional[np.ndarray] = None) -> List[List[Tuple[int, str]]]:
+        """Analyze T frames of every stream and return each stream's movements as (frame index, movement)
+
+        Args:
+            landmarks: (T, K, 33, 4) array, frame by frame
+            timestamps: (T,) or (T, K) capture times in seconds (defaults to frame index / fps)
+        """
+        landmarks = np.asarray(landmarks)
+        num_frames = len(landmarks)
+        if timestamps is None:
+            timestamps = np.arange(num_frames) / self._template.current_fps
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(timestamps) != num_frames:
+            raise ValueError("timestamps must have one entry per frame")
+        if timestamps.ndim == 1:
+            timestamps = np.repeat(timestamps[:, None], self.num_streams, axis=1)
+
+        events: List[List[Tuple[int, str]]] = [[] for _ in range(self.num_streams)]
+        for frame_index in range(num_frames):
+            for stream, movement in enumerate(self.analyze_frame(landmarks[frame_index], timestamps[frame_index])):
+                if movement:
+                    events[stream].append((frame_index, movement))
+        return events
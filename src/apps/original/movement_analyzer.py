@@ -1,3 +1,4 @@
+import os
 import numpy as np
 import time
 import logging
@@ -6,9 +7,12 @@ import mediapipe as mp
 from config import MovementConfig
 from .movements.step_movement import StepMovement
 from .movements.jump_movement import JumpMovement
+from .movements.jump_onset_movement import JumpOnsetMovement
 from .movements.bend_movement import BendMovement
 from .movements.base_movement import BaseMovement
-from src.base_movement_analyzer import BaseMovementAnalyzer
+from .movements.rule_movement import RuleMovement
+from src.base_movement_analyzer import BaseMovementAnalyzer, TIME_TOLERANCE
+from src.movement_rules import MovementRules
 
 from src.constants import (
     LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX, NOSE_INDEX, 
@@ -20,6 +24,17 @@ from src.constants import (
     STEP_RIGHT, STEP_LEFT, JUMP, BEND
 )
 
+RULES_PATH = os.path.join(os.path.dirname(__file__), "rules.json")
+
+# Landmarks of the straight pose check; base height is only measured on frames where all are visible
+STRAIGHT_POSE_LANDMARKS = [
+    NOSE_INDEX,
+    LEFT_SHOULDER_INDEX, RIGHT_SHOULDER_INDEX,
+    LEFT_HIP_INDEX, RIGHT_HIP_INDEX,
+    LEFT_KNEE_INDEX, RIGHT_KNEE_INDEX,
+    LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX,
+]
+
 class MovementAnalyzer(BaseMovementAnalyzer):
     """Analyzes pose landmarks to detect specific movements"""
     
@@ -27,11 +42,16 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         super().__init__(config, mp_pose, debug)
         print(f"MovementAnalyzer __init__: config={config}")
         # Initialize movement detectors
-        self.movement_detectors = [
-            StepMovement(self, debug=True),
-            JumpMovement(self, debug=False),
-            BendMovement(self, debug=False)
-        ]
+        self.rules: Optional[MovementRules] = None
+        if config.movement_rules:
+            self.rules = MovementRules.load(self, RULES_PATH)
+            self.movement_detectors = [RuleMovement(self, rule) for rule in self.rules.movements]
+        else:
+            self.movement_detectors = [
+                StepMovement(self, debug=True),
+                JumpOnsetMovement(self, debug=False) if config.jump_detector == "onset" else JumpMovement(self, debug=False),
+                BendMovement(self, debug=False)
+            ]
             
     def _try_set_base_height(self, landmark_points: np.ndarray) -> None:
         """
@@ -40,6 +60,8 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         """
         if self.base_height is not None:
             return
+        if not self.landmark_visible[STRAIGHT_POSE_LANDMARKS].all():
+            return
 
         # Ensure enough frames have been processed for a meaningful stillness check
         # self.config.num_frames_to_check_per_30_fps should ideally be > 1
@@ -78,9 +100,13 @@ class MovementAnalyzer(BaseMovementAnalyzer):
         is_horizontally_aligned = x_spread < self.config.straight_pose_x_spread_threshold
 
         # Check for stillness (nose movement)
-        # landmark_points is current, self.prev_landmarks[self.config.num_frames_to_check_per_30_fps - 1] is oldest
+        # landmark_points is current (not pushed to the history yet), the history frame below is the oldest checked
         nose_current_pos_xy = landmark_points[NOSE_INDEX][:2] 
-        nose_prev_pos_xy = self.prev_landmarks[self.config.num_frames_to_check_per_30_fps - 1][NOSE_INDEX][:2]
+        if self.time_based_windows:
+            prev_points = self.landmark_history.at_time(self.frame_time - self.motion_window + TIME_TOLERANCE)
+        else:
+            prev_points = self.landmark_history.ago(self.config.num_frames_to_check_per_30_fps - 1)
+        nose_prev_pos_xy = prev_points[NOSE_INDEX][:2]
         nose_movement = np.linalg.norm(nose_current_pos_xy - nose_prev_pos_xy)
         is_still = nose_movement < self.config.stillness_threshold
 
@@ -113,6 +139,18 @@ class MovementAnalyzer(BaseMovementAnalyzer):
             return
             
 
+    def _joints_to_track(self) -> List[int]:
+        joints = super()._joints_to_track()
+        if self.rules is not None:
+            # Conditions no movement uses are still evaluated
+            joints = list(dict.fromkeys(joints + [int(joint) for joint in self.rules.joints()]))
+        return joints
+
+    def update_is_stable_general(self) -> bool:
+        if self.rules is not None:
+            self.rules.update()
+        return super().update_is_stable_general()
+
     def map_core_data(self, landmark_points):
         self._try_set_base_height(landmark_points)
         super().map_core_data(landmark_points)
@@ -0,0 +1,120 @@
+from typing import Optional, TYPE_CHECKING, List
+from .base_movement import BaseMovement
+from src.feature_store import CENTER
+from src.constants import (
+    LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX, Y_COORDINATE_INDEX, X_COORDINATE_INDEX,
+    NOSE_INDEX, JUMP, LEFT_HIP_INDEX, RIGHT_HIP_INDEX
+)
+
+if TYPE_CHECKING:
+    from src.apps.original.movement_analyzer import MovementAnalyzer # To avoid circular import
+
+class JumpOnsetMovement(BaseMovement):
+    """Detects jumps at takeoff, from the upward velocity and acceleration of the hips and nose.
+
+    JumpMovement waits for the heels to rise over the whole distance window;
+    this detector fires as soon as the body is pushed up. Velocities and
+    acceleration come from the analyzer's feature store over a two-frame
+    span, in units per second so they hold at any frame rate.
+    """
+
+    trace_fields = ("hip_velocity", "nose_velocity", "hip_acceleration", "feet_stable", "left_ground", "in_motion")
+    idle_in_motion = True
+    required_joints = (LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX, LEFT_HIP_INDEX, RIGHT_HIP_INDEX, NOSE_INDEX)
+    state_fields = ("left_ground", "detection_time")
+
+    def __init__(self, analyzer: 'MovementAnalyzer', debug: bool = False):
+        super().__init__(analyzer, debug)
+
+        self.require_stable_frames = 3
+        self.foot_stable_distance = 0.01
+        self.hip_x_distance_to_outrange = 0.01
+
+        # After a detection the feet must leave their stable position before landing re-arms the detector;
+        # a takeoff that never leaves the ground re-arms after cooldown_period
+        self.left_ground: bool = False
+        self.detection_time: float = 0.0
+
+        # Foot X and Y stability, counted by the analyzer (shared with JumpMovement's pairs)
+        stability = analyzer.stability
+        required_frames = self.require_stable_frames
+        self.foot_pairs = [
+            stability.add(joint, axis, self.foot_stable_distance, required_frames)
+            for joint in (LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX)
+            for axis in (Y_COORDINATE_INDEX, X_COORDINATE_INDEX)
+        ]
+        self.stability = stability
+
+        # Velocities over two frames, from the analyzer's feature store
+        self.features = analyzer.features
+        self.window = self.features.add_window(2)
+        self.hip_velocity = 0.0
+        self.nose_velocity = 0.0
+        self.hip_acceleration = 0.0
+
+    @property
+    def detectable_moves(self) -> List[str]:
+        """Returns the list of movement types this detector can detect."""
+        return [JUMP]
+
+    def _feet_stable(self) -> bool:
+        """Whether at least one foot is stable on both axes"""
+        held = self.stability.held
+        left_y, left_x, right_y, right_x = self.foot_pairs
+        return (held(left_y) and held(left_x)) or (held(right_y) and held(right_x))
+
+    def _update_kinematics(self) -> None:
+        """Upward hip center and nose velocity and hip center acceleration from the analyzer's feature store"""
+        features = self.features
+        window = self.window
+        # y grows downwards, so upward is negative y
+        self.hip_velocity = -features.get_velocity(CENTER, Y_COORDINATE_INDEX, window)
+        self.nose_velocity = -features.get_velocity(NOSE_INDEX, Y_COORDINATE_INDEX, window)
+        self.hip_acceleration = -features.get_acceleration(CENTER, Y_COORDINATE_INDEX, window)
+
+    def update_stability_and_motion_status(self) -> None:
+        """Re-arms the detector once the feet land again after a detected jump."""
+        feet_stable = self._feet_stable()
+        if self.is_in_motion:
+            if not feet_stable:
+                self.left_ground = True
+            elif self.left_ground or self.analyzer.frame_time - self.detection_time >= self.config.cooldown_period:
+                if self.debug:
+                    self.logger.debug("JumpOnsetMovement: Resetting is_in_motion because the feet are stable again.")
+                self.is_in_motion = False
+
+        if self.trace is not None:
+            self._update_kinematics()
+            self.trace.record((
+                self.hip_velocity, self.nose_velocity, self.hip_acceleration,
+                feet_stable, self.left_ground, self.is_in_motion,
+            ))
+
+    def detect(self) -> Optional[str]:
+        """Detects a jump when the hips and nose accelerate upwards."""
+        if self.is_in_motion:
+            return None
+        self._update_kinematics()
+
+        # Sideways hip movement is a step, not a takeoff
+        left_hip_distance_x, left_hip_dir_left = self.analyzer.get_points_distance(LEFT_HIP_INDEX, X_COORDINATE_INDEX)
+        right_hip_distance_x, right_hip_dir_left = self.analyzer.get_points_distance(RIGHT_HIP_INDEX, X_COORDINATE_INDEX)
+        if left_hip_dir_left and left_hip_distance_x > self.hip_x_distance_to_outrange:
+            return None
+        if not right_hip_dir_left and right_hip_distance_x > self.hip_x_distance_to_outrange:
+            return None
+
+        if (self.hip_velocity > self.config.jump_onset_velocity and
+            self.nose_velocity > self.config.jump_onset_velocity and
+            self.hip_acceleration > self.config.jump_onset_acceleration):
+            if self.debug:
+                self.logger.debug(f"JumpOnsetMovement: Jump detected - hip velocity {self.hip_velocity:.3f}, "
+                                  f"nose velocity {self.nose_velocity:.3f}, hip acceleration {self.hip_acceleration:.2f}")
+            return JUMP
+
+        return None
+
+    def on_movement_detected(self) -> None:
+        super().on_movement_detected()
+        self.left_ground = False
+        self.detection_time = self.analyzer.frame_time
@@ -0,0 +1,54 @@
+from typing import Optional, TYPE_CHECKING, List
+from .base_movement import BaseMovement
+from src.movement_rules import MovementRule
+
+if TYPE_CHECKING:
+    from src.apps.original.movement_analyzer import MovementAnalyzer # To avoid circular import
+
+class RuleMovement(BaseMovement):
+    """Detects the moves of one movement of the analyzer's rules file."""
+
+    trace_fields = ("ready", "in_motion")
+    idle_in_motion = True
+
+    def __init__(self, analyzer: 'MovementAnalyzer', rule: MovementRule, debug: bool = False):
+        self.rule = rule
+        self.rules = analyzer.rules
+        self._moves = [move for move, _ in rule.moves]
+        floors = [self.rules.motion_floor(condition) for _, condition in rule.moves]
+        if None not in floors:
+            self.min_motion_energy = min(floors)
+        self.required_joints = tuple(self.rules.joints([rule.reset, rule.ready] + [condition for _, condition in rule.moves]))
+        super().__init__(analyzer, debug)
+
+    @property
+    def name(self) -> str:
+        return self.rule.name
+
+    @property
+    def detectable_moves(self) -> List[str]:
+        """Returns the list of movement types this detector can detect."""
+        return self._moves
+
+    def update_stability_and_motion_status(self) -> None:
+        """Resets is_in_motion when the rule's reset condition holds (the analyzer evaluated the rules already)."""
+        values = self.rules.values
+        if values[self.rule.reset] and self.is_in_motion:
+            if self.debug:
+                self.logger.debug(f"RuleMovement: Resetting {self.rule.name} is_in_motion")
+            self.is_in_motion = False
+
+        if self.trace is not None:
+            self.trace.record((values[self.rule.ready], self.is_in_motion))
+
+    def detect(self) -> Optional[str]:
+        """Returns the first move whose condition holds, if the movement is ready."""
+        values = self.rules.values
+        if self.is_in_motion or not values[self.rule.ready]:
+            return None
+        for move, condition in self.rule.moves:
+            if values[condition]:
+                if self.debug:
+                    self.logger.debug(f"RuleMovement: {move} detected")
+                return move
+        return None
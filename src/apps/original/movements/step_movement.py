@@ -8,16 +8,25 @@ if TYPE_CHECKING:
 class StepMovement(BaseMovement):
     """Detects step movements (left or right)."""
 
+    trace_fields = ("left_foot_counter", "right_foot_counter", "stable", "right_criterion", "in_motion")
+    idle_in_motion = True
+    required_joints = (LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX)
+    state_fields = ("is_stable_for_detection",)
+
     def __init__(self, analyzer: 'MovementAnalyzer', debug: bool = False):
         super().__init__(analyzer, debug)
 
-        # Stability counters and flags
-        self.stable_counter_left_foot: int = 0
-        self.stable_counter_right_foot: int = 0
-        self.is_left_foot_stable_x: bool = True
-        self.is_right_foot_stable_x: bool = True
-
         self.get_required_stable_frames = 3
+
+        # A step needs one foot to move more than step_threshold on X
+        self.min_motion_energy = self.config.step_threshold
+
+        # X stability of each foot, counted by the analyzer
+        self.stability = analyzer.stability
+        self.left_foot_x = self.stability.add(LEFT_FOOT_INDEX, X_COORDINATE_INDEX, self.config.stability_threshold,
+                                              self.get_required_stable_frames)
+        self.right_foot_x = self.stability.add(RIGHT_FOOT_INDEX, X_COORDINATE_INDEX, self.config.stability_threshold,
+                                               self.get_required_stable_frames)
         
         # Motion state
         self.is_stable_for_detection: bool = True # Analogous to old is_stable_move["step"]
@@ -27,54 +36,23 @@ class StepMovement(BaseMovement):
         """Returns the list of movement types this detector can detect."""
         return [STEP_LEFT, STEP_RIGHT]
 
-    def _update_single_foot_stability(self, is_left_foot: bool) -> bool:
-        """Updates stability for a single foot and returns its stability status."""
-        foot_index = LEFT_FOOT_INDEX if is_left_foot else RIGHT_FOOT_INDEX
-        foot_distance, _ = self.analyzer.get_points_distance(foot_index, X_COORDINATE_INDEX)
-        
-        counter_name = "left foot" if is_left_foot else "right foot"
-        current_counter = self.stable_counter_left_foot if is_left_foot else self.stable_counter_right_foot
-        
-        required_frames = self.get_required_stable_frames
-
-        if foot_distance < self.config.stability_threshold:
-            current_counter += 1
-            if self.debug:
-                self.logger.debug(f"StepMovement: {counter_name.title()} stability counter: {current_counter}/{required_frames}")
-            is_stable = current_counter >= required_frames
-        else:
-            if self.debug and current_counter > 0:
-                self.logger.debug(f"StepMovement: Reset {counter_name} stability counter. Distance: {foot_distance:.4f}")
-            current_counter = 0
-            is_stable = False
-            
-        if is_left_foot:
-            self.stable_counter_left_foot = current_counter
-            self.is_left_foot_stable_x = is_stable
-        else:
-            self.stable_counter_right_foot = current_counter
-            self.is_right_foot_stable_x = is_stable
-        return is_stable
-
     def _determine_stability_criterion(self, left_foot_distance: float, left_foot_is_left: bool,
                                      right_foot_distance: float, right_foot_is_left: bool) -> Tuple[bool, str]:
         """Determines which foot's stability criterion to use."""
         # This logic is preserved from the original MovementAnalyzer
+        stability = self.stability
         if not right_foot_is_left and right_foot_distance > left_foot_distance:
-            return self.is_right_foot_stable_x, "is_right_foot_stable_x"
+            return stability.held(self.right_foot_x), "is_right_foot_stable_x"
         elif left_foot_is_left and left_foot_distance > right_foot_distance:
-            return self.is_left_foot_stable_x, "is_left_foot_stable_x"
+            return stability.held(self.left_foot_x), "is_left_foot_stable_x"
         else:
-            if self.stable_counter_right_foot > self.stable_counter_left_foot:
-                return self.is_right_foot_stable_x, "is_right_foot_stable_x"
+            if stability.counter(self.right_foot_x) > stability.counter(self.left_foot_x):
+                return stability.held(self.right_foot_x), "is_right_foot_stable_x"
             else:
-                return self.is_left_foot_stable_x, "is_left_foot_stable_x"
+                return stability.held(self.left_foot_x), "is_left_foot_stable_x"
 
     def update_stability_and_motion_status(self) -> None:
         """Updates foot stability and determines if a new step detection can occur."""
-        self._update_single_foot_stability(is_left_foot=True)
-        self._update_single_foot_stability(is_left_foot=False)
-
         # Update is_stable_for_detection based on current foot movements
         left_foot_distance, left_foot_is_left = self.analyzer.get_points_distance(LEFT_FOOT_INDEX, X_COORDINATE_INDEX)
         right_foot_distance, right_foot_is_left = self.analyzer.get_points_distance(RIGHT_FOOT_INDEX, X_COORDINATE_INDEX)
@@ -83,15 +61,19 @@ class StepMovement(BaseMovement):
             left_foot_distance, left_foot_is_left,
             right_foot_distance, right_foot_is_left
         )
-        
-        if self.debug:
-            self.logger.debug(f"StepMovement: Stability criterion for detection: {stable_check_name} -> {self.is_stable_for_detection}")
+
 
         if self.is_stable_for_detection:
             if self.is_in_motion:
                 if self.debug:
                     self.logger.debug("StepMovement: Resetting is_in_motion because movement is stable.")
                 self.is_in_motion = False
+
+        if self.trace is not None:
+            self.trace.record((
+                self.stability.counter(self.left_foot_x), self.stability.counter(self.right_foot_x), self.is_stable_for_detection,
+                stable_check_name == "is_right_foot_stable_x", self.is_in_motion,
+            ))
     
     def detect(self) -> Optional[str]:
         """Detects step left or step right."""
@@ -102,9 +84,6 @@ class StepMovement(BaseMovement):
         right_foot_distance, right_foot_is_left = self.analyzer.get_points_distance(RIGHT_FOOT_INDEX, X_COORDINATE_INDEX)
         left_foot_distance, left_foot_is_left = self.analyzer.get_points_distance(LEFT_FOOT_INDEX, X_COORDINATE_INDEX)
 
-        if self.debug:
-            self.logger.debug(f"StepMovement: Left foot distance: {left_foot_distance:.4f}, direction left: {left_foot_is_left}")
-            self.logger.debug(f"StepMovement: Right foot distance: {right_foot_distance:.4f}, direction left: {right_foot_is_left}")
         if not right_foot_is_left and right_foot_distance > self.config.step_threshold:
             # Check if this detection aligns with the dominant unstable foot from _determine_stability_criterion
             # This is a simplified check; _determine_stability_criterion primarily influences is_stable_for_detection
@@ -112,7 +91,7 @@ class StepMovement(BaseMovement):
                 left_foot_distance, left_foot_is_left,
                 right_foot_distance, right_foot_is_left
             )
-            if "right_foot" in stability_criterion_name or self.stable_counter_left_foot == 0 : # Favor if right foot is the one less stable or if left is completely stable
+            if "right_foot" in stability_criterion_name or self.stability.counter(self.left_foot_x) == 0 : # Favor if right foot is the one less stable or if left is completely stable
                 if self.debug:
                     self.logger.debug(f"StepMovement: Step Right detected - Diff: {right_foot_distance:.4f}")
                 return STEP_RIGHT
@@ -125,7 +104,7 @@ class StepMovement(BaseMovement):
                 self.analyzer.get_points_distance(RIGHT_FOOT_INDEX, X_COORDINATE_INDEX)[0],
                 self.analyzer.get_points_distance(RIGHT_FOOT_INDEX, X_COORDINATE_INDEX)[1]
             )
-            if "left_foot" in stability_criterion_name or self.stable_counter_right_foot == 0: # Favor if left foot is the one less stable or if right is completely stable
+            if "left_foot" in stability_criterion_name or self.stability.counter(self.right_foot_x) == 0: # Favor if left foot is the one less stable or if right is completely stable
                 if self.debug:
                     self.logger.debug(f"StepMovement: Step Left detected - Diff: {left_foot_distance:.4f}")
                 return STEP_LEFT
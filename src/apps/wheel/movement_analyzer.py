@@ -27,11 +27,6 @@ class MovementAnalyzer(BaseMovementAnalyzer):
             # LinearMovement(self, debug)
         ]
 
-        self.required_landmarks = [
-            LEFT_WRIST_INDEX,
-            RIGHT_WRIST_INDEX
-        ]
-
     def _log_debug_info(self):
         """Override of base class method for custom debug logging"""
         if not self.debug:
@@ -12,6 +12,9 @@ class AsideMovement(BaseMovement):
     STATE_ACTIVE_RIGHT = "ACTIVE_RIGHT"
     STATE_ACTIVE_LEFT = "ACTIVE_LEFT"
 
+    required_joints = (LEFT_WRIST_INDEX, RIGHT_WRIST_INDEX)
+    state_fields = ("current_motion_state",)
+
     def __init__(self, analyzer: 'MovementAnalyzer', debug: bool = False):
         super().__init__(analyzer, debug)
         self.START_THRESHOLD = 0.05
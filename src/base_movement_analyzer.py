@@ -1,9 +1,17 @@
 import numpy as np
 import time
 import logging
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, NamedTuple, Tuple, Dict, Any
 import mediapipe as mp
 from sound_manager import SoundManager
+from landmark_array import new_landmark_array, extract_landmarks
+from landmark_history import LandmarkHistory
+from frame_trace import FrameTrace, TraceChannel
+from stability_tracker import StabilityTracker
+from landmark_filter import OneEuroFilter
+from detector_scheduler import DetectorScheduler
+from feature_store import KinematicFeatureStore
+from snapshot_codec import encode_state, decode_state
 
 
 from src.constants import (
@@ -15,8 +23,47 @@ from src.constants import (
     LEFT_HEEL_INDEX, RIGHT_HEEL_INDEX
 )
 
+# Joints whose movement is tracked until the detectors are bound on the first frame
+DEFAULT_TRACKED_JOINTS = [
+    LEFT_FOOT_INDEX,
+    RIGHT_FOOT_INDEX,
+    NOSE_INDEX,
+    LEFT_SHOULDER_INDEX,
+    RIGHT_SHOULDER_INDEX,
+    RIGHT_HIP_INDEX,
+    LEFT_HIP_INDEX,
+    LEFT_HEEL_INDEX,
+    RIGHT_HEEL_INDEX,
+]
+
+# Frame counts in configs and detectors are tuned at this rate; time-based windows convert them with it
+NOMINAL_FPS = 30.0
+# Slack when a timestamp difference is compared with a duration: half a nominal frame, so a camera
+# clock slightly off 30 FPS or jittering by a few milliseconds rounds to the same frame as frame mode
+TIME_TOLERANCE = 0.5 / NOMINAL_FPS
+
+# Format of snapshot(); restore() rejects snapshots of other versions
+SNAPSHOT_VERSION = 2
+
+
+class AnalyzerLayout(NamedTuple):
+    """What an analyzer's frame step reads, as compiled from its detectors"""
+    tracked_joints: np.ndarray  # Landmark index of each row of the distance table
+    required_masks: np.ndarray  # (detectors, landmarks) landmarks each detector needs visible
+    analyzer_landmarks: np.ndarray  # Landmarks the analyzer itself needs visible
+    window: int  # Frames in the distance window
+
+
 class BaseMovementAnalyzer:
     """Base class for movement analysis that provides core functionality to detect movements from pose landmarks"""
+
+    # Attributes that change while analyzing, saved by snapshot() along with the landmark history,
+    # the stability counters, the landmark filter, the scheduler cooldowns and the detectors
+    state_fields: Tuple[str, ...] = (
+        "frame_counter", "frame_time", "last_detection_time",
+        "base_height", "base_hip_x", "stable_position", "current_fps",
+        "last_visible_points", "landmark_seen",
+    )
     
     def __init__(self, config: Any, mp_pose, debug: bool = False):
         self.config = config
@@ -27,52 +74,90 @@ class BaseMovementAnalyzer:
         self.logger = logging.getLogger(self.__class__.__name__)
 
         self.current_landmark_points = None
+
+        # Reused every frame: x, y, z, visibility of all landmarks, and the positions in float64
+        # (the history and the filter copy what they keep, so nothing holds on to them)
+        self.landmark_array: np.ndarray = new_landmark_array()
+        self._landmark_points: np.ndarray = np.zeros((len(self.landmark_array), 3))
         
         # Landmark tracking
         self.stable_position: Optional[np.ndarray] = None
-        self.prev_landmarks: List[Optional[np.ndarray]] = None
         self.frame_counter: int = 0
         
         # Reference points
         self.base_height: Optional[float] = None
         self.base_hip_x: Optional[float] = None
 
-        # Timestamp for last detection
+        # Timestamp of the frame being analyzed and of the last detection
+        self.frame_time: float = 0.0
         self.last_detection_time: float = 0
+
+        # Optional One Euro smoothing of the landmarks before they enter the history
+        self.landmark_filter: Optional[OneEuroFilter] = None
+        if self.config.landmark_smoothing:
+            self.landmark_filter = OneEuroFilter.from_config(self.config)
+
+        # Per-frame values of the analyzer and its detectors, formatted only when dumped
+        self.trace: Optional[FrameTrace] = None
+        if debug or self.config.trace_enabled:
+            self.trace = FrameTrace(self.config.trace_frames)
+        self._distance_trace: Optional[TraceChannel] = None
+
+        # Distances precomputed by analyze_sequence, consumed one frame at a time by map_points_distance
+        self._batch_distances: Optional[Tuple[np.ndarray, np.ndarray, list, list, list]] = None
+        self._batch_position: int = 0
+        # (timestamps, history index of each analyzed frame) of the sequence, with time-based windows
+        self._sequence_times: Optional[Tuple[np.ndarray, np.ndarray]] = None
         
-        # Points distance tracking dictionary
-        self.points_distance = {
-            LEFT_FOOT_INDEX: [{}, {}, {}],
-            RIGHT_FOOT_INDEX: [{}, {}, {}],
-            NOSE_INDEX: [{}, {}, {}],
-            LEFT_SHOULDER_INDEX: [{}, {}, {}],
-            RIGHT_SHOULDER_INDEX: [{}, {}, {}],
-            RIGHT_HIP_INDEX: [{}, {}, {}],
-            LEFT_HIP_INDEX: [{}, {}, {}],
-            LEFT_HEEL_INDEX: [{}, {}, {}],
-            RIGHT_HEEL_INDEX: [{}, {}, {}],
-        }
+        # Per-joint movement over the distance window: rows follow tracked_joints, columns are x, y, z
+        self.tracked_joints: List[int] = []
+        self.points_delta: np.ndarray = np.zeros((0, 3))  # abs(current - oldest), rounded to 3 decimals
+        self.points_direction: np.ndarray = np.zeros((0, 3), dtype=bool)  # current < oldest
+        self.motion_energy: float = 0.0  # Largest value of points_delta: how much the body moved over the window
+        self.set_tracked_joints(DEFAULT_TRACKED_JOINTS)
+
+        # Stability and motion counters shared by the detectors, advanced once per frame
+        self.stability = StabilityTracker(self)
 
-        self.required_landmarks = [
-            NOSE_INDEX,
-            LEFT_HIP_INDEX,
-            RIGHT_HIP_INDEX,
-            LEFT_FOOT_INDEX,
-            RIGHT_FOOT_INDEX,
-            LEFT_KNEE_INDEX,
-            RIGHT_KNEE_INDEX,
-            LEFT_SHOULDER_INDEX,
-            RIGHT_SHOULDER_INDEX
-        ]
+        # Multi-window displacement, velocity and acceleration for detectors that register windows, computed on first read
+        self.features = KinematicFeatureStore(self, self.config.feature_windows)
+
+        # Landmarks the analyzer itself reads on every frame. A frame is analyzed when these are visible
+        # and so are the required_joints of at least one detector; the other detectors sit the frame out
+        self.analyzer_landmarks: List[int] = []
+        self.landmark_visible: np.ndarray = np.zeros(len(self.landmark_array), dtype=bool)
+        self.detector_visible: List[bool] = []  # Per movement detector, on the current frame
+        self._gated_detectors: Optional[List[Any]] = None  # movement_detectors the masks were built for
+
+        # Hidden landmarks keep their last visible position, so their reported coordinates never enter the
+        # history; a landmark seen for the first time is written over the whole history instead
+        self.last_visible_points: np.ndarray = np.zeros((len(self.landmark_array), 3))
+        self.landmark_seen: np.ndarray = np.zeros(len(self.landmark_array), dtype=bool)
+        self._first_seen: Optional[np.ndarray] = None  # Landmarks seen for the first time on the current frame
 
         self.movement_type_map: Dict[str, Any] = {}
 
         # FPS adaptation
         self.current_fps = 30.0
         self.num_frames_to_check = self.config.num_frames_to_check_per_30_fps
+
+        # Time-based windows: span of the distance window in seconds
+        self.time_based_windows: bool = self.config.time_based_windows
+        if self.config.motion_window_ms is not None:
+            self.motion_window = self.config.motion_window_ms / 1000.0
+        else:
+            self.motion_window = (self.config.num_frames_to_check_per_30_fps - 1) / NOMINAL_FPS
+
+        # Landmark history, newest first; longer than num_frames_to_check if detectors need more
+        self.landmark_history = LandmarkHistory(self._history_capacity())
         
         # Movement detectors will be initialized in child classes
         self.movement_detectors = []
+
+        # Skips detect() of detectors that cannot fire on a frame
+        self.scheduler: Optional[DetectorScheduler] = None
+        if self.config.detector_scheduling:
+            self.scheduler = DetectorScheduler(self)
         
         # Sound manager will be initialized in child classes if needed
         self.sound_manager = None
@@ -91,28 +176,219 @@ class BaseMovementAnalyzer:
         fps_ratio = self.current_fps / 30.0
         return max(min_value, round(value * fps_ratio))
 
+    def set_tracked_joints(self, joints: List[int]) -> None:
+        """Choose the landmarks whose movement map_points_distance computes"""
+        self.tracked_joints = list(joints)
+        self._tracked_joint_index = np.array(self.tracked_joints, dtype=np.intp)
+        self._joint_rows = {joint: row for row, joint in enumerate(self.tracked_joints)}
+        self.points_delta = np.zeros((len(self.tracked_joints), 3))
+        self.points_direction = np.zeros((len(self.tracked_joints), 3), dtype=bool)
+        self._delta_rows = self.points_delta.tolist()
+        self._direction_rows = self.points_direction.tolist()
+        self._distance_trace = None  # Registered with the new joints on the next traced frame
+
+    @property
+    def required_landmarks(self) -> List[int]:
+        """Landmarks whose visibility gates analysis: the analyzer's own and every detector's required_joints"""
+        self._bind_detectors()
+        return self._required_landmarks
+
+    def _joints_to_track(self) -> List[int]:
+        """Joints whose movement is computed: those the detectors, the analyzer and the stability pairs read"""
+        joints = [joint for detector in self.movement_detectors for joint in detector.required_joints]
+        return list(dict.fromkeys(int(joint) for joint in joints + self.analyzer_landmarks + self.stability.joints()))
+
+    def _bind_detectors(self) -> None:
+        """Build the detectors' visibility masks and track only the joints they read"""
+        if self._gated_detectors is self.movement_detectors:
+            return
+        detectors = self.movement_detectors
+        self._gated_detectors = detectors
+        self._required_masks = np.zeros((len(detectors), len(self.landmark_array)), dtype=bool)
+        for index, detector in enumerate(detectors):
+            self._required_masks[index, list(detector.required_joints)] = True
+        self._analyzer_landmarks = np.array(self.analyzer_landmarks, dtype=np.intp)
+        self._required_landmarks = sorted({int(joint) for joint in self.analyzer_landmarks}.union(
+            *(map(int, detector.required_joints) for detector in detectors)))
+        self.detector_visible = [True] * len(detectors)
+
+        joints = self._joints_to_track()
+        if joints != self.tracked_joints:
+            self.set_tracked_joints(joints)
+
     def get_points_distance(self, point_num: int, type_point_index: int) -> Tuple[float, bool]:
         """Get the distance and direction of a point's movement"""
-        return self.points_distance[point_num][type_point_index]["points"], self.points_distance[point_num][type_point_index]["is_position_smaller"]
+        row = self._joint_rows[point_num]
+        return self._delta_rows[row][type_point_index], self._direction_rows[row][type_point_index]
     
     def update_landmarks_history(self, landmark_points: np.ndarray) -> None:
         """Maintain history of landmark points for movement detection"""
-        if self.prev_landmarks is None:
-            # Initialize with copies of the first landmark_points
-            self.prev_landmarks = [np.copy(landmark_points) for _ in range(self.num_frames_to_check)]
+        self.landmark_history.push(landmark_points, self.frame_time)
+        if self._first_seen is not None:
+            self.landmark_history.backfill(self._first_seen)
+
+    def _hold_hidden_landmarks(self, landmark_points: np.ndarray) -> Optional[np.ndarray]:
+        """Replace hidden landmarks by their last visible position, in place
+
+        Returns:
+            Indices of the landmarks seen for the first time, or None
+        """
+        visible = self.landmark_visible
+        held = self.landmark_seen & ~visible
+        if held.any():
+            landmark_points[held] = self.last_visible_points[held]
+        np.copyto(self.last_visible_points, landmark_points, where=visible[:, None])
+        first_seen = visible & ~self.landmark_seen
+        if not first_seen.any():
+            return None
+        self.landmark_seen |= visible
+        return np.flatnonzero(first_seen)
+
+    def _hold_hidden_sequence(self, points: np.ndarray, visible: np.ndarray) -> Tuple[np.ndarray, Dict[int, np.ndarray]]:
+        """_hold_hidden_landmarks for (T, N, 3) frames at once, in place
+
+        Returns:
+            The points, and the landmarks seen for the first time by frame index
+        """
+        num_frames = len(visible)
+        if not num_frames:
+            return points, {}
+        # Index of the last frame, up to each frame, each landmark was visible on (-1 before the first)
+        last_visible = np.where(visible, np.arange(num_frames)[:, None], -1)
+        np.maximum.accumulate(last_visible, axis=0, out=last_visible)
+        not_yet = last_visible < 0
+        held = ~visible & ~not_yet
+        points[held] = points[last_visible[held], np.nonzero(held)[1]]
+        before = not_yet & self.landmark_seen
+        points[before] = np.broadcast_to(self.last_visible_points, points.shape)[before]
+
+        seen = last_visible[-1] >= 0
+        first_frames = np.argmax(visible, axis=0)
+        first_seen: Dict[int, np.ndarray] = {}
+        for landmark in np.flatnonzero(seen & ~self.landmark_seen).tolist():
+            first_seen.setdefault(int(first_frames[landmark]), []).append(landmark)
+        self.last_visible_points[seen] = points[last_visible[-1, seen], np.flatnonzero(seen)]
+        self.landmark_seen |= seen
+        return points, {frame: np.array(landmarks) for frame, landmarks in first_seen.items()}
+
+    def _window_frames_back(self) -> int:
+        """How many frames before the newest one the distance window starts"""
+        if self.time_based_windows:
+            return self.landmark_history.frames_since(self.frame_time - self.motion_window + TIME_TOLERANCE)
+        return self.num_frames_to_check - 1
+
+    def frames_back(self, frames_per_30_fps: int) -> int:
+        """How many frames before the newest one a span of frames_per_30_fps frames at 30 FPS starts"""
+        if self.time_based_windows:
+            return self.landmark_history.frames_since(self.frame_time - frames_per_30_fps / NOMINAL_FPS + TIME_TOLERANCE)
+        return self.get_per_30_fps(frames_per_30_fps, 1)
+
+    def held_long_enough(self, frames: int, required_frames: int,
+                         required_frames_per_30_fps: Optional[int] = None) -> bool:
+        """Whether a condition that held for the last `frames` frames has held long enough
+
+        In frame mode the counts are compared. With time_based_windows the
+        requirement becomes the duration of required_frames_per_30_fps
+        (defaults to required_frames) frames at 30 FPS, measured from the
+        capture time of the last frame before the run. Runs longer than the
+        history are extrapolated at the history's average frame interval.
+
+        Args:
+            frames: Consecutive frames, up to the current one, the condition held for
+            required_frames: Frames required in frame mode
+            required_frames_per_30_fps: The same requirement counted at 30 FPS
+
+        Returns:
+            Boolean indicating if the condition has held long enough
+        """
+        if not self.time_based_windows:
+            return frames >= required_frames
+        if frames <= 0:
+            return False
+        if required_frames_per_30_fps is None:
+            required_frames_per_30_fps = required_frames
+
+        history = self.landmark_history
+        stored = len(history)
+        if frames < stored:
+            held_for = self.frame_time - history.time_ago(frames)
+        elif stored > 1:
+            held_for = (self.frame_time - history.time_ago(stored - 1)) * frames / (stored - 1)
+        else:
+            # A single frame gives no interval to measure
+            held_for = frames / NOMINAL_FPS
+        return held_for + TIME_TOLERANCE >= required_frames_per_30_fps / NOMINAL_FPS
+
+    def held_long_enough_counts(self, frames: np.ndarray, required_frames: np.ndarray) -> np.ndarray:
+        """held_long_enough() of many counts at once, each against its own required frames"""
+        if not self.time_based_windows:
+            return frames >= required_frames
+        history = self.landmark_history
+        stored = len(history)
+        if stored > 1:
+            held_for = self.frame_time - history.times_ago(frames)
+            longer = frames >= stored
+            if longer.any():
+                held_for[longer] = (self.frame_time - history.time_ago(stored - 1)) * frames[longer] / (stored - 1)
         else:
-            self.prev_landmarks.insert(0, landmark_points)
-            self.prev_landmarks.pop()
+            held_for = frames / NOMINAL_FPS
+        return (frames > 0) & (held_for + TIME_TOLERANCE >= required_frames / NOMINAL_FPS)
+
+    def held_long_enough_sequence(self, frames: np.ndarray, required_frames: np.ndarray) -> np.ndarray:
+        """held_long_enough_counts() of every frame of the sequence being analyzed, for (T, K) counts"""
+        if not self.time_based_windows:
+            return frames >= required_frames
+        # Same lookups as held_long_enough, on the frames the history holds at each position
+        times, current_index = self._sequence_times
+        stored = np.minimum(current_index + 1, self.landmark_history.capacity)[:, None]
+        now = times[current_index][:, None]
+        held_for = now - times[current_index[:, None] - np.minimum(frames, stored - 1)]
+        longer = (frames >= stored) & (stored > 1)
+        if longer.any():
+            oldest = times[current_index[:, None] - stored + 1]
+            extrapolated = (now - oldest) * frames / np.maximum(stored - 1, 1)
+            held_for = np.where(longer, extrapolated, held_for)
+        held_for = np.where(stored > 1, held_for, frames / NOMINAL_FPS)
+        return (frames > 0) & (held_for + TIME_TOLERANCE >= required_frames / NOMINAL_FPS)
+
+    def _history_capacity(self) -> int:
+        # Feature acceleration looks one frame plus the longest feature window back
+        feature_frames = self.get_per_30_fps(max(self.features.windows), 1) + 2
+        return max(self.num_frames_to_check, self.config.landmark_history_frames, feature_frames)
     
     def map_points_distance(self) -> None:
-        """Map the points distance to the points_distance dictionary"""
-        for point_index, coordinates in self.points_distance.items():
-            for i in range(3):
-                current_point = self.prev_landmarks[0][point_index][i]
-                prev_point = self.prev_landmarks[self.num_frames_to_check - 1][point_index][i]
-                is_position_smaller = current_point < prev_point
-                coordinates[i]["points"] = round(abs(current_point - prev_point), 3)
-                coordinates[i]["is_position_smaller"] = is_position_smaller
+        """Compute movement of the tracked joints between the oldest and newest frame of the distance window"""
+        if self._batch_distances is not None:
+            deltas, directions, delta_rows, direction_rows, energies = self._batch_distances
+            position = self._batch_position
+            self.points_delta = deltas[position]
+            self.points_direction = directions[position]
+            self._delta_rows = delta_rows[position]
+            self._direction_rows = direction_rows[position]
+            self.motion_energy = energies[position]
+            return
+
+        joints = self._tracked_joint_index
+        current = self.landmark_history.current[joints]
+        oldest = self.landmark_history.ago(self._window_frames_back())[joints]
+        np.less(current, oldest, out=self.points_direction)
+        np.subtract(current, oldest, out=self.points_delta)
+        np.abs(self.points_delta, out=self.points_delta)
+        np.round(self.points_delta, 3, out=self.points_delta)
+        self.motion_energy = float(self.points_delta.max()) if self.points_delta.size else 0.0
+        # Detectors read single values; plain Python floats are much cheaper to use than numpy scalars
+        self._delta_rows = self.points_delta.tolist()
+        self._direction_rows = self.points_direction.tolist()
+
+    def _trace_points_distance(self) -> None:
+        """Record the distance/direction table of the frame into the trace"""
+        if self._distance_trace is None:
+            names = [self.mp_pose.PoseLandmark(joint).name.lower() for joint in self.tracked_joints]
+            fields = [f"{name}_{axis}" for name in names for axis in "xyz"]
+            fields += [f"{name}_{axis}_dir" for name in names for axis in "xyz"]
+            self._distance_trace = self.trace.channel("distance", fields)
+        self._distance_trace.record(self.points_delta.ravel())
+        self._distance_trace.record(self.points_direction.ravel(), self.points_delta.size)
 
     def update_is_stable_general(self) -> bool:
         """
@@ -120,29 +396,50 @@ class BaseMovementAnalyzer:
         This method is kept for backward compatibility but now relies on 
         the movement detectors' stability status.
         """
-        # Update each movement detector's stability
-        for detector in self.movement_detectors:
-            detector.update_stability_and_motion_status()
+        # Update the stability of each movement detector whose landmarks are visible
+        for detector, visible in zip(self.movement_detectors, self.detector_visible):
+            if visible:
+                detector.update_stability_and_motion_status()
         
+    def compiled_layout(self, fps: Optional[float] = None) -> AnalyzerLayout:
+        """Bind the detectors (at fps if given) and return the layout the frame step works with
+
+        For components that step many pose streams with this analyzer's
+        detectors, such as BatchMovementAnalyzer. The arrays are shared with
+        the analyzer and must not be modified.
+        """
+        if fps is not None:
+            self.update_fps(fps)
+        self._update_fps_dependent_values()
+        self._bind_detectors()
+        return AnalyzerLayout(self._tracked_joint_index, self._required_masks, self._analyzer_landmarks,
+                              self.num_frames_to_check)
+
     def _update_fps_dependent_values(self) -> None:
         """Update FPS-dependent values based on current FPS"""
         self.num_frames_to_check = self.get_per_30_fps(self.config.num_frames_to_check_per_30_fps)
+        self.landmark_history.resize(self._history_capacity())
+
+    def _update_visibility(self, landmark_array: np.ndarray) -> bool:
+        """Set which landmarks and detectors are visible on the frame
 
-    def _are_required_landmarks_visible(self, landmarks) -> bool:
-        """Check if all required landmarks are visible
-        
         Args:
-            landmarks: MediaPipe pose landmarks
-            
+            landmark_array: (N, 4) array of x, y, z, visibility (missing landmarks have visibility 0)
+
         Returns:
-            Boolean indicating if all required landmarks are visible and valid
+            Boolean indicating if the frame should be analyzed: the analyzer's
+            landmarks and at least one detector's required joints are visible
         """
-        
-        for landmark_idx in self.required_landmarks:
-            if landmark_idx >= len(landmarks.landmark) or landmarks.landmark[landmark_idx].visibility < self.config.visibility_threshold:
-                return False
-        
-        return True
+        self._bind_detectors()
+        # Compared in float64, so the float32 visibilities are checked against the exact threshold
+        visible = landmark_array[:, 3] >= np.float64(self.config.visibility_threshold)
+        self.landmark_visible = visible
+        # A detector is visible where each of its required joints is
+        detector_visible = (visible >= self._required_masks).all(axis=1)
+        self.detector_visible = detector_visible.tolist()
+        if not visible[self._analyzer_landmarks].all():
+            return False
+        return bool(detector_visible.any()) or not self.detector_visible
 
     def _map_movement_types(self) -> None:
         """Map movement types to their detectors for fast lookup"""
@@ -165,20 +462,21 @@ class BaseMovementAnalyzer:
         if self.sound_manager is not None:
             self.sound_manager.play_movement_sound(movement)
             
-        self.last_detection_time = time.time()
+        self.last_detection_time = self.frame_time
         if self.debug:
             self.logger.debug(f"Movement detected: {movement}")
 
     def map_core_data(self, landmark_points) -> Optional[str]:
-        self.current_landmark_points = landmark_points
         self._update_fps_dependent_values()
         
         self._map_movement_types()
         self.update_landmarks_history(landmark_points)
+        # The history owns a copy, so this stays valid after landmark_array is refilled
+        self.current_landmark_points = self.landmark_history.current
         
         self.map_points_distance()
-        
-        
+        self.stability.update()
+
 
     def update_before_detect(self, landmark_points) -> Optional[str]:
         self.update_is_stable_general()
@@ -191,30 +489,60 @@ class BaseMovementAnalyzer:
                 self.logger.debug(f"Movement already in motion, skipping detection because of {[detector.name for detector in self.movement_detectors if detector.is_in_motion]}")
             return None
 
+        if self.scheduler is not None:
+            if detected := self.scheduler.detect():
+                self._after_movement_detected(detected)
+            return detected
+
         # Try to detect movements using specialized detectors
-        for detector in self.movement_detectors:
-            if detected := detector.detect():
+        for detector, visible in zip(self.movement_detectors, self.detector_visible):
+            if visible and (detected := detector.detect()):
                 self._after_movement_detected(detected)
                 return detected
             
         return None
     
 
-    def check_for_movment(self, landmarks: mp.solutions.pose.PoseLandmark):
-        """Detect and return the type of movement"""
+    def check_for_movment(self, landmarks: mp.solutions.pose.PoseLandmark, timestamp: Optional[float] = None):
+        """Detect and return the type of movement
+
+        Args:
+            landmarks: MediaPipe pose landmarks of the frame
+            timestamp: Capture time of the frame in seconds (defaults to now)
+        """
         if landmarks is None:
             return None
             
-        # Check if all required landmarks are visible
-        if not self._are_required_landmarks_visible(landmarks):
+        landmark_array = extract_landmarks(landmarks, self.landmark_array)
+
+        # Check that the analyzer's landmarks and those of at least one detector are visible
+        if not self._update_visibility(landmark_array):
             if self.debug:
                 self.logger.debug("Required landmarks not visible, cannot detect movement or set base height.")
             return None
             
-        landmark_points = np.array([[lm.x, lm.y, lm.z] for lm in landmarks.landmark])
+        # Analysis math stays in float64; the float32 values convert exactly
+        landmark_points = self._landmark_points
+        np.copyto(landmark_points, landmark_array[:, :3])
+        self._first_seen = self._hold_hidden_landmarks(landmark_points)
+        if timestamp is None:
+            timestamp = time.time()
+        if self.landmark_filter is not None:
+            if self._first_seen is not None:
+                self.landmark_filter.reset_landmarks(self._first_seen, landmark_points)
+            landmark_points = self.landmark_filter(landmark_points, timestamp)
+        return self._analyze_frame(landmark_points, timestamp)
+
+    def _analyze_frame(self, landmark_points: np.ndarray, timestamp: float) -> Optional[str]:
+        """Run the per-frame analysis on the landmarks of a frame that passed the visibility gate"""
+        self.frame_time = timestamp
         self.frame_counter += 1
+        if self.trace is not None:
+            self.trace.begin_frame(self.frame_counter, timestamp)
 
         self.map_core_data(landmark_points)
+        if self.trace is not None:
+            self._trace_points_distance()
 
         self.update_before_detect(landmark_points)
         self._log_debug_info()
@@ -222,7 +550,165 @@ class BaseMovementAnalyzer:
         detect_movement = self.detect_movement()
 
         return detect_movement
+
+    def analyze_sequence(self, landmarks: np.ndarray, timestamps: Optional[np.ndarray] = None) -> List[Tuple[int, str]]:
+        """Analyze a whole recording and return its movements as (frame index, movement)
+
+        Visibility gating, the landmark history and the distance/direction
+        table are computed for all frames with array operations up front; only
+        the stateful detector logic then runs frame by frame. The result is
+        identical to passing every frame to check_for_movment in order, and the
+        analyzer state afterwards is the same too.
+
+        Args:
+            landmarks: (T, 33, 4) array of x, y, z, visibility per frame; frames
+                without a pose can be all NaN
+            timestamps: (T,) capture times in seconds (defaults to frame index / current FPS)
+
+        Returns:
+            List of (frame index, movement) in frame order
+        """
+        landmarks = np.asarray(landmarks)
+        num_frames = len(landmarks)
+        if timestamps is None:
+            timestamps = np.arange(num_frames) / self.current_fps
+        elif len(timestamps) != num_frames:
+            raise ValueError("timestamps must have one entry per frame")
+        if num_frames == 0:
+            return []
+
+        # Visibility gate for all frames (NaN compares as not visible)
+        self._bind_detectors()
+        visible = landmarks[:, :, 3].astype(np.float64) >= self.config.visibility_threshold
+        detector_visible = (visible[:, None, :] >= self._required_masks).all(axis=2)
+        analyzed = visible[:, self._analyzer_landmarks].all(axis=1)
+        if self.movement_detectors:
+            analyzed &= detector_visible.any(axis=1)
+        valid_frames = np.flatnonzero(analyzed)
+        landmark_visible = visible[valid_frames]
+        detector_rows = detector_visible[valid_frames].tolist()
+        points = landmarks[valid_frames, :, :3].astype(np.float64)
+        points, first_seen = self._hold_hidden_sequence(points, landmark_visible)
+        if self.landmark_filter is not None:
+            # The filter is recursive, so it runs frame by frame before the vectorized history
+            points = self.landmark_filter.filter_sequence(points, np.asarray(timestamps)[valid_frames], first_seen)
+
+        # FPS does not change during a batch, so the window is fixed
+        self._update_fps_dependent_values()
+        window = self.num_frames_to_check
+
+        # Frames already in the history precede the recording, as they would when streaming
+        stored = len(self.landmark_history)
+        previous = self.landmark_history.window(stored) if stored else points[:0]
+        joint_points = np.concatenate([previous, points])[:, self._tracked_joint_index]
+        current_index = np.arange(len(previous), len(joint_points))
+        if self.time_based_windows:
+            # Same lookup as LandmarkHistory.frames_since, limited to the frames the history would hold
+            previous_times = self.landmark_history.window_times(stored) if stored else np.zeros(0)
+            times = np.concatenate([previous_times, np.asarray(timestamps, dtype=np.float64)[valid_frames]])
+            self._sequence_times = (times, current_index)
+            at_or_before = np.searchsorted(times, times[current_index] - self.motion_window + TIME_TOLERANCE, side="right")
+            first_stored = np.maximum(current_index - (self.landmark_history.capacity - 1), 0)
+            oldest_index = np.clip(at_or_before - 1, first_stored, current_index)
+        else:
+            oldest_index = np.maximum(current_index - (window - 1), 0)
+        current = joint_points[current_index]
+        first_positions = [(row, len(previous) + frame) for frame, landmarks in first_seen.items()
+                           for row, joint in enumerate(self.tracked_joints) if joint in landmarks]
+        if first_positions:
+            # A joint seen for the first time is backfilled into the history, so from then on
+            # the frames before it read as its first position
+            read_index = np.repeat(oldest_index[:, None], len(self.tracked_joints), axis=1)
+            for row, first in first_positions:
+                backfilled = (current_index >= first) & (oldest_index < first)
+                read_index[backfilled, row] = first
+            oldest = joint_points[read_index, np.arange(len(self.tracked_joints))]
+        else:
+            oldest = joint_points[oldest_index]
+        directions = current < oldest
+        deltas = np.round(np.abs(current - oldest), 3)
+
+        events: List[Tuple[int, str]] = []
+        energies = deltas.max(axis=(1, 2)).tolist() if deltas.shape[1] else [0.0] * len(deltas)
+        self._batch_distances = (deltas, directions, deltas.tolist(), directions.tolist(), energies)
+        self.stability.begin_sequence(deltas, directions, landmark_visible)
+        try:
+            for position, frame_index in enumerate(valid_frames.tolist()):
+                self._batch_position = position
+                self.landmark_visible = landmark_visible[position]
+                self._first_seen = first_seen.get(position)
+                self.detector_visible = detector_rows[position]
+                movement = self._analyze_frame(points[position], float(timestamps[frame_index]))
+                if movement:
+                    events.append((frame_index, movement))
+        finally:
+            self._batch_distances = None
+            self._sequence_times = None
+            self.stability.end_sequence()
+            # Leave the table as the streaming path would
+            self.points_delta = self.points_delta.copy()
+            self.points_direction = self.points_direction.copy()
+        return events
     
+    def snapshot(self) -> bytes:
+        """Serialize the analysis state so that restore() continues from the current frame
+
+        The config is not saved: an analyzer restored with a different config
+        keeps its own, and stability counters whose criteria changed start
+        from zero. Snapshots are JSON plus numpy arrays, never pickles,
+        so restoring one cannot run code.
+        """
+        if self._batch_distances is not None:
+            raise RuntimeError("cannot snapshot while analyze_sequence is running")
+        state = {
+            "version": SNAPSHOT_VERSION,
+            "app_name": self.config.app_name,
+            "fields": {name: getattr(self, name) for name in self.state_fields},
+            "history": self.landmark_history.snapshot(),
+            "stability": self.stability.snapshot(),
+            "landmark_filter": None if self.landmark_filter is None else self.landmark_filter.snapshot(),
+            "scheduler": None if self.scheduler is None else self.scheduler.snapshot(),
+            "detectors": {detector.name: detector.snapshot() for detector in self.movement_detectors},
+        }
+        return encode_state(state)
+
+    def restore(self, data: bytes) -> None:
+        """Continue from a state returned by snapshot()
+
+        Detectors are matched by name; a detector the snapshot does not
+        have keeps its current state.
+
+        Raises:
+            ValueError: data is not a snapshot of this app in the current format
+        """
+        state = decode_state(data)
+        version = state.get("version") if isinstance(state, dict) else None
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}, expected {SNAPSHOT_VERSION}")
+        if state["app_name"] != self.config.app_name:
+            raise ValueError(f"Snapshot of app '{state['app_name']}' cannot be restored into '{self.config.app_name}'")
+
+        for name, value in state["fields"].items():
+            if name in self.state_fields:
+                setattr(self, name, value)
+        # The history capacity follows the restored FPS
+        self._update_fps_dependent_values()
+        self.landmark_history.restore(state["history"])
+        self.current_landmark_points = self.landmark_history.current if len(self.landmark_history) else None
+        self.stability.restore(state["stability"])
+        if self.landmark_filter is not None:
+            if state["landmark_filter"] is None:
+                self.landmark_filter.reset()
+            else:
+                self.landmark_filter.restore(state["landmark_filter"])
+        if self.scheduler is not None and state["scheduler"] is not None:
+            self.scheduler.restore(state["scheduler"])
+        detectors = state["detectors"]
+        for detector in self.movement_detectors:
+            if detector.name in detectors:
+                detector.restore(detectors[detector.name])
+        self.features.invalidate()
+
     def process_frame(self, frame):
         return frame
     
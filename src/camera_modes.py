@@ -0,0 +1,235 @@
+import cv2
+import json
+import os
+import logging
+from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Any
+
+logger = logging.getLogger('CameraModes')
+
+# Modes to probe, roughly from cheapest to most expensive. MJPG is compressed on the
+# device, so it needs far less USB bandwidth than raw YUYV at the same resolution.
+CANDIDATE_MODES = [
+    (424, 240, 60, "MJPG"),
+    (640, 360, 60, "MJPG"),
+    (640, 480, 60, "MJPG"),
+    (640, 360, 30, "MJPG"),
+    (640, 480, 30, "MJPG"),
+    (800, 600, 30, "MJPG"),
+    (960, 540, 30, "MJPG"),
+    (1280, 720, 30, "MJPG"),
+    (640, 480, 30, "YUYV"),
+    (1280, 720, 30, "YUYV"),
+]
+
+# Relative decode/transfer cost per pixel for each FOURCC
+FOURCC_COST = {"MJPG": 1.0, "YUYV": 2.0}
+
+# Relative difference up to which two aspect ratios count as the same (424x240 is 16:9 within 0.6%)
+ASPECT_TOLERANCE = 0.02
+
+
+@dataclass(frozen=True)
+class CaptureMode:
+    """A camera capture mode (resolution, frame rate and pixel format)"""
+    width: int
+    height: int
+    fps: float
+    fourcc: str
+
+    @property
+    def aspect(self) -> float:
+        return self.width / self.height
+
+    def has_aspect(self, aspect: float) -> bool:
+        """Whether the mode has the given width/height ratio, within ASPECT_TOLERANCE"""
+        return abs(self.aspect - aspect) <= ASPECT_TOLERANCE * aspect
+
+    @property
+    def frame_cost(self) -> float:
+        """Relative transfer/decode cost of one frame"""
+        return self.width * self.height * FOURCC_COST.get(self.fourcc, 2.0)
+
+    def __str__(self) -> str:
+        return f"{self.width}x{self.height}@{self.fps:g} {self.fourcc}"
+
+
+def _fourcc_to_str(value: float) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def current_mode(cap: cv2.VideoCapture) -> Optional[CaptureMode]:
+    """The mode the driver is in, or None if it reports no frame size and no frame can be read"""
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if width <= 0 or height <= 0:
+        ret, frame = cap.read()
+        if not ret or frame is None:
+            return None
+        height, width = frame.shape[:2]
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    fourcc = _fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)).strip("\x00") or "MJPG"
+    return CaptureMode(width, height, fps, fourcc)
+
+
+def apply_mode(cap: cv2.VideoCapture, mode: CaptureMode) -> Optional[CaptureMode]:
+    """Request a mode from the driver and return what it actually delivers
+
+    Returns None if no frame can be read in the resulting mode.
+    """
+    # FOURCC has to be set before the resolution on most drivers
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*mode.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+    cap.set(cv2.CAP_PROP_FPS, mode.fps)
+
+    ret, frame = cap.read()
+    if not ret or frame is None:
+        return None
+
+    height, width = frame.shape[:2]
+    fps = cap.get(cv2.CAP_PROP_FPS) or mode.fps
+    fourcc = _fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)).strip("\x00") or mode.fourcc
+    return CaptureMode(width, height, fps, fourcc)
+
+
+def probe_modes(cap: cv2.VideoCapture, candidates=CANDIDATE_MODES) -> List[CaptureMode]:
+    """Try every candidate mode and return the distinct modes the camera accepted"""
+    supported: List[CaptureMode] = []
+    for width, height, fps, fourcc in candidates:
+        requested = CaptureMode(width, height, fps, fourcc)
+        actual = apply_mode(cap, requested)
+        if actual is None:
+            logger.debug(f"Mode {requested} not readable")
+            continue
+        logger.debug(f"Requested {requested}, got {actual}")
+        if actual not in supported:
+            supported.append(actual)
+    return supported
+
+
+def choose_mode(modes: List[CaptureMode], min_width: int, min_fps: float, aspect: float) -> Optional[CaptureMode]:
+    """Pick the cheapest mode of the given aspect ratio that is at least min_width wide, preferring modes that reach min_fps
+
+    Only modes of the camera's own aspect ratio qualify: another ratio crops
+    the field of view and changes the vertical scale of the normalized
+    landmarks the movement thresholds are tuned on.
+    """
+    wide_enough = [mode for mode in modes if mode.width >= min_width and mode.has_aspect(aspect)]
+    if not wide_enough:
+        return None
+    fast_enough = [mode for mode in wide_enough if mode.fps >= min_fps]
+    pool = fast_enough or wide_enough
+    # Cheapest per frame first; among equals take the higher frame rate
+    return min(pool, key=lambda mode: (mode.frame_cost, -mode.fps))
+
+
+class CameraModeCache:
+    """Stores the negotiated capture mode per camera in a JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    @staticmethod
+    def device_key(cap: cv2.VideoCapture, camera_index: int) -> str:
+        """Identify a device by backend and index (OpenCV exposes no serial numbers)"""
+        try:
+            backend = cap.getBackendName()
+        except cv2.error:
+            backend = "unknown"
+        return f"{backend}:{camera_index}"
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as file:
+                self._entries = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable camera mode cache {self.path}: {e}")
+            self._entries = {}
+
+    def get(self, key: str) -> Optional[CaptureMode]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            return CaptureMode(**entry)
+        except TypeError:
+            return None
+
+    def set(self, key: str, mode: CaptureMode) -> None:
+        self._entries[key] = asdict(mode)
+        try:
+            cache_dir = os.path.dirname(self.path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            with open(self.path, 'w') as file:
+                json.dump(self._entries, file, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not write camera mode cache {self.path}: {e}")
+
+    def remove(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+def negotiate_capture_mode(cap: cv2.VideoCapture, camera_index: int, min_width: int,
+                           min_fps: float = 30.0, cache_path: Optional[str] = None) -> Optional[CaptureMode]:
+    """Configure the camera with the cheapest mode that still covers the processing width
+
+    Only modes with the aspect ratio of the driver's current mode are used.
+    A cached choice for the device is applied directly and verified; probing
+    only happens on the first start or when the cached mode no longer works
+    or has another aspect ratio.
+
+    Returns:
+        The mode in effect, or None if no candidate mode was usable (the driver
+        default is left in place).
+    """
+    initial = current_mode(cap)
+    if initial is None:
+        logger.warning(f"Camera {camera_index}: current frame size unknown, leaving the capture mode unchanged")
+        return None
+    aspect = initial.aspect
+
+    cache = CameraModeCache(cache_path) if cache_path else None
+    key = CameraModeCache.device_key(cap, camera_index)
+
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None and not cached.has_aspect(aspect):
+            logger.info(f"Camera {camera_index}: cached mode {cached} does not match the camera's aspect ratio {aspect:.3f}, probing again")
+            cache.remove(key)
+        elif cached is not None:
+            actual = apply_mode(cap, cached)
+            if actual is not None and actual.width == cached.width and actual.height == cached.height:
+                logger.info(f"Camera {camera_index}: using cached capture mode {actual}")
+                return actual
+            logger.info(f"Camera {camera_index}: cached mode {cached} is no longer available, probing again")
+            cache.remove(key)
+
+    supported = probe_modes(cap)
+    if initial not in supported:
+        supported.append(initial)
+    logger.info(f"Camera {camera_index}: supported modes {', '.join(str(mode) for mode in supported) or 'none'}")
+    chosen = choose_mode(supported, min_width, min_fps, aspect)
+    if chosen is None:
+        logger.warning(f"Camera {camera_index}: no probed mode with aspect ratio {aspect:.3f} is at least {min_width}px wide, "
+                       f"keeping {initial}")
+        # Probing left the driver in the last candidate mode
+        apply_mode(cap, initial)
+        return None
+
+    actual = apply_mode(cap, chosen)
+    if actual is None:
+        logger.warning(f"Camera {camera_index}: failed to re-apply chosen mode {chosen}, keeping {initial}")
+        apply_mode(cap, initial)
+        return None
+
+    logger.info(f"Camera {camera_index}: selected capture mode {actual}")
+    if cache is not None:
+        cache.set(key, actual)
+    return actual
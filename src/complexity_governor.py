@@ -0,0 +1,96 @@
+import logging
+from collections import deque
+from typing import Optional
+
+
+class ModelComplexityGovernor:
+    """Chooses the MediaPipe pose model complexity from measured inference latency
+
+    The governor keeps a rolling window of inference times and compares the mean
+    with the per-frame budget. It steps down a level when inference uses more than
+    downgrade_ratio of the budget, and up a level when it uses less than
+    upgrade_ratio. The gap between the two ratios plus a cooldown after every
+    switch gives hysteresis. A level that was just abandoned for being too slow
+    is not retried for a much longer time.
+
+    A switch takes effect once the new model is built: record() returns the
+    requested level and then requests nothing more until the caller reports
+    the outcome with switched() or reject(). Only then does level change and
+    the latency window restart, so the old model's timings never count
+    toward the new level. All methods are called from the inference thread.
+    """
+
+    def __init__(self, target_fps: float, initial_level: int = 1, min_level: int = 0, max_level: int = 2,
+                 window: int = 30, upgrade_ratio: float = 0.35, downgrade_ratio: float = 0.8,
+                 cooldown_frames: int = 60, retry_slower_after_frames: int = 900):
+        self.frame_budget = 1.0 / target_fps
+        self.level = initial_level
+        self.min_level = min_level
+        self.max_level = max_level
+        self.upgrade_ratio = upgrade_ratio
+        self.downgrade_ratio = downgrade_ratio
+        self.cooldown_frames = cooldown_frames
+        self.retry_slower_after_frames = retry_slower_after_frames
+
+        self.latencies = deque(maxlen=window)
+        self.pending_level: Optional[int] = None  # Requested level whose model is not in use yet
+        self.frames_since_switch = 0
+        self.too_slow_level: Optional[int] = None
+        self.frames_since_too_slow = 0
+        self.logger = logging.getLogger('ModelComplexityGovernor')
+
+    @property
+    def mean_latency(self) -> float:
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def record(self, latency: float) -> Optional[int]:
+        """Record one inference time in seconds
+
+        Returns:
+            The complexity level to switch to if a switch is due, otherwise None.
+        """
+        self.latencies.append(latency)
+        self.frames_since_switch += 1
+        self.frames_since_too_slow += 1
+
+        if self.pending_level is not None:
+            return None
+        if len(self.latencies) < self.latencies.maxlen or self.frames_since_switch < self.cooldown_frames:
+            return None
+
+        usage = self.mean_latency / self.frame_budget
+        new_level = None
+        if usage > self.downgrade_ratio and self.level > self.min_level:
+            new_level = self.level - 1
+            self.too_slow_level = self.level
+            self.frames_since_too_slow = 0
+        elif usage < self.upgrade_ratio and self.level < self.max_level:
+            candidate = self.level + 1
+            if candidate != self.too_slow_level or self.frames_since_too_slow >= self.retry_slower_after_frames:
+                new_level = candidate
+
+        if new_level is None:
+            return None
+
+        self.logger.info(f"Switching model complexity {self.level} -> {new_level} "
+                         f"(mean inference {self.mean_latency * 1000:.1f} ms, budget {self.frame_budget * 1000:.1f} ms)")
+        self.pending_level = new_level
+        return new_level
+
+    def switched(self, level: int) -> None:
+        """The model of level is in use from now on"""
+        self.level = level
+        self.pending_level = None
+        self.latencies.clear()
+        self.frames_since_switch = 0
+
+    def reject(self, failed_level: int, current_level: int) -> None:
+        """Stay on current_level and never request failed_level again (e.g. the model could not be loaded)"""
+        self.level = current_level
+        self.pending_level = None
+        if failed_level < current_level:
+            self.min_level = max(self.min_level, current_level)
+        else:
+            self.max_level = min(self.max_level, current_level)
+        self.latencies.clear()
+        self.frames_since_switch = 0
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 
 @dataclass
 class MovementConfig:
@@ -13,8 +13,46 @@ class MovementConfig:
     bend_threshold: float = 0.06
     cooldown_period: float = 1.0
     stability_threshold: float = 0.028
+    jump_detector: str = "window"  # "window": heels rise over the distance window; "onset": hips and nose accelerate up at takeoff
+    jump_onset_velocity: float = 0.4  # Upward hip and nose speed (units/s over two frames) for an onset jump
+    jump_onset_acceleration: float = 3.0  # Upward hip acceleration (units/s^2) for an onset jump
     stability_moves_threshold = {"jump": 0.01, "bend": 0.01}
     camera_index: int = 0  # Camera device index to use 
+    threaded_capture: bool = True  # Read the camera on a background thread, keeping only the newest frame
+    video_read_ahead_frames: int = 8  # Decode video files ahead into a queue of this depth (0 decodes inline)
+    pipelined: bool = False  # Run capture, inference, analysis and rendering as separate threaded stages
+    pipeline_queue_size: int = 2  # Frames buffered between pipeline stages
+    presenter_thread: bool = True  # Show frames and poll keys on a dedicated display thread
+    display_refresh_rate: float = 60.0  # Refresh rate of the display thread in Hz
+    frame_width: int = 500  # Width frames are resized to before pose inference
+    negotiate_capture_mode: bool = True  # Probe the camera for the cheapest mode covering frame_width
+    camera_mode_cache_path: Optional[str] = "camera_modes.json"  # Per-device cache of the negotiated mode (None disables)
+    mirror_landmarks: bool = False  # Skip the pixel flip and mirror landmark x (x -> 1-x) after inference instead
+    person_crop: bool = False  # Run pose on a crop around the previous frame's body instead of the whole frame
+    person_crop_margin: float = 0.25  # Margin added on each side of the body box, as a fraction of its size
+    inference_pixel_budget: int = 256 * 256  # Pixels fed to pose inference in person_crop mode
+    model_complexity: int = 1  # MediaPipe pose model: 0 = lite, 1 = full, 2 = heavy
+    adaptive_model_complexity: bool = False  # Switch model complexity at runtime based on inference latency
+    target_fps: float = 30.0  # Frame rate whose per-frame budget the complexity governor aims for
+    landmark_bridge_frames: int = 0  # Predict landmarks for up to this many frames of pose dropout (0 disables)
+    pose_inference_interval: int = 1  # Run pose inference every Nth frame and predict landmarks in between
+    kalman_process_noise: float = 1e-4  # Landmark acceleration variance for the Kalman predictor
+    kalman_measurement_noise: float = 2.5e-5  # Landmark measurement variance for the Kalman predictor
+    landmark_smoothing: bool = False  # One Euro filter landmarks between extraction and the landmark history
+    one_euro_min_cutoff: float = 1.0  # Cutoff frequency (Hz) of the smoothing for still landmarks; lower smooths more
+    one_euro_beta: float = 10.0  # Cutoff increase per unit/s of landmark speed; higher lags less on fast movement
+    one_euro_d_cutoff: float = 1.0  # Cutoff frequency (Hz) of the smoothed landmark speed
+    one_euro_group_params: Dict[str, Tuple[float, float]] = field(default_factory=lambda: {"legs": (8.0, 10.0), "feet": (8.0, 10.0)})  # (min_cutoff, beta) overrides per joint group (face, torso, arms, legs, feet); feet need a light touch or smoothed takeoffs read as stable
+    feature_windows: Tuple[int, ...] = (2, 5, 10)  # Spans (frames at 30 FPS) of the kinematic feature store; detectors may add more
+    landmark_history_frames: int = 30  # Landmark frames kept for detectors (grows to num_frames_to_check if that is larger)
+    time_based_windows: bool = False  # Size the distance window and stability requirements by capture time instead of frame count
+    motion_window_ms: Optional[float] = None  # Span of the time-based distance window (None: num_frames_to_check_per_30_fps frames at 30 FPS)
+    trace_enabled: bool = False  # Record per-frame detector values into a trace ring buffer (always on in debug mode)
+    trace_frames: int = 900  # Frames kept in the trace ring buffer
+    trace_dump_seconds: float = 5.0  # Span of the trace logged on the 't' key and at exit
+    trace_dump_path: Optional[str] = None  # CSV file the whole trace is saved to at exit (None logs the last trace_dump_seconds)
+    detector_scheduling: bool = True  # Skip detect() of detectors that cannot fire on the frame (low motion energy, in motion, cooldown)
+    movement_rules: bool = False  # Detect moves with the app's declarative rules file (src/apps/<app>/rules.json) instead of its movement classes
     visibility_threshold: float = 0.5  # Minimum visibility score for landmarks to be considered
     sound_enabled: bool = False  # Whether to play movement sounds
     sound_volume: float = 0.7  # Sound volume level (0.0 to 1.0)
@@ -43,6 +81,14 @@ class MovementConfig:
             raise ValueError("min_tracking_confidence must be between 0 and 1")
         if self.jump_threshold < 0 or self.jump_threshold > 1:
             raise ValueError("jump_threshold must be between 0 and 1")
+        if self.jump_detector not in ("window", "onset"):
+            raise ValueError("jump_detector must be 'window' or 'onset'")
+        if self.jump_onset_velocity <= 0:
+            raise ValueError("jump_onset_velocity must be positive")
+        if self.jump_onset_acceleration <= 0:
+            raise ValueError("jump_onset_acceleration must be positive")
+        if self.jump_detector == "onset" and self.movement_rules:
+            raise ValueError("jump_detector 'onset' is not available with movement_rules; the rules file defines the jump")
         if self.step_threshold < 0 or self.step_threshold > 1:
             raise ValueError("step_threshold must be between 0 and 1")
         if self.bend_threshold < 0 or self.bend_threshold > 1:
@@ -55,6 +101,42 @@ class MovementConfig:
             raise ValueError("num_frames_to_check_per_30_fps must be at least 1 (ideally >=2 for stillness check)")
         if self.camera_index < 0:
             raise ValueError("camera_index must be non-negative")
+        if self.pipeline_queue_size < 1:
+            raise ValueError("pipeline_queue_size must be at least 1")
+        if self.display_refresh_rate <= 0:
+            raise ValueError("display_refresh_rate must be positive")
+        if self.frame_width < 1:
+            raise ValueError("frame_width must be positive")
+        if self.person_crop_margin < 0:
+            raise ValueError("person_crop_margin must be non-negative")
+        if self.inference_pixel_budget < 16 * 16:
+            raise ValueError("inference_pixel_budget must be at least 256 pixels")
+        if self.model_complexity not in (0, 1, 2):
+            raise ValueError("model_complexity must be 0, 1 or 2")
+        if self.target_fps <= 0:
+            raise ValueError("target_fps must be positive")
+        if self.landmark_bridge_frames < 0:
+            raise ValueError("landmark_bridge_frames must be non-negative")
+        if self.pose_inference_interval < 1:
+            raise ValueError("pose_inference_interval must be at least 1")
+        if self.kalman_process_noise <= 0 or self.kalman_measurement_noise <= 0:
+            raise ValueError("Kalman noise parameters must be positive")
+        if self.one_euro_min_cutoff <= 0 or self.one_euro_d_cutoff <= 0:
+            raise ValueError("One Euro cutoff frequencies must be positive")
+        if self.one_euro_beta < 0:
+            raise ValueError("one_euro_beta must be non-negative")
+        if self.video_read_ahead_frames < 0:
+            raise ValueError("video_read_ahead_frames must be non-negative")
+        if not self.feature_windows or min(self.feature_windows) < 1:
+            raise ValueError("feature_windows must hold at least one span of 1 frame or more")
+        if self.landmark_history_frames < 1:
+            raise ValueError("landmark_history_frames must be at least 1")
+        if self.motion_window_ms is not None and self.motion_window_ms <= 0:
+            raise ValueError("motion_window_ms must be positive")
+        if self.trace_frames < 1:
+            raise ValueError("trace_frames must be at least 1")
+        if self.trace_dump_seconds <= 0:
+            raise ValueError("trace_dump_seconds must be positive")
         if self.visibility_threshold < 0 or self.visibility_threshold > 1:
             raise ValueError("visibility_threshold must be between 0 and 1")
         if self.sound_volume < 0 or self.sound_volume > 1:
@@ -17,6 +17,26 @@ RIGHT_HIP_INDEX = mp.solutions.pose.PoseLandmark.RIGHT_HIP
 LEFT_WRIST_INDEX = mp.solutions.pose.PoseLandmark.LEFT_WRIST
 RIGHT_WRIST_INDEX = mp.solutions.pose.PoseLandmark.RIGHT_WRIST
 
+# Landmark order after mirroring the image horizontally: MediaPipe labels sides
+# anatomically, so a mirrored frame swaps every left/right landmark pair
+MIRRORED_LANDMARK_ORDER = [
+    0,                      # nose
+    4, 5, 6, 1, 2, 3,       # eyes (inner, center, outer)
+    8, 7,                   # ears
+    10, 9,                  # mouth
+    12, 11,                 # shoulders
+    14, 13,                 # elbows
+    16, 15,                 # wrists
+    18, 17,                 # pinkies
+    20, 19,                 # index fingers
+    22, 21,                 # thumbs
+    24, 23,                 # hips
+    26, 25,                 # knees
+    28, 27,                 # ankles
+    30, 29,                 # heels
+    32, 31,                 # foot index
+]
+
 # Coordinate indices
 X_COORDINATE_INDEX = 0
 Y_COORDINATE_INDEX = 1
@@ -0,0 +1,99 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+
+class DetectorScheduler:
+    """Runs detect() only on the detectors that can fire on the current frame
+
+    Detectors declare when their detect() cannot succeed:
+      min_motion_energy: every move needs some tracked joint coordinate to
+        move more than this over the distance window (None: no floor)
+      idle_in_motion: detect() returns None while is_in_motion
+      cooldown: seconds after the detector's own detection it cannot fire again
+
+    The motion energy of a frame is the analyzer's largest per-coordinate
+    joint movement over the distance window, so a detector below its floor
+    is skipped without changing what is detected. When every detector has a
+    floor above the frame's energy (the player stands still), detection
+    costs one comparison. Detectors whose required joints are not visible on
+    the frame are skipped as well. Stability state is not touched here:
+    detectors are still updated every frame by the analyzer.
+
+    Calls, hits and the time spent in each detector's detect() are counted.
+    """
+
+    def __init__(self, analyzer: Any):
+        self.analyzer = analyzer
+        self.logger = logging.getLogger('DetectorScheduler')
+        self.frames: int = 0
+        self.idle_frames: int = 0  # Frames below every detector's energy floor
+        self._detectors: Optional[List[Any]] = None  # movement_detectors the per-detector lists were built for
+        self._bind()
+
+    def _bind(self) -> None:
+        detectors = self.analyzer.movement_detectors
+        self._detectors = detectors
+        self._floors = [float("-inf") if detector.min_motion_energy is None else detector.min_motion_energy
+                        for detector in detectors]
+        # With no detectors nothing can fire; any detector without a floor keeps every frame busy
+        self._idle_energy = min(self._floors) if detectors else float("inf")
+        self._idle_in_motion = [detector.idle_in_motion for detector in detectors]
+        self._cooldowns = [detector.cooldown for detector in detectors]
+        self._cooldown_until = [float("-inf")] * len(detectors)
+        self.calls = [0] * len(detectors)
+        self.hits = [0] * len(detectors)
+        self.seconds = [0.0] * len(detectors)
+
+    def detect(self) -> Optional[str]:
+        """Return the first move detected by a detector that can fire, in detector order"""
+        if self._detectors is not self.analyzer.movement_detectors:
+            self._bind()
+        self.frames += 1
+        energy = self.analyzer.motion_energy
+        if energy <= self._idle_energy:
+            self.idle_frames += 1
+            return None
+
+        frame_time = self.analyzer.frame_time
+        visible = self.analyzer.detector_visible
+        perf_counter = time.perf_counter
+        for index, detector in enumerate(self._detectors):
+            if energy <= self._floors[index] or frame_time < self._cooldown_until[index] or not visible[index]:
+                continue
+            if self._idle_in_motion[index] and detector.is_in_motion:
+                continue
+            start = perf_counter()
+            detected = detector.detect()
+            self.seconds[index] += perf_counter() - start
+            self.calls[index] += 1
+            if detected:
+                self.hits[index] += 1
+                self._cooldown_until[index] = frame_time + self._cooldowns[index]
+                return detected
+        return None
+
+    def snapshot(self) -> Dict[str, float]:
+        """When each detector's cooldown ends, by detector name"""
+        if self._detectors is not self.analyzer.movement_detectors:
+            self._bind()
+        return {detector.name: until for detector, until in zip(self._detectors, self._cooldown_until)}
+
+    def restore(self, state: Dict[str, float]) -> None:
+        """Restore the cooldowns of snapshot()"""
+        if self._detectors is not self.analyzer.movement_detectors:
+            self._bind()
+        self._cooldown_until = [state.get(detector.name, float("-inf")) for detector in self._detectors]
+
+    def log_stats(self) -> None:
+        if not self.frames:
+            return
+        self.logger.info(f"{self.frames} frames, {self.idle_frames} below every energy floor")
+        for index, detector in enumerate(self._detectors):
+            calls = self.calls[index]
+            mean = self.seconds[index] / calls if calls else 0.0
+            hit_rate = self.hits[index] / calls if calls else 0.0
+            self.logger.info(
+                f"{detector.name}: detect() on {calls}/{self.frames} frames, {self.hits[index]} hits "
+                f"({hit_rate:.1%} of calls), mean {mean * 1e6:.1f} us, total {self.seconds[index] * 1000:.2f} ms"
+            )
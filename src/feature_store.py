@@ -0,0 +1,154 @@
+import numpy as np
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from src.constants import LEFT_HIP_INDEX, RIGHT_HIP_INDEX, LEFT_SHOULDER_INDEX, RIGHT_SHOULDER_INDEX
+
+# Derived points that follow the tracked joints in the feature rows
+CENTER = "center"  # Midpoint of the hips
+TORSO = "torso"    # Midpoint of the shoulders
+
+
+class KinematicFeatureStore:
+    """Displacement, velocity and acceleration of the tracked joints over several windows
+
+    Rows are the analyzer's tracked joints followed by the body center and
+    the torso; row() maps a joint index, CENTER or TORSO to its row. Windows
+    are spans in frames at 30 FPS, scaled with the frame rate (or turned
+    into durations with time-based windows). For each window:
+      displacement: current position minus the position one span back
+      velocity: displacement per second
+      acceleration: velocity minus the same span's velocity one frame
+        earlier, per second of the newest frame's interval (zero until the
+        history reaches one frame past the span)
+    Arrays are (windows, rows, 3) in image coordinates, so y grows downwards.
+
+    Like stability pairs, detectors register the windows they need with
+    add_window() and then only read. Only the onset jump detector does so;
+    the threshold detectors, stability pairs and movement rules read the
+    analyzer's rounded distance table, which their thresholds are tuned on. Everything is computed in one
+    vectorized pass the first time a frame's features are read, so frames
+    nobody reads cost nothing.
+    """
+
+    def __init__(self, analyzer: Any, windows: Sequence[int] = (2, 5, 10)):
+        self.analyzer = analyzer
+        self.windows: List[int] = []
+        for frames in windows:
+            self.add_window(frames)
+
+        self._bound_joints: Optional[List[int]] = None
+        self._rows = {}
+        self._frame = -1  # analyzer.frame_counter the features were computed for
+
+        self.displacement = np.zeros((len(self.windows), 0, 3))
+        self.velocity = np.zeros((len(self.windows), 0, 3))
+        self.acceleration = np.zeros((len(self.windows), 0, 3))
+        self.torso_length = 0.0  # Current hip center to shoulder center distance in x, y
+
+    def add_window(self, frames: int) -> int:
+        """Register a window of `frames` frames at 30 FPS and return its index"""
+        if frames < 1:
+            raise ValueError("feature windows must span at least 1 frame")
+        if frames not in self.windows:
+            self.windows.append(frames)
+            self._frame = -1
+        return self.windows.index(frames)
+
+    def _bind(self) -> None:
+        """Build the (rows, 33) matrix averaging landmarks into the feature rows"""
+        joints = self.analyzer.tracked_joints
+        self._rows = {joint: row for row, joint in enumerate(joints)}
+        self._rows[CENTER] = len(joints)
+        self._rows[TORSO] = len(joints) + 1
+        num_landmarks = len(self.analyzer.landmark_array)
+        self._mixing = np.zeros((len(joints) + 2, num_landmarks))
+        self._mixing[np.arange(len(joints)), joints] = 1.0
+        self._mixing[len(joints), [LEFT_HIP_INDEX, RIGHT_HIP_INDEX]] = 0.5
+        self._mixing[len(joints) + 1, [LEFT_SHOULDER_INDEX, RIGHT_SHOULDER_INDEX]] = 0.5
+        self._bound_joints = joints
+
+    def invalidate(self) -> None:
+        """Recompute on the next read, even for the same analyzer frame"""
+        self._frame = -1
+
+    def row(self, point: Union[int, str]) -> int:
+        """Row of a tracked joint index, CENTER or TORSO"""
+        self._compute()
+        return self._rows[point]
+
+    def _compute(self) -> None:
+        analyzer = self.analyzer
+        if self._frame == analyzer.frame_counter:
+            return
+        if self._bound_joints is not analyzer.tracked_joints:
+            self._bind()
+
+        # Positions now, one span back, one frame back and one frame plus one span back, in one lookup
+        spans = [analyzer.frames_back(frames) for frames in self.windows]
+        num_windows = len(spans)
+        stored = len(analyzer.landmark_history)
+        frames, times = analyzer.landmark_history.gather(np.array([0] + spans + [1] + [1 + span for span in spans]))
+
+        # All three features are linear in those frames: build their coefficients per lookup, with
+        # time factors of zero for spans the history cannot cover yet, and apply them in one product
+        times = times.tolist()
+        now, last = times[0], times[1 + num_windows]
+        num_lookups = len(times)
+        frame_per_second = 1.0 / (now - last) if now > last else 0.0
+        coefficients = [[0.0] * num_lookups for _ in range(3 * num_windows)]
+        for window in range(num_windows):
+            start, previous, before = 1 + window, 1 + num_windows, 2 + num_windows + window
+            start_time, before_time = times[start], times[before]
+            per_second = 1.0 / (now - start_time) if now > start_time else 0.0
+            covered = 1 + spans[window] < stored and last > before_time
+            previous_per_second = 1.0 / (last - before_time) if covered else 0.0
+
+            displacement = coefficients[window]
+            displacement[0] += 1.0
+            displacement[start] -= 1.0
+            velocity = coefficients[num_windows + window]
+            velocity[0] += per_second
+            velocity[start] -= per_second
+            if not previous_per_second:
+                continue
+            # (velocity - velocity one frame earlier) * frame_per_second
+            acceleration = coefficients[2 * num_windows + window]
+            acceleration[0] += per_second * frame_per_second
+            acceleration[start] -= per_second * frame_per_second
+            acceleration[previous] -= previous_per_second * frame_per_second
+            acceleration[before] += previous_per_second * frame_per_second
+
+        mixed = np.matmul(np.array(coefficients), frames.reshape(num_lookups, -1))
+        mixed = mixed.reshape(3 * num_windows, *frames.shape[1:])
+        features = np.matmul(self._mixing, mixed)
+        self.displacement = features[:num_windows]
+        self.velocity = features[num_windows:2 * num_windows]
+        self.acceleration = features[2 * num_windows:]
+
+        current = frames[0]
+        torso_x = (current.item(LEFT_SHOULDER_INDEX, 0) + current.item(RIGHT_SHOULDER_INDEX, 0)
+                   - current.item(LEFT_HIP_INDEX, 0) - current.item(RIGHT_HIP_INDEX, 0)) / 2
+        torso_y = (current.item(LEFT_SHOULDER_INDEX, 1) + current.item(RIGHT_SHOULDER_INDEX, 1)
+                   - current.item(LEFT_HIP_INDEX, 1) - current.item(RIGHT_HIP_INDEX, 1)) / 2
+        self.torso_length = (torso_x * torso_x + torso_y * torso_y) ** 0.5
+        self._frame = analyzer.frame_counter
+
+    def get_displacement(self, point: Union[int, str], axis: int, window: int = 0) -> float:
+        """Displacement of a point on an axis over the window with index `window`"""
+        self._compute()
+        return self.displacement.item(window, self._rows[point], axis)
+
+    def get_velocity(self, point: Union[int, str], axis: int, window: int = 0) -> float:
+        """Velocity (units per second) of a point on an axis over the window with index `window`"""
+        self._compute()
+        return self.velocity.item(window, self._rows[point], axis)
+
+    def get_acceleration(self, point: Union[int, str], axis: int, window: int = 0) -> float:
+        """Acceleration (units per second squared) of a point on an axis over the window with index `window`"""
+        self._compute()
+        return self.acceleration.item(window, self._rows[point], axis)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(displacement, velocity, acceleration) arrays of the current frame, each (windows, rows, 3)"""
+        self._compute()
+        return self.displacement, self.velocity, self.acceleration
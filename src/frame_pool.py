@@ -0,0 +1,50 @@
+import numpy as np
+import logging
+from typing import Dict, List, Tuple
+
+
+class FrameBufferPool:
+    """Hands out reusable frame buffers for OpenCV dst= outputs
+
+    Each stage asks for a buffer by key. A key owns a ring of `slots` buffers
+    that are handed out round-robin, so a buffer is only reused after `slots`
+    newer frames were requested for the same key. Use one slot when the frame
+    is consumed before the next one is produced, and more when frames are
+    queued between threads.
+    """
+
+    def __init__(self, slots: int = 1, name: str = "FrameBufferPool"):
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        self.slots = slots
+        self.logger = logging.getLogger(name)
+        self._buffers: Dict[str, List[np.ndarray]] = {}
+        self._next_slot: Dict[str, int] = {}
+
+        # Number of buffers actually allocated (should stop growing after warm-up)
+        self.allocations: int = 0
+        self.requests: int = 0
+
+    def get(self, key: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Return the next buffer for key, reallocating only if shape or dtype changed"""
+        self.requests += 1
+        ring = self._buffers.setdefault(key, [])
+        slot = self._next_slot.get(key, 0)
+        self._next_slot[key] = (slot + 1) % self.slots
+
+        if slot < len(ring):
+            buffer = ring[slot]
+            if buffer.shape == shape and buffer.dtype == dtype:
+                return buffer
+
+        buffer = np.empty(shape, dtype=dtype)
+        self.allocations += 1
+        if slot < len(ring):
+            ring[slot] = buffer
+        else:
+            ring.append(buffer)
+        return buffer
+
+    def log_stats(self) -> None:
+        """Log how many buffers were allocated versus requested"""
+        self.logger.info(f"Buffer requests: {self.requests}, allocations: {self.allocations}")
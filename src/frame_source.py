@@ -0,0 +1,243 @@
+import cv2
+import numpy as np
+import threading
+import queue
+import time
+import logging
+from typing import Optional, Tuple, Callable
+
+Preprocess = Callable[[np.ndarray], np.ndarray]
+
+
+class FrameSource:
+    """Reads frames from an OpenCV capture on the calling thread"""
+
+    def __init__(self, cap: cv2.VideoCapture, preprocess: Optional[Preprocess] = None):
+        self.cap = cap
+        self.preprocess = preprocess
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # Statistics
+        self.frames_captured: int = 0
+        self.frames_delivered: int = 0
+        self.frames_dropped: int = 0
+        self.read_failures: int = 0
+
+    def start(self) -> "FrameSource":
+        """Start the source (no-op for synchronous reads)"""
+        return self
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """Read the next frame
+
+        Returns:
+            Tuple of (success, frame, capture timestamp from time.time())
+        """
+        ret, image = self.cap.read()
+        capture_time = time.time()
+        if not ret:
+            self.read_failures += 1
+            return False, None, capture_time
+
+        self.frames_captured += 1
+        self.frames_delivered += 1
+        return True, self._preprocess(image), capture_time
+
+    def _preprocess(self, image: np.ndarray) -> np.ndarray:
+        return self.preprocess(image) if self.preprocess is not None else image
+
+    def get(self, prop_id: int) -> float:
+        """Proxy to cv2.VideoCapture.get"""
+        return self.cap.get(prop_id)
+
+    def stop(self) -> None:
+        """Stop the source (no-op for synchronous reads)"""
+        pass
+
+    def release(self) -> None:
+        """Stop the source and release the underlying capture"""
+        self.stop()
+        self.cap.release()
+
+    def log_stats(self) -> None:
+        """Log capture statistics"""
+        self.logger.info(
+            f"Frames captured: {self.frames_captured}, delivered: {self.frames_delivered}, "
+            f"dropped: {self.frames_dropped}, read failures: {self.read_failures}"
+        )
+
+
+class LatestFrameSource(FrameSource):
+    """Captures frames on a background thread and keeps only the newest one
+
+    The camera driver buffers frames while the consumer is busy with pose
+    inference. Draining the capture on a dedicated thread into a one-slot
+    buffer means every read returns the freshest image; frames overwritten
+    before they were consumed are counted in frames_dropped.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, preprocess: Optional[Preprocess] = None, read_timeout: float = 1.0):
+        super().__init__(cap, preprocess)
+        self.read_timeout = read_timeout
+
+        self._condition = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._frame_time: float = 0.0
+        self._frame_id: int = 0
+        self._delivered_id: int = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "LatestFrameSource":
+        """Start the capture thread"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="LatestFrameSource", daemon=True)
+        self._thread.start()
+        self.logger.info("Capture thread started")
+        return self
+
+    def _capture_loop(self) -> None:
+        while self._running:
+            ret, image = self.cap.read()
+            capture_time = time.time()
+            if not ret:
+                self.read_failures += 1
+                time.sleep(0.005)  # Avoid spinning if the device is temporarily unavailable
+                continue
+
+            with self._condition:
+                if self._frame_id > self._delivered_id:
+                    # Previous frame was never consumed
+                    self.frames_dropped += 1
+                self._frame = image
+                self._frame_time = capture_time
+                self._frame_id += 1
+                self.frames_captured += 1
+                self._condition.notify()
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """Wait for a frame newer than the last one returned
+
+        Returns:
+            Tuple of (success, frame, capture timestamp). success is False if no
+            new frame arrived within read_timeout or the source is stopped.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._frame_id > self._delivered_id or not self._running,
+                                            timeout=self.read_timeout):
+                return False, None, time.time()
+            if self._frame_id <= self._delivered_id:
+                return False, None, time.time()
+
+            self._delivered_id = self._frame_id
+            self.frames_delivered += 1
+            image = self._frame
+            capture_time = self._frame_time
+            self._frame = None  # The consumer owns this frame now
+
+        # Preprocess outside the lock and only for frames that are actually used
+        return True, self._preprocess(image), capture_time
+
+    def stop(self) -> None:
+        """Stop the capture thread"""
+        if not self._running:
+            return
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.logger.info("Capture thread stopped")
+
+
+class ReadAheadFrameSource(FrameSource):
+    """Decodes and preprocesses video frames ahead of the consumer
+
+    A producer thread reads and preprocesses frames into a bounded FIFO queue,
+    so decoding overlaps with pose inference. Frames are delivered in decode
+    order and none are dropped; the producer blocks when the queue is full.
+    """
+
+    _END = None  # Queue sentinel marking the end of the stream
+
+    def __init__(self, cap: cv2.VideoCapture, preprocess: Optional[Preprocess] = None, depth: int = 8):
+        super().__init__(cap, preprocess)
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+        self.depth = depth
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, float]]]" = queue.Queue(maxsize=depth)
+        self._running = False
+        self._finished = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ReadAheadFrameSource":
+        """Start the decode thread"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._decode_loop, name="ReadAheadFrameSource", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Read-ahead decode thread started (depth {self.depth})")
+        return self
+
+    def _put(self, item: Optional[Tuple[np.ndarray, float]]) -> bool:
+        # Block while the queue is full, but keep checking whether we were stopped
+        while self._running:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decode_loop(self) -> None:
+        try:
+            while self._running:
+                ret, image = self.cap.read()
+                capture_time = time.time()
+                if not ret:
+                    self.read_failures += 1
+                    break
+                self.frames_captured += 1
+                if not self._put((self._preprocess(image), capture_time)):
+                    return
+        except Exception as e:
+            self.logger.error(f"Read-ahead decode failed: {e}", exc_info=True)
+        self._put(self._END)
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray], float]:
+        """Return the next decoded frame in order
+
+        Returns:
+            Tuple of (success, frame, decode timestamp). success is False once
+            the end of the video is reached.
+        """
+        if self._finished or not self._running:
+            return False, None, time.time()
+
+        item = self._queue.get()
+        if item is self._END:
+            self._finished = True
+            return False, None, time.time()
+
+        self.frames_delivered += 1
+        image, capture_time = item
+        return True, image, capture_time
+
+    def stop(self) -> None:
+        """Stop the decode thread and discard queued frames"""
+        if not self._running:
+            return
+        self._running = False
+        # Unblock a producer waiting on a full queue
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
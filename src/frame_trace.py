@@ -0,0 +1,134 @@
+import csv
+import logging
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+
+class TraceChannel:
+    """Named group of numeric fields that one component records every frame
+
+    Values go straight into the trace's preallocated array; nothing is
+    formatted until the trace is dumped. Fields not written in a frame
+    stay NaN. Booleans are stored as 0/1.
+    """
+
+    def __init__(self, trace: "FrameTrace", name: str, fields: Sequence[str], offset: int):
+        self.trace = trace
+        self.name = name
+        self.fields = tuple(fields)
+        self.offset = offset
+
+    def record(self, values: Sequence[float], start: int = 0) -> None:
+        """Set len(values) fields of the current frame in field order, beginning at field index start"""
+        trace = self.trace
+        first = self.offset + start
+        trace.values[trace.slot, first:first + len(values)] = values
+
+    def set(self, field: int, value: float) -> None:
+        """Set one field of the current frame by its index in fields"""
+        trace = self.trace
+        trace.values[trace.slot, self.offset + field] = value
+
+
+class FrameTrace:
+    """Ring buffer of per-frame numeric values, formatted only on demand
+
+    begin_frame() is called once per analyzed frame; channels then write into
+    that frame's row. dump() and save() format the newest frames for the log
+    or a CSV file, e.g. after a missed or false detection or on exit.
+    """
+
+    def __init__(self, capacity: int = 900):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.logger = logging.getLogger('FrameTrace')
+
+        self.frame_indices = np.full(capacity, -1, dtype=np.int64)
+        self.timestamps = np.zeros(capacity)
+        self.values = np.zeros((capacity, 0))
+        self.channels: Dict[str, TraceChannel] = {}
+        self.slot = 0  # Row of the current frame
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of frames held (at most capacity)"""
+        return min(self._count, self.capacity)
+
+    def channel(self, name: str, fields: Sequence[str]) -> TraceChannel:
+        """Register a channel, or return the one already registered under name"""
+        if name in self.channels:
+            channel = self.channels[name]
+            if channel.fields != tuple(fields):
+                raise ValueError(f"Trace channel '{name}' is already registered with other fields")
+            return channel
+
+        channel = TraceChannel(self, name, fields, self.values.shape[1])
+        self.values = np.hstack([self.values, np.full((self.capacity, len(channel.fields)), np.nan)])
+        self.channels[name] = channel
+        return channel
+
+    def begin_frame(self, frame_index: int, timestamp: float) -> None:
+        """Start the row of a new frame, overwriting the oldest one once full"""
+        slot = self._count % self.capacity
+        self._count += 1
+        self.slot = slot
+        self.frame_indices[slot] = frame_index
+        self.timestamps[slot] = timestamp
+        self.values[slot] = np.nan
+
+    def clear(self) -> None:
+        self._count = 0
+        self.slot = 0
+
+    def columns(self) -> List[str]:
+        """Names of the value columns as channel.field"""
+        return [f"{channel.name}.{field}" for channel in self.channels.values() for field in channel.fields]
+
+    def _rows(self, seconds: Optional[float] = None) -> np.ndarray:
+        """Row indices of the held frames, oldest first, limited to the last `seconds` if given"""
+        held = len(self)
+        if held == 0:
+            return np.zeros(0, dtype=np.intp)
+        rows = (np.arange(self._count - held, self._count) % self.capacity).astype(np.intp)
+        if seconds is not None:
+            newest = self.timestamps[rows[-1]]
+            rows = rows[self.timestamps[rows] >= newest - seconds]
+        return rows
+
+    def format(self, seconds: Optional[float] = None) -> List[str]:
+        """One line per frame with the fields each channel recorded"""
+        lines = []
+        for row in self._rows(seconds):
+            parts = [f"frame {self.frame_indices[row]} t={self.timestamps[row]:.3f}"]
+            values = self.values[row]
+            for channel in self.channels.values():
+                recorded = [
+                    f"{field}={values[channel.offset + i]:g}"
+                    for i, field in enumerate(channel.fields)
+                    if not np.isnan(values[channel.offset + i])
+                ]
+                if recorded:
+                    parts.append(f"{channel.name}: {' '.join(recorded)}")
+            lines.append(" | ".join(parts))
+        return lines
+
+    def dump(self, seconds: Optional[float] = None, logger: Optional[logging.Logger] = None) -> None:
+        """Log the last `seconds` of the trace (everything held if None)"""
+        logger = logger or self.logger
+        lines = self.format(seconds)
+        logger.info(f"Trace of the last {len(lines)} frames:")
+        for line in lines:
+            logger.info(line)
+
+    def save(self, path: str, seconds: Optional[float] = None) -> None:
+        """Write the last `seconds` of the trace to a CSV file (empty cells were not recorded)"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "timestamp"] + self.columns())
+            for row in self._rows(seconds):
+                writer.writerow(
+                    [int(self.frame_indices[row]), f"{self.timestamps[row]:.6f}"]
+                    + ["" if np.isnan(value) else f"{value:g}" for value in self.values[row]]
+                )
+        self.logger.info(f"Trace saved to {path}")
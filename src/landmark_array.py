@@ -0,0 +1,43 @@
+import numpy as np
+
+NUM_POSE_LANDMARKS = 33
+
+# Reading the serialized protobuf bytes in place is faster (about 8 vs 20 us per frame
+# in tests/landmark_extraction_benchmark.py), but it depends on the serializer's
+# field order and record layout and serializes every frame. Next to pose inference
+# the saving is negligible, so the landmarks are read through the message API.
+
+
+def new_landmark_array(num_landmarks: int = NUM_POSE_LANDMARKS) -> np.ndarray:
+    """Allocate an (N, 4) float32 array of x, y, z, visibility"""
+    return np.zeros((num_landmarks, 4), dtype=np.float32)
+
+
+def extract_landmarks(landmarks, out: np.ndarray) -> np.ndarray:
+    """Copy x, y, z and visibility of every landmark into out in a single pass
+
+    Values are written straight into out, without intermediate lists.
+    Landmarks missing from the list (fewer than len(out)) get visibility 0.
+    Protobuf fields are float32, so the copy is exact.
+
+    Args:
+        landmarks: NormalizedLandmarkList (or any object with a .landmark sequence)
+        out: C-contiguous (N, 4) float32 array to fill
+
+    Returns:
+        out
+    """
+    values = memoryview(out).cast("B").cast("f")
+    end = len(values)
+    index = 0
+    for landmark in landmarks.landmark:
+        if index == end:
+            break
+        values[index] = landmark.x
+        values[index + 1] = landmark.y
+        values[index + 2] = landmark.z
+        values[index + 3] = landmark.visibility
+        index += 4
+    if index < end:
+        out[index // 4:] = 0.0
+    return out
@@ -0,0 +1,121 @@
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+
+
+# MediaPipe pose landmark indices of each joint group
+JOINT_GROUPS: Dict[str, Sequence[int]] = {
+    "face": range(0, 11),        # Nose, eyes, ears, mouth
+    "torso": (11, 12, 23, 24),   # Shoulders and hips
+    "arms": range(13, 23),       # Elbows, wrists, hands
+    "legs": (25, 26, 27, 28),    # Knees and ankles
+    "feet": range(29, 33),       # Heels and foot indices
+}
+
+
+def group_parameters(min_cutoff: float, beta: float,
+                     overrides: Optional[Dict[str, Tuple[float, float]]] = None,
+                     num_landmarks: int = 33) -> Tuple[np.ndarray, np.ndarray]:
+    """(N,) min_cutoff and beta arrays, with (min_cutoff, beta) overrides per joint group"""
+    min_cutoffs = np.full(num_landmarks, float(min_cutoff))
+    betas = np.full(num_landmarks, float(beta))
+    for group, (group_min_cutoff, group_beta) in (overrides or {}).items():
+        if group not in JOINT_GROUPS:
+            raise ValueError(f"Unknown joint group '{group}', expected one of {list(JOINT_GROUPS)}")
+        if group_min_cutoff <= 0 or group_beta < 0:
+            raise ValueError(f"Joint group '{group}' needs a positive min_cutoff and a non-negative beta")
+        indices = list(JOINT_GROUPS[group])
+        min_cutoffs[indices] = group_min_cutoff
+        betas[indices] = group_beta
+    return min_cutoffs, betas
+
+
+class OneEuroFilter:
+    """One Euro filter over all pose landmarks at once
+
+    Each coordinate is low-pass filtered with a cutoff frequency that grows
+    with its filtered speed: min_cutoff + beta * |speed|. Still landmarks are
+    smoothed hard, which removes the pose jitter, while fast ones follow the
+    measurement closely, which keeps the lag on real movement small.
+    min_cutoff and beta are (N,) arrays so joint groups can be tuned apart;
+    the speed itself is smoothed with the fixed d_cutoff.
+
+    Time is measured in seconds (speeds in normalized units per second).
+    """
+
+    def __init__(self, min_cutoff: np.ndarray, beta: np.ndarray, d_cutoff: float = 1.0, num_landmarks: int = 33):
+        self.num_landmarks = num_landmarks
+        self.min_cutoff = np.broadcast_to(np.asarray(min_cutoff, dtype=np.float64), (num_landmarks,))[:, None]
+        self.beta = np.broadcast_to(np.asarray(beta, dtype=np.float64), (num_landmarks,))[:, None]
+        self.d_cutoff = d_cutoff
+
+        self.value = np.zeros((num_landmarks, 3))
+        self.speed = np.zeros((num_landmarks, 3))
+        self.last_time: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config) -> 'OneEuroFilter':
+        min_cutoffs, betas = group_parameters(config.one_euro_min_cutoff, config.one_euro_beta,
+                                              config.one_euro_group_params)
+        return cls(min_cutoffs, betas, config.one_euro_d_cutoff)
+
+    def reset(self) -> None:
+        """Forget all state; the next frame is taken as is"""
+        self.value[:] = 0.0
+        self.speed[:] = 0.0
+        self.last_time = None
+
+    def reset_landmarks(self, landmarks: np.ndarray, points: np.ndarray) -> None:
+        """Restart the given landmarks at their positions in the (N, 3) points, at rest"""
+        self.value[landmarks] = points[landmarks]
+        self.speed[landmarks] = 0.0
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, Optional[float]]:
+        """Copy of the filter state: (value, speed, last_time)"""
+        return self.value.copy(), self.speed.copy(), self.last_time
+
+    def restore(self, state: Tuple[np.ndarray, np.ndarray, Optional[float]]) -> None:
+        """Continue from a state returned by snapshot()"""
+        value, speed, self.last_time = state
+        self.value[:] = value
+        self.speed[:] = speed
+
+    def __call__(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        """Filter the (N, 3) landmark positions of one frame and return the smoothed copy"""
+        if self.last_time is None:
+            self.value[:] = points
+            self.last_time = timestamp
+            return self.value.copy()
+
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            # Repeated timestamp: no time passed, so the estimate cannot move
+            return self.value.copy()
+        self.last_time = timestamp
+
+        # Smoothing factor of a first-order low-pass at cutoff fc: fc / (fc + 1 / (2 pi dt))
+        rate = 1.0 / (2.0 * np.pi * dt)
+        change = points - self.value
+        speed_alpha = self.d_cutoff / (self.d_cutoff + rate)
+        self.speed += speed_alpha * (change / dt - self.speed)
+
+        cutoff = np.abs(self.speed)
+        cutoff *= self.beta
+        cutoff += self.min_cutoff
+        alpha = cutoff / (cutoff + rate)
+        change *= alpha
+        self.value += change
+        return self.value.copy()
+
+    def filter_sequence(self, points: np.ndarray, timestamps: np.ndarray,
+                        resets: Optional[Dict[int, np.ndarray]] = None) -> np.ndarray:
+        """Filter (T, N, 3) positions frame by frame, same as calling the filter on each frame in order
+
+        Args:
+            resets: Landmarks to pass to reset_landmarks() before filtering a frame, by frame index
+        """
+        filtered = np.empty_like(points, dtype=np.float64)
+        for frame_index, timestamp in enumerate(np.asarray(timestamps, dtype=np.float64).tolist()):
+            if resets and frame_index in resets:
+                self.reset_landmarks(resets[frame_index], points[frame_index])
+            filtered[frame_index] = self(points[frame_index], timestamp)
+        return filtered
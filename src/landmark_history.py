@@ -0,0 +1,166 @@
+import numpy as np
+from typing import Tuple
+
+
+class LandmarkHistory:
+    """Fixed-capacity ring buffer of landmark frames, newest first
+
+    Every frame is written twice, at slot i and i + capacity of a
+    (2 * capacity, N, D) array. That makes the last n frames a contiguous
+    slice for any n <= capacity, so current, ago() and window() are all
+    views and a push is two small copies.
+
+    Before the buffer has filled up, lookups further back than the first
+    frame return the first frame, as if the history had been initialized
+    with copies of it.
+
+    Each frame carries its capture timestamp, kept in a parallel ring laid
+    out the same way, so frames can also be looked up by time.
+    """
+
+    def __init__(self, capacity: int, num_landmarks: int = 33, dims: int = 3, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._frames = np.zeros((2 * capacity, num_landmarks, dims), dtype=dtype)
+        self._times = np.zeros(2 * capacity)
+        self._newest = capacity - 1  # Upper-half index of the newest frame
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of stored frames (at most capacity)"""
+        return min(self._count, self.capacity)
+
+    def clear(self) -> None:
+        self._count = 0
+
+    def push(self, points: np.ndarray, timestamp: float = 0.0) -> np.ndarray:
+        """Copy a frame in as the newest one and return a view of it
+
+        Timestamps are in seconds and must not decrease from push to push.
+        """
+        slot = (self._newest + 1) % self.capacity
+        self._frames[slot] = points
+        self._frames[slot + self.capacity] = points
+        self._times[slot] = timestamp
+        self._times[slot + self.capacity] = timestamp
+        self._newest = slot + self.capacity
+        self._count += 1
+        return self._frames[self._newest]
+
+    def backfill(self, landmarks: np.ndarray) -> None:
+        """Set the given landmarks of every stored frame to their newest position
+
+        For landmarks seen for the first time: their history then starts at
+        the newest frame, like the whole history starts at the first frame.
+        """
+        if self._count == 0:
+            raise IndexError("history is empty")
+        self._frames[:, landmarks] = self._frames[self._newest, landmarks]
+
+    @property
+    def current(self) -> np.ndarray:
+        """View of the newest frame"""
+        if self._count == 0:
+            raise IndexError("history is empty")
+        return self._frames[self._newest]
+
+    def ago(self, frames: int) -> np.ndarray:
+        """View of the frame pushed `frames` pushes before the newest one
+
+        Clamped to the oldest stored frame.
+        """
+        if self._count == 0:
+            raise IndexError("history is empty")
+        if frames < 0 or frames >= self.capacity:
+            raise IndexError(f"can look back 0..{self.capacity - 1} frames, not {frames}")
+        return self._frames[self._newest - min(frames, len(self) - 1)]
+
+    def time_ago(self, frames: int) -> float:
+        """Timestamp of the frame pushed `frames` pushes before the newest one
+
+        Clamped to the oldest stored frame, like ago().
+        """
+        if self._count == 0:
+            raise IndexError("history is empty")
+        return float(self._times[self._newest - min(frames, len(self) - 1)])
+
+    def times_ago(self, frames_ago: np.ndarray) -> np.ndarray:
+        """Timestamps of several frames at once, each looked up like time_ago()"""
+        if self._count == 0:
+            raise IndexError("history is empty")
+        return self._times[self._newest - np.minimum(frames_ago, len(self) - 1)]
+
+    def frames_since(self, timestamp: float) -> int:
+        """Number of pushes back to the newest frame captured at or before timestamp
+
+        Clamped to the oldest stored frame when every frame is newer.
+        """
+        if self._count == 0:
+            raise IndexError("history is empty")
+        stored = len(self)
+        times = self._times[self._newest - stored + 1:self._newest + 1]
+        # Frames at or before timestamp, the newest of which is the one we want
+        at_or_before = int(np.searchsorted(times, timestamp, side="right"))
+        return stored - max(at_or_before, 1)
+
+    def at_time(self, timestamp: float) -> np.ndarray:
+        """View of the newest frame captured at or before timestamp (clamped to the oldest frame)"""
+        return self._frames[self._newest - self.frames_since(timestamp)]
+
+    def gather(self, frames_ago: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of several frames at once, as ((K, N, D) frames, (K,) timestamps)
+
+        Each entry of frames_ago is looked up like ago(), clamped to the oldest stored frame.
+        """
+        if self._count == 0:
+            raise IndexError("history is empty")
+        slots = self._newest - np.minimum(frames_ago, len(self) - 1)
+        return self._frames[slots], self._times[slots]
+
+    def window(self, frames: int) -> np.ndarray:
+        """View of the last `frames` frames (fewer before the buffer fills), oldest first"""
+        if frames < 1 or frames > self.capacity:
+            raise ValueError(f"window must be 1..{self.capacity} frames, not {frames}")
+        frames = min(frames, len(self))
+        return self._frames[self._newest - frames + 1:self._newest + 1]
+
+    def window_times(self, frames: int) -> np.ndarray:
+        """Timestamps matching window(frames), oldest first"""
+        if frames < 1 or frames > self.capacity:
+            raise ValueError(f"window must be 1..{self.capacity} frames, not {frames}")
+        frames = min(frames, len(self))
+        return self._times[self._newest - frames + 1:self._newest + 1]
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of the stored frames and their timestamps, oldest first"""
+        stored = len(self)
+        if not stored:
+            return self._frames[:0].copy(), self._times[:0].copy()
+        return self.window(stored).copy(), self.window_times(stored).copy()
+
+    def restore(self, state: Tuple[np.ndarray, np.ndarray]) -> None:
+        """Replace the stored frames with those of snapshot(), keeping the newest that fit"""
+        frames, times = state
+        self.clear()
+        for frame, timestamp in zip(frames[-self.capacity:], np.asarray(times)[-self.capacity:].tolist()):
+            self.push(frame, timestamp)
+
+    def resize(self, capacity: int) -> None:
+        """Change the capacity, keeping the newest frames that still fit"""
+        if capacity == self.capacity:
+            return
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        kept = min(len(self), capacity)
+        recent = self.window(kept).copy() if kept else None
+        recent_times = self.window_times(kept).copy() if kept else None
+
+        self.capacity = capacity
+        self._frames = np.zeros((2 * capacity,) + self._frames.shape[1:], dtype=self._frames.dtype)
+        self._times = np.zeros(2 * capacity)
+        self._newest = capacity - 1
+        self._count = 0
+        if recent is not None:
+            for frame, timestamp in zip(recent, recent_times):
+                self.push(frame, timestamp)
@@ -0,0 +1,110 @@
+import numpy as np
+from typing import Optional
+
+
+class LandmarkKalmanTracker:
+    """Constant-velocity Kalman filter over all pose landmarks at once
+
+    Every landmark coordinate has an independent [position, velocity] state.
+    All coordinates share the same noise model, so the 2x2 covariance only
+    differs per landmark (it depends on how long the landmark went unmeasured)
+    and is stored as three (N,) arrays. Predict and update are plain array
+    arithmetic over all landmarks, with a mask selecting the measured ones.
+
+    Time is measured in frames.
+    """
+
+    def __init__(self, num_landmarks: int = 33, process_noise: float = 1e-4, measurement_noise: float = 2.5e-5):
+        self.num_landmarks = num_landmarks
+        self.process_noise = process_noise          # Acceleration variance per frame^2
+        self.measurement_noise = measurement_noise  # Landmark position variance
+
+        self.position = np.zeros((num_landmarks, 3))
+        self.velocity = np.zeros((num_landmarks, 3))
+        self.visibility = np.zeros(num_landmarks)
+
+        # Covariance [[p00, p01], [p01, p11]] per landmark
+        self.p00 = np.ones(num_landmarks)
+        self.p01 = np.zeros(num_landmarks)
+        self.p11 = np.ones(num_landmarks)
+
+        # Frames since each landmark was last measured
+        self.frames_since_measurement = np.zeros(num_landmarks, dtype=np.int64)
+        self.is_initialized = np.zeros(num_landmarks, dtype=bool)
+
+    def reset(self) -> None:
+        """Forget all state, e.g. after the person left the frame for too long"""
+        self.position[:] = 0.0
+        self.velocity[:] = 0.0
+        self.visibility[:] = 0.0
+        self.p00[:] = 1.0
+        self.p01[:] = 0.0
+        self.p11[:] = 1.0
+        self.frames_since_measurement[:] = 0
+        self.is_initialized[:] = False
+
+    def predict(self, dt: float = 1.0) -> None:
+        """Advance every landmark by dt frames"""
+        self.position += self.velocity * dt
+
+        # Discrete white-noise acceleration model
+        q = self.process_noise
+        p11 = self.p11
+        self.p00 += dt * (2.0 * self.p01 + dt * p11) + q * dt ** 4 / 4.0
+        self.p01 += dt * p11 + q * dt ** 3 / 2.0
+        self.p11 += q * dt ** 2
+
+        self.frames_since_measurement += 1
+
+    def update(self, points: np.ndarray, measured: np.ndarray) -> None:
+        """Correct the state with measured landmarks
+
+        Args:
+            points: (N, 4) array of x, y, z, visibility
+            measured: (N,) boolean mask of landmarks to use as measurements
+        """
+        new = measured & ~self.is_initialized
+        if new.any():
+            # First sighting: take the measurement as is, with unknown velocity
+            self.position[new] = points[new, :3]
+            self.velocity[new] = 0.0
+            self.p00[new] = self.measurement_noise
+            self.p01[new] = 0.0
+            self.p11[new] = 1e-2
+            self.is_initialized[new] = True
+
+        tracked = measured & ~new
+        if tracked.any():
+            innovation = points[tracked, :3] - self.position[tracked]
+            p00 = self.p00[tracked]
+            p01 = self.p01[tracked]
+            s = p00 + self.measurement_noise
+            k0 = p00 / s
+            k1 = p01 / s
+            self.position[tracked] += k0[:, None] * innovation
+            self.velocity[tracked] += k1[:, None] * innovation
+
+            self.p11[tracked] -= k1 * p01
+            self.p01[tracked] = (1.0 - k0) * p01
+            self.p00[tracked] = (1.0 - k0) * p00
+
+        self.visibility[measured] = points[measured, 3]
+        self.frames_since_measurement[measured] = 0
+
+    def estimate(self, max_frames_unmeasured: int) -> Optional[np.ndarray]:
+        """Current estimate as an (N, 4) array of x, y, z, visibility
+
+        Landmarks unmeasured for more than max_frames_unmeasured frames get
+        visibility 0 so they fail any visibility gate. Returns None before the
+        first measurement.
+        """
+        if not self.is_initialized.any():
+            return None
+        estimate = np.empty((self.num_landmarks, 4))
+        estimate[:, :3] = self.position
+        estimate[:, 3] = np.where(
+            self.is_initialized & (self.frames_since_measurement <= max_frames_unmeasured),
+            self.visibility,
+            0.0
+        )
+        return estimate
@@ -3,8 +3,19 @@ import mediapipe as mp
 import numpy as np
 import time
 import logging
+import threading
 from typing import Optional, Callable, Dict, Any, Tuple
 from config import MovementConfig
+from frame_source import FrameSource, LatestFrameSource, ReadAheadFrameSource
+from frame_pool import FrameBufferPool
+from camera_modes import negotiate_capture_mode
+from landmark_tracker import LandmarkKalmanTracker
+from landmark_array import new_landmark_array, extract_landmarks
+from complexity_governor import ModelComplexityGovernor
+from pipeline import PipelineFrame, DropOldestQueue, StageStats
+from presenter import FramePresenter
+from mediapipe.framework.formats import landmark_pb2
+from src.constants import MIRRORED_LANDMARK_ORDER
 from importlib import import_module
 
 
@@ -17,23 +28,204 @@ class PoseDetector:
     """Handles MediaPipe pose detection and landmark processing"""
     
     def __init__(self, config: MovementConfig):
+        self.config = config
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=config.min_detection_confidence,
-            min_tracking_confidence=config.min_tracking_confidence,
-            model_complexity=1,  # Use lightweight model for better performance
-            # static_image_mode=False,  # Set to False for video processing
-            # smooth_landmarks=True  # Enable landmark smoothing for better performance
-        )
+        self.model_complexity = config.model_complexity
+        self.pose = self._create_pose(self.model_complexity)
+
+        # Optional latency-driven complexity switching; new models are built on a background thread
+        self.governor: Optional[ModelComplexityGovernor] = None
+        if config.adaptive_model_complexity:
+            self.governor = ModelComplexityGovernor(config.target_fps, initial_level=self.model_complexity)
+        self._pose_lock = threading.Lock()
+        self._pending_pose: Optional[Tuple[int, Any]] = None  # (level, built Pose or None if the build failed)
+        self._rebuild_thread: Optional[threading.Thread] = None
         self.mp_drawing = mp.solutions.drawing_utils
+        self.buffer_pool = FrameBufferPool(name="PoseDetectorBuffers")
+
+        # Person crop: normalized (x_min, y_min, x_max, y_max) of the last detected body, None when lost,
+        # and the pixel region (x0, y0, x1, y1) pose currently runs on
+        self.person_box: Optional[Tuple[float, float, float, float]] = None
+        self.crop_region: Optional[Tuple[int, int, int, int]] = None
+        self.crop_changes = 0  # Times the crop region moved, each restarting the pose tracking
+        self.last_inference_size: Tuple[int, int] = (0, 0)
         
     def process_frame(self, image: np.ndarray) -> Optional[mp.solutions.pose.PoseLandmark]:
         """Process a single frame and return pose landmarks"""
         # resized_frame = cv2.resize(image, (480, 320))
+        if self.config.person_crop:
+            return self._process_person_crop(image)
+
+        return self._run_pose(image)
+
+    def _create_pose(self, model_complexity: int):
+        return self.mp_pose.Pose(
+            min_detection_confidence=self.config.min_detection_confidence,
+            min_tracking_confidence=self.config.min_tracking_confidence,
+            model_complexity=model_complexity,  # 0 = lite, 1 = full, 2 = heavy
+            # static_image_mode=False,  # Set to False for video processing
+            # smooth_landmarks=True  # Enable landmark smoothing for better performance
+        )
+
+    def _request_model_complexity(self, level: int) -> None:
+        """Build a Pose instance with the given complexity off the inference path
+
+        The result, including a failed build, is handed back to the inference
+        thread, which swaps the model in and reports to the governor.
+        """
+        # The governor requests nothing while a switch is pending, so a previous build has already been handed over
+        if self._rebuild_thread is not None:
+            self._rebuild_thread.join()
+
+        def build():
+            try:
+                pose = self._create_pose(level)
+            except Exception as e:
+                logging.getLogger('PoseDetector').error(f"Failed to build pose model with complexity {level}: {e}")
+                pose = None
+            with self._pose_lock:
+                self._pending_pose = (level, pose)
+
+        self._rebuild_thread = threading.Thread(target=build, name="PoseRebuild", daemon=True)
+        self._rebuild_thread.start()
+
+    def _swap_pending_pose(self) -> None:
+        with self._pose_lock:
+            pending, self._pending_pose = self._pending_pose, None
+        level, pose = pending
+        if pose is None:
+            self.governor.reject(level, self.model_complexity)
+            return
+        old_pose = self.pose
+        self.pose = pose
+        self.model_complexity = level
+        self.governor.switched(level)
+        old_pose.close()
+
+    def _run_pose(self, image: np.ndarray) -> Optional[mp.solutions.pose.PoseLandmark]:
+        if self._pending_pose is not None:
+            self._swap_pending_pose()
 
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        # MediaPipe copies the input into its own packet, so the RGB buffer can be reused every frame
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self.buffer_pool.get("rgb", image.shape))
+        self.last_inference_size = (image.shape[1], image.shape[0])
+        start_time = time.perf_counter()
         results = self.pose.process(rgb_image)
+        if self.governor is not None:
+            new_level = self.governor.record(time.perf_counter() - start_time)
+            if new_level is not None:
+                self._request_model_complexity(new_level)
         return results.pose_landmarks
+
+    def _crop_region(self, frame_width: int, frame_height: int) -> Tuple[int, int, int, int]:
+        """Pixel region (x0, y0, x1, y1) to run pose on
+
+        The current region is kept while the previous body box plus half the
+        margin stays inside it and the body has not shrunk to less than half
+        of it; otherwise the body box plus margin, or the whole frame when
+        the person was lost.
+        """
+        if self.person_box is None:
+            return 0, 0, frame_width, frame_height
+
+        region = self._body_region(frame_width, frame_height, self.config.person_crop_margin)
+        if self.crop_region is not None and region != (0, 0, frame_width, frame_height):
+            x0, y0, x1, y1 = self.crop_region
+            inner_x0, inner_y0, inner_x1, inner_y1 = self._body_region(
+                frame_width, frame_height, self.config.person_crop_margin / 2)
+            inside = x0 <= inner_x0 and y0 <= inner_y0 and inner_x1 <= x1 and inner_y1 <= y1
+            area = (region[2] - region[0]) * (region[3] - region[1])
+            if inside and 2 * area >= (x1 - x0) * (y1 - y0):
+                return self.crop_region
+        return region
+
+    def _body_region(self, frame_width: int, frame_height: int, margin: float) -> Tuple[int, int, int, int]:
+        """Pixel region around the previous body box plus margin, or the whole frame"""
+        x_min, y_min, x_max, y_max = self.person_box
+        margin_x = (x_max - x_min) * margin
+        margin_y = (y_max - y_min) * margin
+        x0 = int(max(0.0, x_min - margin_x) * frame_width)
+        y0 = int(max(0.0, y_min - margin_y) * frame_height)
+        x1 = int(np.ceil(min(1.0, x_max + margin_x) * frame_width))
+        y1 = int(np.ceil(min(1.0, y_max + margin_y) * frame_height))
+
+        # Too small to be a plausible body (or degenerate): fall back to the full frame
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return 0, 0, frame_width, frame_height
+        return x0, y0, x1, y1
+
+    def _inference_size(self, width: int, height: int) -> Tuple[int, int]:
+        """Scale a region to the configured pixel budget, keeping its aspect ratio"""
+        scale = np.sqrt(self.config.inference_pixel_budget / float(width * height))
+        # Round to multiples of 16 so the pooled buffers are not reallocated on every small box change
+        target_width = max(16, int(round(width * scale / 16.0)) * 16)
+        target_height = max(16, int(round(height * scale / 16.0)) * 16)
+        return target_width, target_height
+
+    def _process_person_crop(self, image: np.ndarray) -> Optional[mp.solutions.pose.PoseLandmark]:
+        """Run pose on a crop around the previous body position and map landmarks back
+
+        The crop is resized to the inference pixel budget, so a distant player gets
+        more input pixels at the same cost. Landmarks are returned in normalized
+        coordinates of the full frame. The region stays put while the player
+        moves inside it, so the video-mode tracking and smoothing of Pose see
+        a fixed image; when it moves, the tracking starts over.
+        """
+        frame_height, frame_width = image.shape[:2]
+        region = self._crop_region(frame_width, frame_height)
+        if region != self.crop_region:
+            # Pose tracks and smooths landmarks in image coordinates, which the move invalidates
+            if self.crop_region is not None:
+                self.pose.reset()
+                self.crop_changes += 1
+            self.crop_region = region
+        x0, y0, x1, y1 = region
+        crop_width, crop_height = x1 - x0, y1 - y0
+
+        target_width, target_height = self._inference_size(crop_width, crop_height)
+        crop = image[y0:y1, x0:x1]
+        if (target_width, target_height) != (crop_width, crop_height):
+            crop = cv2.resize(crop, (target_width, target_height),
+                              dst=self.buffer_pool.get("crop", (target_height, target_width) + image.shape[2:]))
+
+        landmarks = self._run_pose(crop)
+        if landmarks is None:
+            # Lost the person: search the whole frame next time
+            self.person_box = None
+            return None
+
+        # Map crop-normalized coordinates back to the full frame. MediaPipe scales z like x.
+        scale_x = crop_width / frame_width
+        scale_y = crop_height / frame_height
+        offset_x = x0 / frame_width
+        offset_y = y0 / frame_height
+        for lm in landmarks.landmark:
+            lm.x = lm.x * scale_x + offset_x
+            lm.y = lm.y * scale_y + offset_y
+            lm.z = lm.z * scale_x
+
+        points = np.array([(lm.x, lm.y) for lm in landmarks.landmark])
+        x_min, y_min = np.clip(points.min(axis=0), 0.0, 1.0)
+        x_max, y_max = np.clip(points.max(axis=0), 0.0, 1.0)
+        self.person_box = (x_min, y_min, x_max, y_max)
+        return landmarks
+
+    @staticmethod
+    def mirror_landmarks(landmarks: mp.solutions.pose.PoseLandmark) -> None:
+        """Mirror landmarks in place as if the frame had been flipped horizontally
+
+        x becomes 1 - x and left/right landmark pairs are swapped, matching what
+        MediaPipe reports on a flipped image. The model is not exactly
+        flip-equivariant, so values can differ slightly from a pixel flip.
+        """
+        points = [(lm.x, lm.y, lm.z, lm.visibility, lm.presence) for lm in landmarks.landmark]
+        for lm, source_index in zip(landmarks.landmark, MIRRORED_LANDMARK_ORDER):
+            x, y, z, visibility, presence = points[source_index]
+            lm.x = 1.0 - x
+            lm.y = y
+            lm.z = z
+            lm.visibility = visibility
+            lm.presence = presence
         
     def draw_landmarks(self, image: np.ndarray, landmarks: mp.solutions.pose.PoseLandmark) -> None:
         """Draw pose landmarks on the image"""
@@ -59,15 +251,27 @@ class PoseDetector:
 class MovementDetector:
     """Main class for movement detection using camera input"""
     
-    def __init__(self, config: Optional[MovementConfig] = None, useCamera: bool = True, isTest: bool = False, callback: Optional[Callable[[str, Dict[str, Any]], None]] = None, debug: bool = False):
+    def __init__(self, config: Optional[MovementConfig] = None, useCamera: bool = True, isTest: bool = False, callback: Optional[Callable[[str, Dict[str, Any]], None]] = None, debug: bool = False, headless: bool = False):
         self.config = config
         self.pose_detector = PoseDetector(self.config)
         print(f"MovementDetector __init__: config={self.config.app_name}")
         MovementAnalyzer = import_module(f"src.apps.{self.config.app_name}.movement_analyzer").MovementAnalyzer
         self.movement_analyzer = MovementAnalyzer(self.config, self.pose_detector.mp_pose, debug)
         self.frame_counter = 0
+
+        # Landmark prediction for dropout bridging and for skipping inference on some frames
+        self.landmark_tracker: Optional[LandmarkKalmanTracker] = None
+        if self.config.landmark_bridge_frames > 0 or self.config.pose_inference_interval > 1:
+            self.landmark_tracker = LandmarkKalmanTracker(
+                process_noise=self.config.kalman_process_noise,
+                measurement_noise=self.config.kalman_measurement_noise
+            )
+        self.tracker_points = new_landmark_array()
+        self.landmarks_predicted = False
         self.useCamera = useCamera
-        self.isTest = isTest
+        # headless: no drawing, effects, display or recording at all, only landmarks and events
+        self.headless = headless
+        self.isTest = isTest or headless
         self.callback = callback
         self.debug = debug
         
@@ -84,12 +288,25 @@ class MovementDetector:
         self.current_recording_filename: Optional[str] = None
 
         # Effect attributes
-        self.effects_enabled = self.config.effects_enabled if hasattr(self.config, 'effects_enabled') else False
+        self.effects_enabled = (self.config.effects_enabled if hasattr(self.config, 'effects_enabled') else False) and not headless
         self.effect_active = False
         self.effect_start_time = 0.0
         self.effect_duration = 0.5  # Effect duration in seconds
         self.last_movement = ""
 
+        # Reusable frame buffers: preprocess_pool is replaced in start_camera to match the frame source
+        self.preprocess_pool = FrameBufferPool(name="PreprocessBuffers")
+        self.frame_pool = FrameBufferPool(name="FrameBuffers")
+
+        # Display thread, created in start_camera when frames are shown
+        self.presenter: Optional[FramePresenter] = None
+        self.last_prompt_time = 0.0
+
+        # Per-stage processing times, reset on every start_camera
+        self.stage_stats: Dict[str, StageStats] = {}
+        # Set by the 't' key in pipelined mode; the analysis stage, which writes the trace, dumps it between frames
+        self._trace_dump_requested = threading.Event()
+
         # Get logger instance. Configuration is handled by setup_logging in main.py
         self.logger = logging.getLogger('MovementDetector')
         self.logger.info(f"MovementDetector initialized. Debug mode: {self.debug}, Effects enabled: {self.effects_enabled}")
@@ -125,10 +342,11 @@ class MovementDetector:
         effect_alpha = 0.7 * (1.0 - progress)  # Fade out effect
         
         # Create a copy of the image
-        effect_image = image.copy()
+        effect_image = self.frame_pool.get("effect", image.shape)
+        np.copyto(effect_image, image)
         
-        # Add colored overlay based on movement
-        overlay = np.zeros_like(image, dtype=np.uint8)
+        # Add colored overlay based on movement (fully overwritten by the rectangle below)
+        overlay = self.frame_pool.get("effect_overlay", image.shape)
         height, width = image.shape[:2]
         
         # Different color for different movements
@@ -160,7 +378,253 @@ class MovementDetector:
                      (255, 255, 255), max(1, border_width // 3))
         
         return effect_image
+
+    def _track_landmarks(self, landmarks: Optional[mp.solutions.pose.PoseLandmark]) -> Tuple[Optional[mp.solutions.pose.PoseLandmark], bool]:
+        """Feed the Kalman tracker and fill gaps with predicted landmarks
+
+        Measured landmarks whose required points are all visible pass through
+        unchanged. Missing or low-visibility required points are replaced by
+        predictions for up to the bridging limit.
+
+        Returns:
+            Tuple of (landmarks to analyze, whether any of them were predicted)
+        """
+        tracker = self.landmark_tracker
+        threshold = self.config.visibility_threshold
+        required = self.movement_analyzer.required_landmarks
+        max_gap = max(self.config.landmark_bridge_frames, self.config.pose_inference_interval - 1)
+
+        tracker.predict()
+        if landmarks is not None:
+            points = extract_landmarks(landmarks, self.tracker_points)
+            visible = points[:, 3] >= np.float64(threshold)
+            tracker.update(points, visible)
+            if visible[required].all():
+                return landmarks, False
+        else:
+            points = None
+
+        estimate = tracker.estimate(max_gap)
+        if estimate is None:
+            return landmarks, False
+        if points is not None:
+            # Keep what was actually measured, predict only the low-visibility points
+            estimate[visible] = points[visible]
+        if (estimate[required, 3] < threshold).any():
+            return landmarks, False  # Gap too long to bridge
+
+        predicted = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, visibility in estimate:
+            predicted.landmark.add(x=x, y=y, z=z, visibility=visibility)
+        return predicted, True
+
+    def _preprocess_frame(self, image: np.ndarray) -> np.ndarray:
+        """Mirror the frame and resize it to the processing width"""
+        pool = self.preprocess_pool
+        if not self.config.mirror_landmarks:
+            # With mirror_landmarks the landmarks are mirrored after inference instead
+            image = cv2.flip(image, 1, dst=pool.get("flip", image.shape))
+
+        height, width = image.shape[:2]
+        new_width = self.config.frame_width
+        new_height = int(height * (new_width / width))
+        resized = pool.get("resize", (new_height, new_width) + image.shape[2:])
+        return cv2.resize(image, (new_width, new_height), dst=resized)
             
+    def _update_camera_fps(self) -> None:
+        """Update the smoothed camera FPS from the time since the previous frame"""
+        self.curr_frame_time = time.time()
+        if self.prev_frame_time > 0: # Ensure prev_frame_time is set (i.e., not the first frame)
+            time_diff = self.curr_frame_time - self.prev_frame_time
+            if time_diff > 0: # Avoid division by zero or negative time difference
+                fps = 1.0 / time_diff
+            else:
+                fps = self.current_fps # Maintain current FPS if time_diff is not positive
+        else: # First frame for camera, or if prev_frame_time was not set
+            fps = self.current_fps # Use initial default (e.g., 30 FPS) or current smoothed FPS
+
+        self.prev_frame_time = self.curr_frame_time # Update for next iteration
+
+        # Update current FPS with smoothing
+        self.current_fps = 0.9 * self.current_fps + 0.1 * fps  # Exponential moving average for stability
+
+    def _stop_on_read_failure(self, source: FrameSource, total_frames: int) -> bool:
+        """Log a failed read and return True if processing should stop"""
+        # Check if it's the end of the video file
+        if not self.useCamera and total_frames > 0 and source.get(cv2.CAP_PROP_POS_FRAMES) >= total_frames:
+            self.logger.info("End of video reached")
+            return True
+        # Could be an actual read error or end of a stream
+        self.logger.warning("Error reading frame or end of stream reached.")
+        if not self.useCamera: # If it's a video file and frame read failed, assume end or unrecoverable error
+            self.logger.info("Stopping video processing due to frame read error or end of video.")
+            return True
+        return False # For camera, continue trying to read frames
+
+    def _infer_landmarks(self, image: np.ndarray, frame_index: int) -> Tuple[Optional[mp.solutions.pose.PoseLandmark], bool]:
+        """Run pose inference (or prediction) for a frame
+
+        Returns:
+            Tuple of (landmarks, whether they were predicted by the tracker)
+        """
+        # With a tracker, inference may run only every Nth frame; the rest are predicted
+        run_inference = (self.landmark_tracker is None or
+                         frame_index % self.config.pose_inference_interval == 0)
+        landmarks = self.pose_detector.process_frame(image) if run_inference else None
+
+        if self.config.mirror_landmarks and landmarks:
+            self.pose_detector.mirror_landmarks(landmarks)
+
+        predicted = False
+        if self.landmark_tracker is not None:
+            landmarks, predicted = self._track_landmarks(landmarks)
+        return landmarks, predicted
+
+    def _analyze_landmarks(self, landmarks: Optional[mp.solutions.pose.PoseLandmark], predicted: bool,
+                           frame_index: int, capture_time: float) -> Optional[str]:
+        """Run movement analysis on a frame's landmarks and report a detected movement"""
+        self.landmarks_predicted = predicted
+        if not landmarks:
+            if frame_index % 30 == 0: # Log every 30 frames
+                self.logger.warning("No pose landmarks detected. Make sure your full body is visible.")
+            return None
+
+        # Video files are decoded faster or slower than real time, so analysis follows the media clock
+        timestamp = capture_time if self.useCamera else frame_index / self.current_fps
+        movement = self.movement_analyzer.check_for_movment(landmarks, timestamp)
+        if movement:
+            self.process_movement(movement, {"frame": frame_index, "fps": round(self.current_fps, 1), "capture_time": capture_time, "predicted": predicted, "model_complexity": self.pose_detector.model_complexity})
+        return movement
+
+    def _render_frame(self, image: np.ndarray, landmarks: Optional[mp.solutions.pose.PoseLandmark]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Draw landmarks and overlays
+
+        Returns:
+            Tuple of (frame to display, clean frame to record or None when not recording)
+        """
+        if self.config.mirror_landmarks:
+            if not self.isTest or self.is_recording:
+                # The pixels were not flipped during preprocessing; flip only the frame we show or record
+                image = cv2.flip(image, 1, dst=self.frame_pool.get("display_flip", image.shape))
+
+        # Create a copy of the frame for recording before any overlays are added
+        original_frame_for_recording = None
+        if self.is_recording:
+            original_frame_for_recording = self.frame_pool.get("recording", image.shape)
+            np.copyto(original_frame_for_recording, image)
+
+        if landmarks:
+            self.pose_detector.draw_landmarks(image, landmarks)
+            if self.debug:
+                image = self.movement_analyzer.process_frame(image)
+
+        # Apply movement effect if active
+        image = self.apply_movement_effect(image)
+
+        # Display FPS on the image
+        fps_text = f"FPS: {self.current_fps:.1f}"
+        cv2.putText(image, fps_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+
+        # Add recording indicator
+        if self.is_recording:
+            frame_width = image.shape[1]
+            cv2.circle(image, (frame_width - 30, 30), 10, (0, 0, 255), -1) # Red circle for recording
+            rec_text = "REC"
+            cv2.putText(image, rec_text, (frame_width - 70, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
+
+        # Print FPS to console once per second
+        if time.time() - self.last_fps_print_time >= 1.0:
+            # print(f"Current FPS: {self.current_fps:.1f}")
+            self.last_fps_print_time = time.time()
+
+        return image, original_frame_for_recording
+
+    def _handle_key(self, key: int, frame_width: int, frame_height: int) -> bool:
+        """React to a key press; returns False if processing should stop"""
+        if key == 27:  # ESC key
+            self.logger.info("Processing interrupted by user (ESC pressed).")
+            return False
+
+        # Handle recording toggle ('r' key)
+        if key == ord('r'):
+            if not self.is_recording:
+                # Start recording
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                self.current_recording_filename = os.path.join(self.recording_output_dir, f"rec_{timestamp}.mp4")
+                # Use 'mp4v' codec for MP4 files. Adjust if needed for other formats/OS.
+                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                # Use current (potentially dynamic) FPS and actual frame dimensions
+                self.video_writer = cv2.VideoWriter(self.current_recording_filename, fourcc, self.current_fps, (frame_width, frame_height))
+                if self.video_writer.isOpened():
+                    self.is_recording = True
+                    self.logger.info(f"Started recording to {self.current_recording_filename}")
+                else:
+                    self.logger.error(f"Failed to open video writer for {self.current_recording_filename}")
+                    self.video_writer = None # Ensure it's None if failed
+            else:
+                # Stop recording
+                if self.video_writer:
+                    self.video_writer.release()
+                    self.logger.info(f"Stopped recording. Saved to {self.current_recording_filename}")
+                self.is_recording = False
+                self.video_writer = None
+                self.current_recording_filename = None
+
+        # Dump the recent detector trace ('t' key), e.g. right after a missed or false detection
+        if key == ord('t'):
+            if self.config.pipelined:
+                self._trace_dump_requested.set()
+            else:
+                self._dump_trace()
+        return True
+
+    def _dump_trace(self, at_exit: bool = False) -> None:
+        """Log the last trace_dump_seconds of the analyzer trace, or save it all at exit if trace_dump_path is set"""
+        trace = self.movement_analyzer.trace
+        if trace is None or len(trace) == 0:
+            return
+        if at_exit and self.config.trace_dump_path:
+            trace.save(self.config.trace_dump_path)
+        else:
+            trace.dump(self.config.trace_dump_seconds)
+
+    def _present_frame(self, image: np.ndarray, step: bool) -> bool:
+        """Show a rendered frame and handle key presses; returns False if processing should stop
+
+        With step=True this waits for a key press before returning, allowing
+        frame-by-frame stepping through a video.
+        """
+        prompt_interval_seconds = 5.0
+
+        if self.presenter is None:
+            cv2.imshow('Movement Detection', image)
+            if step:
+                # If waiting indefinitely, periodically prompt the user
+                current_time_for_prompt = time.time()
+                if current_time_for_prompt - self.last_prompt_time > prompt_interval_seconds:
+                    self.logger.info("Video paused. Press any key to advance to the next frame, or ESC to exit.")
+                    self.last_prompt_time = current_time_for_prompt
+            key = cv2.waitKey(0 if step else 1) & 0xFF
+            return self._handle_key(key, image.shape[1], image.shape[0])
+
+        self.presenter.show(image)
+        keys = self.presenter.poll_keys()
+        while step and not keys:
+            key = self.presenter.wait_key(timeout=prompt_interval_seconds)
+            if key is None:
+                self.logger.info("Video paused. Press any key to advance to the next frame, or ESC to exit.")
+            else:
+                keys.append(key)
+        for key in keys:
+            if not self._handle_key(key, image.shape[1], image.shape[0]):
+                return False
+        return True
+
+    def _write_recording(self, frame: Optional[np.ndarray]) -> None:
+        # Write the original, clean frame to the video
+        if self.is_recording and self.video_writer and frame is not None:
+            self.video_writer.write(frame)
+
     def start_camera(self, video_path: Optional[str] = None) -> None:
         """Start processing video input for movement detection"""
         self.logger.info("Starting camera/video processing")
@@ -172,6 +636,9 @@ class MovementDetector:
         os.makedirs(self.recording_output_dir, exist_ok=True)
         self.logger.info(f"Recording output directory set to: {self.recording_output_dir}")
 
+        # Preprocessed frames alive at once in the pipeline: one per queue slot and one per stage
+        pipeline_frames = 3 * self.config.pipeline_queue_size + 3 if self.config.pipelined else 0
+
         if self.useCamera:
             cap = cv2.VideoCapture(self.config.camera_index)  # Use camera with index from config
             if not cap.isOpened():
@@ -179,6 +646,16 @@ class MovementDetector:
                 self.logger.error(error_msg)
                 raise ValueError(error_msg)
             self.logger.info(f"Camera {self.config.camera_index} opened successfully!")
+            if self.config.negotiate_capture_mode:
+                # Avoid capturing (and then downscaling) far more pixels than inference uses
+                negotiate_capture_mode(cap, self.config.camera_index, self.config.frame_width,
+                                       cache_path=self.config.camera_mode_cache_path)
+            self.preprocess_pool = FrameBufferPool(slots=pipeline_frames + 1, name="PreprocessBuffers")
+            if self.config.threaded_capture:
+                # Drain the driver buffer on a background thread so inference always sees the newest frame
+                source = LatestFrameSource(cap, self._preprocess_frame)
+            else:
+                source = FrameSource(cap, self._preprocess_frame)
             # For camera, self.current_fps is initialized to 30.0 and will be dynamically calculated.
             # self.prev_frame_time is initialized to 0.0, will be set in the loop.
         else: # Processing a video file
@@ -203,153 +680,28 @@ class MovementDetector:
             
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             self.logger.info(f"Video opened successfully! Original FPS: {self.current_fps:.2f}, Total Frames: {total_frames}")
+            # Queued frames must not share buffers: depth in the queue, one being read, one being produced
+            self.preprocess_pool = FrameBufferPool(slots=self.config.video_read_ahead_frames + 2 + pipeline_frames, name="PreprocessBuffers")
+            if self.config.video_read_ahead_frames > 0:
+                # Decode and preprocess ahead so inference is the only thing the loop waits on
+                source = ReadAheadFrameSource(cap, self._preprocess_frame, depth=self.config.video_read_ahead_frames)
+            else:
+                source = FrameSource(cap, self._preprocess_frame)
         
         self.logger.info("Processing video for movement detection...")
-        
-        # For periodic prompting when video is paused using waitKey(0)
-        last_prompt_time = time.time()
-        prompt_interval_seconds = 5.0
-        
-        try:
-            while True:
-                if self.useCamera:
-                    # Calculate FPS dynamically for camera
-                    self.curr_frame_time = time.time()
-                    if self.prev_frame_time > 0: # Ensure prev_frame_time is set (i.e., not the first frame)
-                        time_diff = self.curr_frame_time - self.prev_frame_time
-                        if time_diff > 0: # Avoid division by zero or negative time difference
-                            fps = 1.0 / time_diff
-                        else:
-                            fps = self.current_fps # Maintain current FPS if time_diff is not positive
-                    else: # First frame for camera, or if prev_frame_time was not set
-                        fps = self.current_fps # Use initial default (e.g., 30 FPS) or current smoothed FPS
-                    
-                    self.prev_frame_time = self.curr_frame_time # Update for next iteration
-                    
-                    # Update current FPS with smoothing
-                    self.current_fps = 0.9 * self.current_fps + 0.1 * fps  # Exponential moving average for stability
-                # else for video, self.current_fps is already set to original_fps and remains constant.
-                
-                # Pass the FPS to movement analyzer
-                # self.movement_analyzer.update_fps(self.current_fps)
-                
-                ret, image = cap.read()
-                
-                if not ret:
-                    # Check if it's the end of the video file
-                    if not self.useCamera and total_frames > 0 and cap.get(cv2.CAP_PROP_POS_FRAMES) >= total_frames:
-                        self.logger.info("End of video reached")
-                        break
-                    else: # Could be an actual read error or end of a stream
-                        self.logger.warning("Error reading frame or end of stream reached.")
-                        if not self.useCamera: # If it's a video file and frame read failed, assume end or unrecoverable error
-                            self.logger.info("Stopping video processing due to frame read error or end of video.")
-                            break 
-                        continue # For camera, continue trying to read frames
-                
-                image = cv2.flip(image, 1)
-                
-                height, width = image.shape[:2]
-                new_width = 500
-                new_height = int(height * (new_width / width))
-                image = cv2.resize(image, (new_width, new_height))
-                # Get frame dimensions for video writer - use the resized dimensions
-                frame_height, frame_width = image.shape[:2]
-
-                # Create a copy of the frame for recording before any overlays are added
-                original_frame_for_recording = image.copy()
-
-                landmarks = self.pose_detector.process_frame(image)
-                
-                if landmarks:
-                    self.pose_detector.draw_landmarks(image, landmarks)
-                    # start_time = time.time()
-                    movement = self.movement_analyzer.check_for_movment(landmarks)
-                    if self.debug:
-                        image = self.movement_analyzer.process_frame(image)
-                    # end_time = time.time()
-                    # print(f"Movement detection took: {(end_time - start_time) * 1000:.2f} ms")
-                    if movement:
-                        self.process_movement(movement, {"frame": self.frame_counter, "fps": round(self.current_fps, 1)})
-                else:
-                    if self.frame_counter % 30 == 0: # Log every 30 frames
-                        self.logger.warning("No pose landmarks detected. Make sure your full body is visible.")
-                
-                # Apply movement effect if active
-                image = self.apply_movement_effect(image)
-                
-                # Display FPS on the image
-                fps_text = f"FPS: {self.current_fps:.1f}"
-                cv2.putText(image, fps_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-
-                # Add recording indicator
-                if self.is_recording:
-                    cv2.circle(image, (frame_width - 30, 30), 10, (0, 0, 255), -1) # Red circle for recording
-                    rec_text = "REC"
-                    cv2.putText(image, rec_text, (frame_width - 70, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
-
-                # Print FPS to console once per second
-                if time.time() - self.last_fps_print_time >= 1.0:
-                    # print(f"Current FPS: {self.current_fps:.1f}")
-                    self.last_fps_print_time = time.time()
-                
-                
-                if not self.isTest:
-                    cv2.imshow('Movement Detection', image)
-                    
-                    key_wait_duration = 1 # Default for camera, non-blocking
-                    if not self.useCamera: # If it's a video
-                        key_wait_duration = 0 # Wait indefinitely for a key, allowing frame-by-frame stepping
-                        
-                        # If waiting indefinitely, periodically prompt the user
-                        current_time_for_prompt = time.time()
-                        if current_time_for_prompt - last_prompt_time > prompt_interval_seconds:
-                             self.logger.info("Video paused. Press any key to advance to the next frame, or ESC to exit.")
-                             last_prompt_time = current_time_for_prompt
-                    
-                    key = cv2.waitKey(key_wait_duration) & 0xFF
-                    if key == 27:  # ESC key
-                        self.logger.info("Processing interrupted by user (ESC pressed).")
-                        break
 
-                    # Handle recording toggle ('r' key)
-                    if key == ord('r'):
-                        if not self.is_recording:
-                            # Start recording
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            self.current_recording_filename = os.path.join(self.recording_output_dir, f"rec_{timestamp}.mp4")
-                            # Use 'mp4v' codec for MP4 files. Adjust if needed for other formats/OS.
-                            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                            # Use current (potentially dynamic) FPS and actual frame dimensions
-                            self.video_writer = cv2.VideoWriter(self.current_recording_filename, fourcc, self.current_fps, (frame_width, frame_height))
-                            if self.video_writer.isOpened():
-                                self.is_recording = True
-                                self.logger.info(f"Started recording to {self.current_recording_filename}")
-                            else:
-                                self.logger.error(f"Failed to open video writer for {self.current_recording_filename}")
-                                self.video_writer = None # Ensure it's None if failed
-                        else:
-                            # Stop recording
-                            if self.video_writer:
-                                self.video_writer.release()
-                                self.logger.info(f"Stopped recording. Saved to {self.current_recording_filename}")
-                            self.is_recording = False
-                            self.video_writer = None
-                            self.current_recording_filename = None
-
-                # Write frame if recording
-                if self.is_recording and self.video_writer:
-                    # Write the original, clean frame to the video
-                    self.video_writer.write(original_frame_for_recording)
-
-                self.frame_counter += 1
-                                # Measure overall iteration time
-                # iteration_end_time = time.time()
-                # print(f"Full frame processing took: {(iteration_end_time - self.curr_frame_time) * 1000:.2f} ms")
-
-                if self.debug:
-                    self.logger.debug(f"Frame {self.frame_counter} processed ****************\n")
-                
+        self.stage_stats = {name: StageStats(name) for name in ("capture", "inference", "analysis", "render", "latency")}
+
+        if not self.isTest and self.config.presenter_thread:
+            # imshow/waitKey run on their own thread so processing never blocks on the GUI
+            self.presenter = FramePresenter('Movement Detection', self.config.display_refresh_rate).start()
+
+        source.start()
+        try:
+            if self.config.pipelined:
+                self._run_pipelined(source, total_frames)
+            else:
+                self._run_sequential(source, total_frames)
         except Exception as e:
             print(f"An error occurred during processing: {str(e)}")
             self.logger.error(f"An error occurred during processing: {str(e)}", exc_info=True)
@@ -362,5 +714,176 @@ class MovementDetector:
                 self.is_recording = False
                 self.video_writer = None
 
-            cap.release()
-            cv2.destroyAllWindows() 
\ No newline at end of file
+            if self.presenter is not None:
+                self.presenter.stop()
+                self.presenter = None
+            source.release()
+            source.log_stats()
+            for stats in self.stage_stats.values():
+                stats.log_stats()
+            self.preprocess_pool.log_stats()
+            self.frame_pool.log_stats()
+            self.pose_detector.buffer_pool.log_stats()
+            if self.movement_analyzer.scheduler is not None:
+                self.movement_analyzer.scheduler.log_stats()
+            self._dump_trace(at_exit=True)
+            cv2.destroyAllWindows()
+
+    def _run_sequential(self, source: FrameSource, total_frames: int) -> None:
+        """Capture, infer, analyze and render each frame in turn on the calling thread"""
+        stats = self.stage_stats
+        self.last_prompt_time = time.time()
+
+        while True:
+            if self.useCamera:
+                # Calculate FPS dynamically for camera
+                self._update_camera_fps()
+            # else for video, self.current_fps is already set to original_fps and remains constant.
+
+            with stats["capture"].time():
+                ret, image, capture_time = source.read()
+            if not ret:
+                if self._stop_on_read_failure(source, total_frames):
+                    break
+                continue
+
+            with stats["inference"].time():
+                landmarks, predicted = self._infer_landmarks(image, self.frame_counter)
+
+            with stats["analysis"].time():
+                self._analyze_landmarks(landmarks, predicted, self.frame_counter, capture_time)
+
+            if not self.headless:
+                with stats["render"].time():
+                    image, original_frame_for_recording = self._render_frame(image, landmarks)
+
+                    # Video files are stepped frame by frame: wait for a key before the next frame
+                    if not self.isTest and not self._present_frame(image, step=not self.useCamera):
+                        break
+
+                    # Write frame if recording
+                    self._write_recording(original_frame_for_recording)
+            stats["latency"].record(time.time() - capture_time)
+
+            self.frame_counter += 1
+
+            if self.debug:
+                self.logger.debug(f"Frame {self.frame_counter} processed ****************\n")
+
+    def _run_pipelined(self, source: FrameSource, total_frames: int) -> None:
+        """Run capture, inference and analysis on their own threads and render on the calling thread
+
+        The stages are joined by bounded queues. The render queue always drops
+        its oldest frame when full, so analysis never waits on drawing, display
+        or recording. For cameras the other queues drop the oldest frame too,
+        keeping latency low; for video files they block instead, so every frame
+        is analyzed in order and events match the sequential loop. Video files
+        are not stepped frame by frame in this mode.
+        """
+        size = self.config.pipeline_queue_size
+        lossless = not self.useCamera
+        inference_queue = DropOldestQueue(size, drop_oldest=not lossless)
+        analysis_queue = DropOldestQueue(size, drop_oldest=not lossless)
+        render_queue = DropOldestQueue(size)
+
+        threads = [
+            threading.Thread(target=self._capture_stage, args=(source, total_frames, inference_queue),
+                             name="CaptureStage", daemon=True),
+            threading.Thread(target=self._inference_stage, args=(inference_queue, analysis_queue),
+                             name="InferenceStage", daemon=True),
+            threading.Thread(target=self._analysis_stage, args=(analysis_queue, render_queue),
+                             name="AnalysisStage", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        self.logger.info(f"Pipeline started (queue size {size}, {'lossless' if lossless else 'drop-oldest'} analysis)")
+
+        try:
+            self._render_stage(render_queue)
+        finally:
+            # Closing the render queue makes every upstream stage stop in turn
+            render_queue.close(discard=True)
+            for thread in reversed(threads):
+                thread.join(timeout=2.0)
+            # A dump requested after the last analyzed frame
+            if self._trace_dump_requested.is_set():
+                self._trace_dump_requested.clear()
+                self._dump_trace()
+            for name, queue in (("inference", inference_queue), ("analysis", analysis_queue), ("render", render_queue)):
+                self.logger.info(f"Frames dropped before {name}: {queue.dropped}")
+
+    def _capture_stage(self, source: FrameSource, total_frames: int, output_queue: DropOldestQueue) -> None:
+        stats = self.stage_stats["capture"]
+        frame_index = 0
+        try:
+            while not output_queue.closed:
+                if self.useCamera:
+                    self._update_camera_fps()
+                with stats.time():
+                    ret, image, capture_time = source.read()
+                if not ret:
+                    if self._stop_on_read_failure(source, total_frames):
+                        break
+                    continue
+                if not output_queue.put(PipelineFrame(frame_index, image, capture_time)):
+                    break
+                frame_index += 1
+        except Exception as e:
+            self.logger.error(f"Capture stage failed: {e}", exc_info=True)
+        finally:
+            output_queue.close()
+
+    def _inference_stage(self, input_queue: DropOldestQueue, output_queue: DropOldestQueue) -> None:
+        stats = self.stage_stats["inference"]
+        try:
+            while True:
+                frame = input_queue.get()
+                if frame is None:
+                    break
+                with stats.time():
+                    frame.landmarks, frame.predicted = self._infer_landmarks(frame.image, frame.index)
+                if not output_queue.put(frame):
+                    break
+        except Exception as e:
+            self.logger.error(f"Inference stage failed: {e}", exc_info=True)
+        finally:
+            input_queue.close(discard=True)
+            output_queue.close()
+
+    def _analysis_stage(self, input_queue: DropOldestQueue, output_queue: DropOldestQueue) -> None:
+        stats = self.stage_stats["analysis"]
+        try:
+            while True:
+                frame = input_queue.get()
+                if frame is None:
+                    break
+                with stats.time():
+                    self._analyze_landmarks(frame.landmarks, frame.predicted, frame.index, frame.capture_time)
+                self.frame_counter = frame.index + 1
+                if self._trace_dump_requested.is_set():
+                    self._trace_dump_requested.clear()
+                    self._dump_trace()
+                if not output_queue.put(frame):
+                    break
+        except Exception as e:
+            self.logger.error(f"Analysis stage failed: {e}", exc_info=True)
+        finally:
+            input_queue.close(discard=True)
+            output_queue.close()
+
+    def _render_stage(self, input_queue: DropOldestQueue) -> None:
+        stats = self.stage_stats["render"]
+        while True:
+            frame = input_queue.get()
+            if frame is None:
+                break
+            if self.headless:
+                # Nothing to draw; the queue is only drained to keep the stages flowing
+                self.stage_stats["latency"].record(time.time() - frame.capture_time)
+                continue
+            with stats.time():
+                image, original_frame_for_recording = self._render_frame(frame.image, frame.landmarks)
+                if not self.isTest and not self._present_frame(image, step=False):
+                    break
+                self._write_recording(original_frame_for_recording)
+            self.stage_stats["latency"].record(time.time() - frame.capture_time)
@@ -0,0 +1,400 @@
+import json
+import numpy as np
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
+
+from src import constants
+
+# A literal is (atom index, expected value); a condition is compiled to a list of
+# terms (OR) whose literals must all hold (AND)
+Literal = Tuple[int, bool]
+Term = FrozenSet[Literal]
+
+AXES = {"x": 0, "y": 1, "z": 2}
+
+# Direction names per axis, mapped to whether the coordinate decreased over the distance window
+DIRECTIONS = {
+    "x": {"decreasing": True, "increasing": False, "left": True, "right": False},
+    "y": {"decreasing": True, "increasing": False, "up": True, "down": False},
+    "z": {"decreasing": True, "increasing": False},
+}
+
+
+class MovementRule(NamedTuple):
+    """Compiled movement of a rules file; conditions are indices into MovementRules.values"""
+    name: str
+    reset: int  # Clears the in-motion state
+    ready: int  # Required, besides not being in motion, to detect any of the moves
+    moves: List[Tuple[str, int]]  # (move, condition) in priority order
+
+
+class MovementRules:
+    """Declarative movement rules compiled into array evaluators
+
+    A rules file (JSON, one per app) has three sections:
+
+    - "counters": named stability or motion counters, registered with the
+      analyzer's StabilityTracker: {"joint", "axis", "below" or "above",
+      optional "direction", "frames"}.
+    - "conditions": named boolean conditions, referenced by name elsewhere.
+    - "movements": in detection order, each with a "name", a "reset"
+      condition that clears its in-motion state, a "ready" condition and its
+      "moves" as [{"move", "when"}] in priority order.
+
+    A condition is a name, {"all": [...]}, {"any": [...]}, {"not": c} or an atom:
+
+    - {"joint", "axis", "direction"?, "above"?, "below"?} on the joint's
+      movement over the distance window
+    - {"joint", "axis", "moved_more_than": {"joint", "axis"}}
+    - {"stable": counter}, {"counter": counter, "equals": n} and
+      {"counter": counter, "greater_than": n or counter}
+
+    Joints are named after the constants module ("left_foot" is
+    LEFT_FOOT_INDEX). Thresholds are numbers or names of MovementConfig
+    fields. Directions are "decreasing"/"increasing", or "left"/"right" on x
+    and "up"/"down" on y.
+
+    The rules are a layer over the analyzer's StabilityTracker: the tracker
+    advances the counters as it does for the movement classes, and the rules
+    read its counts and held flags afterwards. Every condition is compiled to
+    a disjunction of conjunctions of atoms, and every atom to
+    sign * (x[a] - x[b]) > sign * offset over one feature vector holding the
+    distance table and the tracker state. A frame, a whole sequence (with a
+    leading frame axis) or several streams are all evaluated the same way.
+    """
+
+    def __init__(self, analyzer: Any, spec: Dict[str, Any]):
+        self.analyzer = analyzer
+        self.config = analyzer.config
+        self.stability = analyzer.stability
+
+        # Atoms as (feature a, feature b, offset, sign); features are symbolic until bound
+        self._atom_keys: Dict[Tuple, int] = {}
+        self._atoms: List[Tuple[Tuple, Optional[Tuple], float, float]] = []
+
+        self.counters: Dict[str, int] = {}
+        for name, counter in spec.get("counters", {}).items():
+            self.counters[name] = self._add_counter(name, counter)
+
+        self._condition_specs: Dict[str, Any] = spec.get("conditions", {})
+        self._compiled: Dict[str, List[Term]] = {}
+        self._compiling: List[str] = []
+        self._outputs: List[List[Term]] = []
+        self.conditions: Dict[str, int] = {}
+        for name in self._condition_specs:
+            self.conditions[name] = self._output(self._compile_named(name))
+
+        self.movements: List[MovementRule] = []
+        for movement in spec.get("movements", []):
+            name = movement["name"]
+            moves = [(move["move"], self._output(self._compile(move["when"]))) for move in movement["moves"]]
+            if not moves:
+                raise ValueError(f"Movement '{name}' has no moves")
+            self.movements.append(MovementRule(
+                name,
+                self._output(self._compile(movement.get("reset", False))),
+                self._output(self._compile(movement.get("ready", True))),
+                moves,
+            ))
+
+        self._bound: Optional[Tuple] = None
+        self._output_starts = np.zeros(0, dtype=np.intp)
+        self._term_literals = np.zeros((0, 0))
+        self._sequence_source: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._sequence_values: List[List[bool]] = []
+        self.values: List[bool] = [False] * len(self._outputs)
+        self._bind()
+
+        self.trace = None
+        if analyzer.trace is not None and self.conditions:
+            self.trace = analyzer.trace.channel("rules", list(self.conditions))
+            self._traced = list(self.conditions.values())
+
+    @classmethod
+    def load(cls, analyzer: Any, path: str) -> "MovementRules":
+        """Compile the rules file at path for the analyzer"""
+        with open(path) as f:
+            return cls(analyzer, json.load(f))
+
+    # Compilation
+
+    def _joint(self, spec: Dict[str, Any]) -> Tuple[int, int, str]:
+        joint = getattr(constants, f"{str(spec.get('joint')).upper()}_INDEX", None)
+        if joint is None:
+            raise ValueError(f"Unknown joint in rule: {spec.get('joint')}")
+        axis_name = spec.get("axis")
+        if axis_name not in AXES:
+            raise ValueError(f"Unknown axis in rule: {axis_name}")
+        return int(joint), AXES[axis_name], axis_name
+
+    def _direction(self, spec: Dict[str, Any], axis_name: str) -> Optional[bool]:
+        direction = spec.get("direction")
+        if direction is None:
+            return None
+        if direction not in DIRECTIONS[axis_name]:
+            raise ValueError(f"Unknown direction '{direction}' on axis {axis_name}")
+        return DIRECTIONS[axis_name][direction]
+
+    def _threshold(self, value: Union[float, str]) -> float:
+        if isinstance(value, str):
+            if not hasattr(self.config, value):
+                raise ValueError(f"Unknown config field in rule threshold: {value}")
+            value = getattr(self.config, value)
+        return float(value)
+
+    def _add_counter(self, name: str, spec: Dict[str, Any]) -> int:
+        joint, axis, axis_name = self._joint(spec)
+        frames = int(spec.get("frames", 1))
+        if ("above" in spec) == ("below" in spec):
+            raise ValueError(f"Counter '{name}' needs exactly one of 'above' and 'below'")
+        if "below" in spec:
+            if "direction" in spec:
+                raise ValueError(f"Counter '{name}': only 'above' counters can have a direction")
+            return self.stability.add(joint, axis, self._threshold(spec["below"]), frames)
+        return self.stability.add_motion(joint, axis, self._threshold(spec["above"]), frames,
+                                         decreasing=self._direction(spec, axis_name))
+
+    def _counter(self, name: str) -> int:
+        if name not in self.counters:
+            raise ValueError(f"Unknown counter in rule: {name}")
+        return self.counters[name]
+
+    def _atom(self, a: Tuple, b: Optional[Tuple], offset: float, sign: float) -> List[Term]:
+        """Condition sign * (feature a - feature b - offset) > 0 (b None for zero)"""
+        key = (a, b, offset, sign)
+        if key not in self._atom_keys:
+            self._atom_keys[key] = len(self._atoms)
+            self._atoms.append(key)
+        return [frozenset([(self._atom_keys[key], True)])]
+
+    def _compile_named(self, name: str) -> List[Term]:
+        if name in self._compiled:
+            return self._compiled[name]
+        if name not in self._condition_specs:
+            raise ValueError(f"Unknown condition in rule: {name}")
+        if name in self._compiling:
+            raise ValueError(f"Condition '{name}' refers to itself")
+        self._compiling.append(name)
+        self._compiled[name] = self._compile(self._condition_specs[name])
+        self._compiling.pop()
+        return self._compiled[name]
+
+    def _compile(self, spec: Any) -> List[Term]:
+        if spec is True:
+            return [frozenset()]
+        if spec is False:
+            return []
+        if isinstance(spec, str):
+            return self._compile_named(spec)
+        if "all" in spec:
+            result = [frozenset()]
+            for part in spec["all"]:
+                result = _conjunction(result, self._compile(part))
+            return result
+        if "any" in spec:
+            return _simplify([term for part in spec["any"] for term in self._compile(part)])
+        if "not" in spec:
+            return _negation(self._compile(spec["not"]))
+        if "stable" in spec:
+            return self._held(self._counter(spec["stable"]))
+        if "counter" in spec:
+            pair = self._counter(spec["counter"])
+            if "equals" in spec:
+                return self._count_equals(pair, int(spec["equals"]))
+            if "greater_than" in spec:
+                other = spec["greater_than"]
+                if isinstance(other, str):
+                    return self._count_greater_than_count(pair, self._counter(other))
+                return self._count_greater_than(pair, float(other))
+            raise ValueError(f"Counter condition needs 'equals' or 'greater_than': {spec}")
+        if "joint" in spec:
+            return self._compile_joint(spec)
+        raise ValueError(f"Unknown rule condition: {spec}")
+
+    def _compile_joint(self, spec: Dict[str, Any]) -> List[Term]:
+        joint, axis, axis_name = self._joint(spec)
+        delta = ("delta", joint, axis)
+        result = [frozenset()]
+        decreasing = self._direction(spec, axis_name)
+        if decreasing is not None:
+            result = _conjunction(result, self._decreasing(joint, axis, decreasing))
+        if "above" in spec:
+            result = _conjunction(result, self._atom(delta, None, self._threshold(spec["above"]), 1.0))
+        if "below" in spec:
+            result = _conjunction(result, self._atom(delta, None, self._threshold(spec["below"]), -1.0))
+        if "moved_more_than" in spec:
+            other, other_axis, _ = self._joint(spec["moved_more_than"])
+            result = _conjunction(result, self._atom(delta, ("delta", other, other_axis), 0.0, 1.0))
+        return result
+
+    def _decreasing(self, joint: int, axis: int, decreasing: bool) -> List[Term]:
+        # Directions are 0/1 features: decreasing means above 0.5
+        return self._atom(("direction", joint, axis), None, 0.5, 1.0 if decreasing else -1.0)
+
+    # Counter checks read the tracker's counts and held flags after its update for the frame
+
+    def _held(self, pair: int) -> List[Term]:
+        return self._atom(("held", pair), None, 0.5, 1.0)
+
+    def _count_equals(self, pair: int, value: int) -> List[Term]:
+        return _conjunction(self._atom(("counter", pair), None, value - 0.5, 1.0),
+                            self._atom(("counter", pair), None, value + 0.5, -1.0))
+
+    def _count_greater_than(self, pair: int, value: float) -> List[Term]:
+        return self._atom(("counter", pair), None, value, 1.0)
+
+    def _count_greater_than_count(self, pair: int, other: int) -> List[Term]:
+        return self._atom(("counter", pair), ("counter", other), 0.0, 1.0)
+
+    def motion_floor(self, output: int) -> Optional[float]:
+        """Largest threshold some joint movement must exceed whenever the output holds
+
+        Each term of the output needs its own "above" atoms; the floor is the
+        smallest of the terms' largest thresholds. None when a term holds
+        without any joint moving more than a threshold.
+        """
+        floor = None
+        for term in self._outputs[output]:
+            offsets = [self._atoms[atom][2] for atom, positive in term
+                       if positive and self._atoms[atom][0][0] == "delta"
+                       and self._atoms[atom][1] is None and self._atoms[atom][3] > 0]
+            if not offsets:
+                return None
+            floor = max(offsets) if floor is None else min(floor, max(offsets))
+        return floor
+
+    def joints(self, outputs: Optional[List[int]] = None) -> List[int]:
+        """Joints the outputs (every compiled atom when None) read, directly or through tracker counters"""
+        if outputs is None:
+            atoms = range(len(self._atoms))
+        else:
+            atoms = sorted({atom for output in outputs for term in self._outputs[output] for atom, _ in term})
+        joints = []
+        for atom in atoms:
+            for feature in self._atoms[atom][:2]:
+                if feature is None:
+                    continue
+                if feature[0] in ("delta", "direction"):
+                    joints.append(feature[1])
+                else:
+                    joints.append(self.stability.pair(feature[1])[0])
+        return list(dict.fromkeys(joints))
+
+    def _output(self, terms: List[Term]) -> int:
+        self._outputs.append(terms)
+        return len(self._outputs) - 1
+
+    def _bind(self) -> None:
+        """Resolve atoms to the feature vector and build the evaluation matrices
+
+        The feature vector is [deltas (joints * 3), directions (joints * 3), counters, held flags].
+        """
+        joint_rows = self.analyzer._joint_rows
+        num_values = len(self.analyzer.tracked_joints) * 3
+        num_pairs = len(self.stability)
+        bases = {"delta": 0, "direction": num_values, "counter": 2 * num_values, "held": 2 * num_values + num_pairs}
+        num_features = 2 * num_values + 2 * num_pairs
+
+        def position(feature: Tuple) -> int:
+            kind = feature[0]
+            if kind in ("delta", "direction"):
+                joint = feature[1]
+                if joint not in joint_rows:
+                    raise ValueError(f"Joint {joint} is not tracked by the analyzer")
+                return bases[kind] + joint_rows[joint] * 3 + feature[2]
+            return bases[kind] + feature[1]
+
+        # Atoms as one linear map: sign * (a - b) > sign * offset. Features are finite and
+        # the coefficients +-1, so the product computes a - b exactly like a subtraction
+        self._linear = np.zeros((num_features, len(self._atoms)))
+        self._bounds = np.zeros(len(self._atoms))
+        for index, (a, b, offset, sign) in enumerate(self._atoms):
+            self._linear[position(a), index] += sign
+            if b is not None:
+                self._linear[position(b), index] -= sign
+            self._bounds[index] = sign * offset
+
+        self._bound = (self.analyzer.tracked_joints, num_pairs)
+        if len(self._output_starts) == len(self._outputs) and len(self._term_literals) == len(self._atoms):
+            # The terms do not depend on the joints, only on the outputs and atoms, which have not changed
+            return
+
+        # A term holds where its literal sum reaches its number of positive literals (it never
+        # exceeds it); terms are laid out output by output, and an output holds where any of its
+        # terms does. An output without terms gets one that never holds
+        columns: List[Tuple[List[Literal], float]] = []
+        self._output_starts = np.zeros(len(self._outputs), dtype=np.intp)
+        for index, output in enumerate(self._outputs):
+            self._output_starts[index] = len(columns)
+            for term in output:
+                columns.append((list(term), sum(expected for _, expected in term) - 0.5))
+            if not output:
+                columns.append(([], 0.5))
+        self._term_literals = np.zeros((len(self._atoms), len(columns)))
+        self._term_minimum = np.zeros(len(columns))
+        for column, (literals, minimum) in enumerate(columns):
+            for atom, expected in literals:
+                self._term_literals[atom, column] = 1.0 if expected else -1.0
+            self._term_minimum[column] = minimum
+
+    # Evaluation
+
+    def evaluate(self, deltas: np.ndarray, directions: np.ndarray,
+                 counters: np.ndarray, held: np.ndarray) -> np.ndarray:
+        """Evaluate every rule output
+
+        Args:
+            deltas, directions: (..., joints * 3) flattened distance and direction tables
+            counters: (..., pairs) tracker counters, after the tracker update for the frame
+            held: (..., pairs) tracker held flags
+
+        Returns:
+            (..., outputs) boolean array, indexed like values
+        """
+        if self._bound != (self.analyzer.tracked_joints, len(self.stability)):
+            self._bind()
+        features = np.concatenate([deltas, directions, counters, held], axis=-1)
+        atoms = np.dot(features, self._linear) > self._bounds
+        terms = np.dot(atoms, self._term_literals) > self._term_minimum
+        return np.logical_or.reduceat(terms, self._output_starts, axis=-1)
+
+    def update(self) -> None:
+        """Make values current for the analyzer's frame (after the tracker update)"""
+        analyzer = self.analyzer
+        sequence = self.stability.sequence_arrays()
+        if sequence is not None:
+            if self._sequence_source is not sequence:
+                # First frame of a sequence: evaluate all of its frames at once
+                deltas, directions = analyzer._batch_distances[:2]
+                num_frames = len(deltas)
+                counters, held = sequence
+                outputs = self.evaluate(deltas.reshape(num_frames, -1), directions.reshape(num_frames, -1),
+                                        counters, held)
+                self._sequence_values = outputs.tolist()
+                self._sequence_source = sequence
+            self.values = self._sequence_values[analyzer._batch_position]
+        else:
+            counters, held = self.stability.arrays()
+            self.values = self.evaluate(analyzer.points_delta.ravel(), analyzer.points_direction.ravel(),
+                                        counters, held).tolist()
+
+        if self.trace is not None:
+            values = self.values
+            self.trace.record([values[index] for index in self._traced])
+
+
+def _simplify(terms: List[Term]) -> List[Term]:
+    """Drop contradictory, duplicate and absorbed terms"""
+    terms = [term for term in set(terms) if not any((atom, not expected) in term for atom, expected in term)]
+    return [term for term in terms if not any(other < term for other in terms)]
+
+
+def _conjunction(left: List[Term], right: List[Term]) -> List[Term]:
+    return _simplify([a | b for a in left for b in right])
+
+
+def _negation(terms: List[Term]) -> List[Term]:
+    """De Morgan: not (t1 or t2 ...) is (not t1) and (not t2) ..., each a disjunction of negated literals"""
+    result = [frozenset()]
+    for term in terms:
+        result = _conjunction(result, [frozenset([(atom, not expected)]) for atom, expected in term])
+    return result
@@ -0,0 +1,126 @@
+import threading
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Optional
+
+import numpy as np
+
+
+@dataclass
+class PipelineFrame:
+    """A frame travelling through the processing stages"""
+    index: int
+    image: np.ndarray
+    capture_time: float
+    landmarks: Any = None
+    predicted: bool = False
+
+
+class DropOldestQueue:
+    """Bounded queue between two pipeline stages
+
+    With drop_oldest a full queue discards its oldest item to make room, so
+    the producer never waits on a slow consumer. Without it the producer
+    blocks until there is room (lossless, used for video files where every
+    frame has to be analyzed in order).
+
+    close() ends the stream: blocked producers return, and consumers get the
+    remaining items followed by None.
+    """
+
+    def __init__(self, maxsize: int, drop_oldest: bool = True):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.drop_oldest = drop_oldest
+        self._items: Deque[Any] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.dropped: int = 0
+
+    def put(self, item: Any) -> bool:
+        """Add an item; returns False if the queue was closed"""
+        with self._condition:
+            if not self.drop_oldest:
+                self._condition.wait_for(lambda: len(self._items) < self.maxsize or self._closed)
+            if self._closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Return the oldest item, or None once the queue is closed and empty (or on timeout)"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._items or self._closed, timeout=timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self, discard: bool = False) -> None:
+        """End the stream, optionally discarding items that were not consumed yet"""
+        with self._condition:
+            self._closed = True
+            if discard:
+                self._items.clear()
+            self._condition.notify_all()
+
+
+class StageStats:
+    """Per-stage processing time statistics"""
+
+    def __init__(self, name: str, window: int = 300):
+        self.name = name
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+        self.logger = logging.getLogger('PipelineStats')
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def time(self) -> "_StageTimer":
+        """Context manager that records the time spent inside it"""
+        return _StageTimer(self)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Percentile (0-100) over the recent window"""
+        return float(np.percentile(self.recent, q)) if self.recent else 0.0
+
+    def log_stats(self) -> None:
+        self.logger.info(
+            f"{self.name}: {self.count} frames, mean {self.mean * 1000:.2f} ms, "
+            f"p95 {self.percentile(95) * 1000:.2f} ms, max {self.max * 1000:.2f} ms"
+        )
+
+
+class _StageTimer:
+    def __init__(self, stats: StageStats):
+        self.stats = stats
+        self.start = 0.0
+
+    def __enter__(self) -> "_StageTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stats.record(time.perf_counter() - self.start)
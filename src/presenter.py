@@ -0,0 +1,101 @@
+import cv2
+import numpy as np
+import threading
+import queue
+import logging
+from typing import List, Optional
+
+
+class FramePresenter:
+    """Shows frames and polls the keyboard on a dedicated display thread
+
+    The processing thread hands over rendered frames with show(), which only
+    copies the frame into a back buffer. The display thread shows the newest
+    frame at its own refresh rate; frames replaced before they were shown are
+    skipped. Key presses are forwarded through a thread-safe queue.
+    """
+
+    def __init__(self, window_name: str, refresh_rate: float = 60.0):
+        if refresh_rate <= 0:
+            raise ValueError("refresh_rate must be positive")
+        self.window_name = window_name
+        self.wait_ms = max(1, int(round(1000.0 / refresh_rate)))
+        self.logger = logging.getLogger('FramePresenter')
+
+        self._lock = threading.Lock()
+        self._back: Optional[np.ndarray] = None   # Written by show()
+        self._front: Optional[np.ndarray] = None  # Read by the display thread
+        self._has_new_frame = False
+        self._keys: "queue.Queue[int]" = queue.Queue()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.frames_submitted: int = 0
+        self.frames_presented: int = 0
+
+    def start(self) -> "FramePresenter":
+        """Start the display thread"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._display_loop, name="FramePresenter", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Display thread started ({self.wait_ms} ms refresh)")
+        return self
+
+    def show(self, frame: np.ndarray) -> None:
+        """Hand over a frame to display; the caller may reuse its buffer right away"""
+        with self._lock:
+            if self._back is None or self._back.shape != frame.shape or self._back.dtype != frame.dtype:
+                self._back = np.empty_like(frame)
+            np.copyto(self._back, frame)
+            self._has_new_frame = True
+            self.frames_submitted += 1
+
+    def _display_loop(self) -> None:
+        try:
+            while self._running:
+                frame = None
+                with self._lock:
+                    if self._has_new_frame:
+                        self._front, self._back = self._back, self._front
+                        self._has_new_frame = False
+                        frame = self._front
+                if frame is not None:
+                    cv2.imshow(self.window_name, frame)
+                    self.frames_presented += 1
+
+                key = cv2.waitKey(self.wait_ms) & 0xFF
+                if key != 0xFF:
+                    self._keys.put(key)
+        except Exception as e:
+            self.logger.error(f"Display thread failed: {e}", exc_info=True)
+        finally:
+            cv2.destroyWindow(self.window_name)
+
+    def poll_keys(self) -> List[int]:
+        """Return all key presses since the last call without blocking"""
+        keys = []
+        while True:
+            try:
+                keys.append(self._keys.get_nowait())
+            except queue.Empty:
+                return keys
+
+    def wait_key(self, timeout: Optional[float] = None) -> Optional[int]:
+        """Block until a key is pressed; returns None on timeout"""
+        try:
+            return self._keys.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self) -> None:
+        """Stop the display thread and close its window"""
+        if not self._running:
+            return
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.logger.info(f"Frames submitted: {self.frames_submitted}, presented: {self.frames_presented}")
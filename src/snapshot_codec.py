@@ -0,0 +1,87 @@
+import io
+import json
+import zlib
+from typing import Any, List
+
+import numpy as np
+
+# Keys marking encoded values in the JSON document; dicts using them as keys are encoded as pairs
+ARRAY_KEY = "__array__"
+TUPLE_KEY = "__tuple__"
+DICT_KEY = "__dict__"
+MARKER_KEYS = (ARRAY_KEY, TUPLE_KEY, DICT_KEY)
+
+# Name of the JSON document in the archive; arrays are stored as arr_0, arr_1, ...
+DOCUMENT_NAME = "state"
+
+
+def encode_state(state: Any) -> bytes:
+    """Serialize analyzer state to bytes without pickle
+
+    The state may hold None, bools, numbers, strings, lists, tuples, dicts
+    and numeric numpy arrays. Everything but the arrays goes into one JSON
+    document; the document and the arrays are stored with np.savez and the
+    archive compressed with zlib.
+    """
+    arrays: List[np.ndarray] = []
+    document = json.dumps(_encode(state, arrays))
+    buffer = io.BytesIO()
+    np.savez(buffer, **{DOCUMENT_NAME: np.array(document)}, **{f"arr_{index}": array for index, array in enumerate(arrays)})
+    # The float history barely compresses further at higher levels, which are several times slower
+    return zlib.compress(buffer.getvalue(), 1)
+
+
+def decode_state(data: bytes) -> Any:
+    """Deserialize bytes of encode_state(); nothing in them is ever unpickled or executed
+
+    Raises:
+        ValueError: The bytes are not a state encoded by encode_state()
+    """
+    try:
+        with np.load(io.BytesIO(zlib.decompress(data)), allow_pickle=False) as archive:
+            document = json.loads(str(archive[DOCUMENT_NAME]))
+            arrays = {name: archive[name] for name in archive.files if name != DOCUMENT_NAME}
+        return _decode(document, arrays)
+    except (ValueError, OSError, KeyError, TypeError, zlib.error) as e:
+        raise ValueError(f"Not a valid snapshot: {e}") from e
+
+
+def _encode(value: Any, arrays: List[np.ndarray]) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError("Snapshots cannot hold object arrays")
+        arrays.append(value)
+        return {ARRAY_KEY: f"arr_{len(arrays) - 1}"}
+    if isinstance(value, tuple):
+        return {TUPLE_KEY: [_encode(item, arrays) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item, arrays) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and key not in MARKER_KEYS for key in value):
+            return {key: _encode(item, arrays) for key, item in value.items()}
+        return {DICT_KEY: [[_encode(key, arrays), _encode(item, arrays)] for key, item in value.items()]}
+    raise TypeError(f"Snapshots cannot hold values of type {type(value).__name__}")
+
+
+def _decode(value: Any, arrays: dict) -> Any:
+    if isinstance(value, list):
+        return [_decode(item, arrays) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if ARRAY_KEY in value:
+        return arrays[value[ARRAY_KEY]]
+    if TUPLE_KEY in value:
+        return tuple(_decode(item, arrays) for item in value[TUPLE_KEY])
+    if DICT_KEY in value:
+        return {_hashable(_decode(key, arrays)): _decode(item, arrays) for key, item in value[DICT_KEY]}
+    return {key: _decode(item, arrays) for key, item in value.items()}
+
+
+def _hashable(key: Any) -> Any:
+    if isinstance(key, list):
+        raise TypeError("Snapshot dict keys cannot be lists")
+    return key
@@ -0,0 +1,243 @@
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StabilityTracker:
+    """Consecutive-frame counters for (joint, axis) pairs, updated in one vectorized step per frame
+
+    Detectors register the pairs they need once and then only query them.
+    A stability pair counts the frames in a row its movement over the
+    distance window stayed below the threshold; a motion pair counts the
+    frames it moved more than the threshold, optionally in one direction
+    only. A pair is stable (or moving) once its count reaches its required
+    frames, or the equivalent duration with time-based windows. A pair's
+    condition never holds on frames where its joint is not visible, so its
+    count starts over when the joint shows up again.
+
+    Registering the same pair with the same parameters again returns the
+    existing index, so detectors with identical criteria share a counter.
+
+    For a whole recording, begin_sequence() computes the counters of every
+    frame at once (they are run lengths); update() then just steps through them.
+    """
+
+    def __init__(self, analyzer: Any):
+        self.analyzer = analyzer
+        self._keys: Dict[Tuple, int] = {}
+        self._pair_keys: List[Tuple] = []
+        self._joints: List[int] = []
+        self._joint_index = np.zeros(0, dtype=np.intp)  # Landmark index of each pair's joint
+        self._axes = np.zeros(0, dtype=np.intp)
+        self._thresholds = np.zeros(0)
+        self._signs = np.zeros(0)  # +1 for stability pairs, -1 for motion pairs: the condition holds where sign * (distance - threshold) < 0
+        self._required = np.zeros(0, dtype=np.int64)
+        self._restricted = np.zeros(0, dtype=bool)  # Pairs that only count movement in one direction
+        self._any_restricted = False
+        self._direction = np.zeros(0, dtype=bool)
+        self._flat = np.zeros(0, dtype=np.intp)  # Index of each pair in the flattened distance table
+        self._bound_joints: Optional[List[int]] = None  # tracked_joints the flat indices were resolved against
+
+        # Counters of a whole sequence, (T, pairs), while one is being analyzed
+        self._sequence: Optional[Tuple[list, list]] = None
+        self._sequence_arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        self.counters = np.zeros(0, dtype=np.int64)
+        self._held = np.zeros(0, dtype=bool)
+        self._counter_list: List[int] = []
+        self._held_list: List[bool] = []
+
+    def __len__(self) -> int:
+        return len(self._joints)
+
+    def add(self, joint: int, axis: int, threshold: float, required_frames: int = 1) -> int:
+        """Register a stability pair (movement below threshold) and return its index"""
+        return self._add(joint, axis, threshold, required_frames, motion=False, decreasing=None)
+
+    def add_motion(self, joint: int, axis: int, threshold: float, required_frames: int = 1,
+                   decreasing: Optional[bool] = None) -> int:
+        """Register a motion pair (movement above threshold) and return its index
+
+        Args:
+            decreasing: Only count frames whose coordinate decreased (True) or
+                increased (False) over the window; None counts both
+        """
+        return self._add(joint, axis, threshold, required_frames, motion=True, decreasing=decreasing)
+
+    def _add(self, joint: int, axis: int, threshold: float, required_frames: int,
+             motion: bool, decreasing: Optional[bool]) -> int:
+        if required_frames < 1:
+            raise ValueError("required_frames must be at least 1")
+        key = (joint, axis, threshold, required_frames, motion, decreasing)
+        if key in self._keys:
+            return self._keys[key]
+
+        index = len(self._joints)
+        self._keys[key] = index
+        self._pair_keys.append(key)
+        self._joints.append(joint)
+        self._joint_index = np.append(self._joint_index, int(joint))
+        self._axes = np.append(self._axes, axis)
+        self._thresholds = np.append(self._thresholds, threshold)
+        self._required = np.append(self._required, required_frames)
+        self._signs = np.append(self._signs, -1.0 if motion else 1.0)
+        self._restricted = np.append(self._restricted, decreasing is not None)
+        self._any_restricted = self._any_restricted or decreasing is not None
+        self._direction = np.append(self._direction, bool(decreasing))
+        self.counters = np.append(self.counters, 0)
+        self._counter_list.append(0)
+        self._held_list.append(False)
+        self._held = np.append(self._held, False)
+        self._bound_joints = None
+        return index
+
+    def pair(self, index: int) -> Tuple[int, int, float, int, bool, Optional[bool]]:
+        """(joint, axis, threshold, required_frames, motion, decreasing) of a registered pair"""
+        return self._pair_keys[index]
+
+    def joints(self) -> List[int]:
+        """Joints of the registered pairs, in registration order"""
+        return list(dict.fromkeys(self._joints))
+
+    def _bind(self) -> None:
+        """Resolve pairs to positions in the analyzer's (joints, 3) distance table"""
+        joint_rows = self.analyzer._joint_rows
+        missing = [joint for joint in self._joints if joint not in joint_rows]
+        if missing:
+            raise ValueError(f"Joints {missing} are not tracked by the analyzer")
+        rows = np.array([joint_rows[joint] for joint in self._joints], dtype=np.intp)
+        self._flat = rows * 3 + self._axes
+        self._bound_joints = self.analyzer.tracked_joints
+
+    def _holds(self, deltas: np.ndarray, directions: np.ndarray) -> np.ndarray:
+        """Whether each pair's condition holds, for distance tables flattened to (..., joints * 3)"""
+        margin = np.take(deltas, self._flat, axis=-1)
+        margin -= self._thresholds
+        margin *= self._signs
+        holds = margin < 0
+        if self._any_restricted:
+            wrong_direction = np.take(directions, self._flat, axis=-1) != self._direction
+            holds &= ~(wrong_direction & self._restricted)
+        return holds
+
+    def begin_sequence(self, deltas: np.ndarray, directions: np.ndarray, visible: np.ndarray) -> None:
+        """Precompute the counters of every frame of a sequence
+
+        Args:
+            deltas: (T, joints, 3) distance tables of the frames, in analysis order
+            directions: (T, joints, 3) direction tables
+            visible: (T, landmarks) visibility of the landmarks on the frames
+        """
+        if not self._joints:
+            return
+        if self._bound_joints is not self.analyzer.tracked_joints:
+            self._bind()
+        num_frames = len(deltas)
+        holds = self._holds(deltas.reshape(num_frames, -1), directions.reshape(num_frames, -1))
+        holds &= visible[:, self._joint_index]
+
+        # A counter is the distance to the last frame its condition failed; the
+        # current counts act as a run that started before the sequence
+        frame_index = np.arange(num_frames)[:, None]
+        last_failure = np.where(holds, -1 - self.counters, frame_index)
+        np.maximum.accumulate(last_failure, axis=0, out=last_failure)
+        counters = frame_index - last_failure
+        if self.analyzer.time_based_windows:
+            held = self.analyzer.held_long_enough_sequence(counters, self._required)
+        else:
+            held = counters >= self._required
+        self._sequence = (counters.tolist(), held.tolist())
+        self._sequence_arrays = (counters, held)
+
+    def end_sequence(self) -> None:
+        """Leave the counters as they were after the last frame of the sequence"""
+        if self._sequence is None:
+            return
+        self.counters = np.array(self._counter_list, dtype=np.int64)
+        self._held = np.array(self._held_list, dtype=bool)
+        self._sequence = None
+        self._sequence_arrays = None
+
+    def update(self) -> None:
+        """Advance all counters with the analyzer's distance table of the current frame"""
+        if not self._joints:
+            return
+        if self._sequence is not None:
+            counter_lists, held_lists = self._sequence
+            position = self.analyzer._batch_position
+            self._counter_list = counter_lists[position]
+            self._held_list = held_lists[position]
+        else:
+            if self._bound_joints is not self.analyzer.tracked_joints:
+                self._bind()
+            holds = self._holds(self.analyzer.points_delta.ravel(), self.analyzer.points_direction.ravel())
+            holds &= self.analyzer.landmark_visible[self._joint_index]
+            counters = self.counters
+            counters += 1
+            counters *= holds
+            self._held = self.analyzer.held_long_enough_counts(counters, self._required)
+            self._counter_list = counters.tolist()
+            self._held_list = self._held.tolist()
+
+    def step(self, counters: np.ndarray, deltas: np.ndarray, directions: np.ndarray,
+             visible: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Counters and held flags one frame on, for several independent streams with frame-based windows
+
+        Args:
+            counters: (K, pairs) counters of the streams before the frame
+            deltas: (K, joints, 3) distance tables of the frame
+            directions: (K, joints, 3) direction tables
+            visible: (K, landmarks) visibility of the landmarks on the frame
+
+        Returns:
+            ((K, pairs) counters, (K, pairs) held flags)
+        """
+        if self._bound_joints is not self.analyzer.tracked_joints:
+            self._bind()
+        num_streams = len(counters)
+        holds = self._holds(deltas.reshape(num_streams, -1), directions.reshape(num_streams, -1))
+        holds &= visible[:, self._joint_index]
+        counters = (counters + 1) * holds
+        return counters, counters >= self._required
+
+    def reset(self) -> None:
+        """Zero all counters"""
+        self.counters[:] = 0
+        self._held = np.zeros(len(self._joints), dtype=bool)
+        self._counter_list = [0] * len(self._joints)
+        self._held_list = [False] * len(self._joints)
+
+    def snapshot(self) -> List[Tuple[Tuple, int, bool]]:
+        """(pair, counter, held) of every registered pair"""
+        return [((int(key[0]),) + key[1:], counter, held)
+                for key, counter, held in zip(self._pair_keys, self._counter_list, self._held_list)]
+
+    def restore(self, state: List[Tuple[Tuple, int, bool]]) -> None:
+        """Restore the counters of snapshot(); pairs it does not have start from zero"""
+        saved = {key: (counter, held) for key, counter, held in state}
+        values = [saved.get(key, (0, False)) for key in self._pair_keys]
+        self._counter_list = [counter for counter, _ in values]
+        self._held_list = [held for _, held in values]
+        self.counters = np.array(self._counter_list, dtype=np.int64)
+        self._held = np.array(self._held_list, dtype=bool)
+
+    def counter(self, index: int) -> int:
+        """Consecutive frames, up to the current one, the pair's condition held"""
+        return self._counter_list[index]
+
+    def held(self, index: int) -> bool:
+        """Whether the pair's condition has held for its required frames (or duration)"""
+        return self._held_list[index]
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Counters and held flags of all pairs for the current frame"""
+        if self._sequence is not None:
+            return np.array(self._counter_list, dtype=np.int64), np.array(self._held_list, dtype=bool)
+        return self.counters, self._held
+
+    def sequence_arrays(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(T, pairs) counters and held flags of the sequence being analyzed
+
+        None outside a sequence. The counters attribute keeps the counts from
+        before the sequence until end_sequence().
+        """
+        return self._sequence_arrays
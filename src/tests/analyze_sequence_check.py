@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+from importlib import import_module
+
+import cv2
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.landmark_array import new_landmark_array, extract_landmarks
+
+VIDEOS_DIR = os.path.join(os.path.dirname(__file__), 'moves_videos')
+
+
+def extract_recording(video_path, config, detector=None):
+    """Run pose inference over a video once and return (landmarks (T, 33, 4), timestamps (T,))"""
+    if detector is None:
+        detector = MovementDetector(config=config, useCamera=False, headless=True)
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = []
+    while True:
+        ret, image = cap.read()
+        if not ret:
+            break
+        pose_landmarks = detector.pose_detector.process_frame(detector._preprocess_frame(image))
+        if pose_landmarks is None:
+            frames.append(np.full((33, 4), np.nan, dtype=np.float32))
+        else:
+            frames.append(extract_landmarks(pose_landmarks, new_landmark_array()))
+    cap.release()
+    return np.array(frames), np.arange(len(frames)) / fps
+
+
+class _LandmarkList:
+    """Minimal stand-in for a NormalizedLandmarkList built from one array row"""
+
+    class _Landmark:
+        __slots__ = ("x", "y", "z", "visibility")
+
+        def __init__(self, row):
+            self.x, self.y, self.z, self.visibility = (float(value) for value in row)
+
+    def __init__(self, rows):
+        self.landmark = [self._Landmark(row) for row in rows]
+
+
+def run_check(app_name="original"):
+    """Compare analyze_sequence with frame-by-frame check_for_movment on every test video"""
+    MovementAnalyzer = import_module(f"src.apps.{app_name}.movement_analyzer").MovementAnalyzer
+    videos = sorted(name for name in os.listdir(VIDEOS_DIR) if name.endswith('.mp4'))
+
+    for name in videos:
+        config = MovementConfig(app_name=app_name)
+        landmarks, timestamps = extract_recording(os.path.join(VIDEOS_DIR, name), config)
+        detector = MovementDetector(config=config, useCamera=False, headless=True)
+        mp_pose = detector.pose_detector.mp_pose
+
+        streaming = MovementAnalyzer(config, mp_pose)
+        frames = [None if np.isnan(rows).any() else _LandmarkList(rows) for rows in landmarks]
+        start_time = time.perf_counter()
+        streaming_events = []
+        for frame_index, frame in enumerate(frames):
+            if movement := streaming.check_for_movment(frame, float(timestamps[frame_index])):
+                streaming_events.append((frame_index, movement))
+        streaming_time = time.perf_counter() - start_time
+
+        batch = MovementAnalyzer(config, mp_pose)
+        start_time = time.perf_counter()
+        batch_events = batch.analyze_sequence(landmarks, timestamps)
+        batch_time = time.perf_counter() - start_time
+
+        result = "✓ identical events" if batch_events == streaming_events else "❌ events differ"
+        print(f"{name}: {result} {batch_events}")
+        print(f"  streaming {streaming_time * 1e6 / len(landmarks):.1f} us/frame, "
+              f"analyze_sequence {batch_time * 1e6 / len(landmarks):.1f} us/frame")
+
+
+if __name__ == "__main__":
+    run_check(sys.argv[1] if len(sys.argv) > 1 else "original")
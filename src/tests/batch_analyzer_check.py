@@ -0,0 +1,83 @@
+import sys
+import os
+import time
+from dataclasses import replace
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.apps.original.movement_analyzer import MovementAnalyzer
+from src.apps.original.batch_movement_analyzer import BatchMovementAnalyzer
+from analyze_sequence_check import VIDEOS_DIR, extract_recording, _LandmarkList
+
+NUM_STREAMS = 24
+BENCHMARK_STREAMS = (1, 16, 64, 256)
+OCCLUDED_FRACTION = 0.1
+
+
+def _build_streams(recordings, num_streams, rng):
+    """(T, K, 33, 4) landmarks of K players: the test videos at random offsets, with some occluded landmarks"""
+    length = max(len(landmarks) for landmarks, _ in recordings) + 40
+    streams = np.full((length, num_streams, 33, 4), np.nan, dtype=np.float32)
+    for stream in range(num_streams):
+        landmarks, _ = recordings[stream % len(recordings)]
+        offset = int(rng.integers(0, length - len(landmarks) + 1))
+        streams[offset:offset + len(landmarks), stream] = landmarks
+        if stream % 2:
+            frames = rng.random(length) < OCCLUDED_FRACTION
+            joints = rng.integers(0, 33, size=3)
+            streams[np.ix_(frames, [stream], joints, [3])] = 0.0
+    return streams
+
+
+def run_check():
+    """Compare every stream of the batch analyzer with single-stream analyzers and time both"""
+    config = MovementConfig(app_name="original")
+    mp_pose = MovementDetector(config=config, useCamera=False, headless=True).pose_detector.mp_pose
+    videos = sorted(name for name in os.listdir(VIDEOS_DIR) if name.endswith('.mp4'))
+    recordings = [extract_recording(os.path.join(VIDEOS_DIR, name), config) for name in videos]
+    rng = np.random.default_rng(0)
+
+    landmarks = _build_streams(recordings, NUM_STREAMS, rng)
+    # Each stream has its own clock
+    timestamps = np.arange(len(landmarks))[:, None] / 30.0 + rng.uniform(0, 100, NUM_STREAMS)
+    batch_events = BatchMovementAnalyzer(config, mp_pose, NUM_STREAMS).analyze_sequences(landmarks, timestamps)
+    for movement_rules in (False, True):
+        single_config = replace(config, movement_rules=movement_rules)
+        differing = [stream for stream in range(NUM_STREAMS)
+                     if MovementAnalyzer(single_config, mp_pose).analyze_sequence(
+                         landmarks[:, stream], timestamps[:, stream]) != batch_events[stream]]
+        label = "rules" if movement_rules else "classes"
+        status = "✓" if not differing else f"❌ streams {differing} differ"
+        print(f"{status} batch vs single-stream {label}: {NUM_STREAMS} streams, "
+              f"{sum(len(events) for events in batch_events)} events")
+
+    print("Time per stream and frame:")
+    for num_streams in BENCHMARK_STREAMS:
+        landmarks = _build_streams(recordings, num_streams, rng)
+        timestamps = np.arange(len(landmarks)) / 30.0
+        batch = BatchMovementAnalyzer(config, mp_pose, num_streams)
+        start_time = time.perf_counter()
+        batch.analyze_sequences(landmarks, timestamps)
+        batch_time = (time.perf_counter() - start_time) / landmarks.shape[0] / num_streams
+
+        # Live stations: one analyzer per stream, fed frame by frame
+        analyzers = [MovementAnalyzer(config, mp_pose) for _ in range(min(num_streams, 8))]
+        frames = [[None if np.isnan(rows).any() else _LandmarkList(rows) for rows in landmarks[:, stream]]
+                  for stream in range(len(analyzers))]
+        start_time = time.perf_counter()
+        for frame_index, timestamp in enumerate(timestamps.tolist()):
+            for stream, analyzer in enumerate(analyzers):
+                analyzer.check_for_movment(frames[stream][frame_index], timestamp)
+        single_time = (time.perf_counter() - start_time) / landmarks.shape[0] / len(analyzers)
+        print(f"  {num_streams} streams: batch {batch_time * 1e6:.1f} us, "
+              f"one MovementAnalyzer.check_for_movment per stream {single_time * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    run_check()
@@ -0,0 +1,85 @@
+import json
+import sys
+import os
+import time
+from dataclasses import replace
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.apps.original.movement_analyzer import MovementAnalyzer
+from analyze_sequence_check import extract_recording
+
+REPEATS = 7
+
+
+def _timed_detection(analyzer):
+    """Wrap the analyzer's detect_movement to accumulate the time spent in it"""
+    detect_movement = analyzer.detect_movement
+    spent = [0.0]
+
+    def timed():
+        start = time.perf_counter()
+        result = detect_movement()
+        spent[0] += time.perf_counter() - start
+        return result
+
+    analyzer.detect_movement = timed
+    return spent
+
+
+def _run(config, mp_pose, landmarks, timestamps):
+    analyzer = MovementAnalyzer(config, mp_pose)
+    spent = _timed_detection(analyzer)
+    events = analyzer.analyze_sequence(landmarks, timestamps)
+    return events, spent[0], analyzer.scheduler
+
+
+def run_check():
+    """Compare detection with and without the detector scheduler on the tests.json videos and on a still player"""
+    with open(os.path.join(os.path.dirname(__file__), 'tests.json'), 'r') as file:
+        test_config = json.load(file)
+
+    mp_pose = MovementDetector(config=MovementConfig(), useCamera=False, headless=True).pose_detector.mp_pose
+    recordings = {}
+    for test_name, test_data in test_config.items():
+        video_path = os.path.abspath(os.path.join(os.path.dirname(__file__), test_data["video_path"]))
+        if not os.path.exists(video_path):
+            print(f"{test_name}: skipped, {test_data['video_path']} not found")
+            continue
+        recordings[test_name] = extract_recording(video_path, MovementConfig(app_name="original"))
+
+    if recordings:
+        # A player standing still: the first visible frame of the first recording, repeated
+        landmarks, _ = next(iter(recordings.values()))
+        still = next(rows for rows in landmarks if not np.isnan(rows).any())
+        recordings["still player"] = (np.repeat(still[None], 300, axis=0), np.arange(300) / 30.0)
+
+    for name, (landmarks, timestamps) in recordings.items():
+        print(f"{name}:")
+        for movement_rules in (False, True):
+            results = {}
+            for scheduling in (False, True):
+                config = replace(MovementConfig(app_name="original"), movement_rules=movement_rules,
+                                 detector_scheduling=scheduling)
+                runs = [_run(config, mp_pose, landmarks, timestamps) for _ in range(REPEATS)]
+                results[scheduling] = (runs[0][0], min(spent for _, spent, _ in runs) * 1e6 / len(landmarks), runs[0][2])
+
+            identical = results[False][0] == results[True][0]
+            label = "rules" if movement_rules else "classes"
+            print(f"  {label}: {'✓ identical events' if identical else '❌ events differ'} {results[True][0]}, "
+                  f"detection {results[False][1]:.2f} -> {results[True][1]:.2f} us/frame")
+            scheduler = results[True][2]
+            print(f"    {scheduler.idle_frames}/{scheduler.frames} frames below every energy floor")
+            for index, detector in enumerate(scheduler._detectors):
+                calls = scheduler.calls[index]
+                print(f"    {detector.name}: detect() on {calls} frames, {scheduler.hits[index]} hits")
+
+
+if __name__ == "__main__":
+    run_check()
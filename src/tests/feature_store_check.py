@@ -0,0 +1,87 @@
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.apps.original.movement_analyzer import MovementAnalyzer
+from src.feature_store import CENTER, TORSO
+from src.constants import LEFT_HIP_INDEX, RIGHT_HIP_INDEX, LEFT_SHOULDER_INDEX, RIGHT_SHOULDER_INDEX
+from analyze_sequence_check import VIDEOS_DIR, extract_recording
+
+REPEATS = 2000
+
+
+def _direct_features(analyzer, frames):
+    """Displacement, velocity and acceleration of every landmark, computed from the history one window at a time"""
+    history = analyzer.landmark_history
+    span = analyzer.frames_back(frames)
+    now, start, last, before = history.ago(0), history.ago(span), history.ago(1), history.ago(1 + span)
+    now_time, start_time = history.time_ago(0), history.time_ago(span)
+    last_time, before_time = history.time_ago(1), history.time_ago(1 + span)
+    velocity = (now - start) / (now_time - start_time)
+    previous_velocity = (last - before) / (last_time - before_time)
+    acceleration = (velocity - previous_velocity) / (now_time - last_time)
+    return now - start, velocity, acceleration
+
+
+def _points(features, values):
+    """Rows of the store for the tracked joints, the body center and the torso from per-landmark values"""
+    joints = features.analyzer.tracked_joints
+    center = (values[LEFT_HIP_INDEX] + values[RIGHT_HIP_INDEX]) / 2
+    torso = (values[LEFT_SHOULDER_INDEX] + values[RIGHT_SHOULDER_INDEX]) / 2
+    rows = np.empty((len(joints) + 2, 3))
+    rows[[features.row(joint) for joint in joints]] = values[joints]
+    rows[features.row(CENTER)] = center
+    rows[features.row(TORSO)] = torso
+    return rows
+
+
+def run_check():
+    """Compare the feature store with direct per-window formulas on every frame of the test videos"""
+    mp_pose = MovementDetector(config=MovementConfig(), useCamera=False, headless=True).pose_detector.mp_pose
+    videos = sorted(name for name in os.listdir(VIDEOS_DIR) if name.endswith('.mp4'))
+    for name in videos:
+        config = MovementConfig(app_name="original")
+        landmarks, timestamps = extract_recording(os.path.join(VIDEOS_DIR, name), config)
+        analyzer = MovementAnalyzer(config, mp_pose)
+        features = analyzer.features
+
+        mismatches = 0
+        checked = 0
+        update = analyzer.update_is_stable_general
+
+        def compare():
+            nonlocal mismatches, checked
+            # Skip frames whose spans the history cannot cover yet
+            if len(analyzer.landmark_history) > 1 + analyzer.frames_back(max(features.windows)):
+                displacement, velocity, acceleration = features.arrays()
+                for window, frames in enumerate(features.windows):
+                    expected = [_points(features, values) for values in _direct_features(analyzer, frames)]
+                    actual = (displacement[window], velocity[window], acceleration[window])
+                    mismatches += not all(np.allclose(a, e) for a, e in zip(actual, expected))
+                checked += 1
+            return update()
+
+        analyzer.update_is_stable_general = compare
+        analyzer.analyze_sequence(landmarks, timestamps)
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            features._frame = -1
+            features.arrays()
+        per_frame = (time.perf_counter() - start) / REPEATS * 1e6
+
+        status = "✓" if mismatches == 0 else "❌"
+        print(f"{status} {name}: {checked} frames checked over windows {features.windows}, {mismatches} mismatches, "
+              f"{per_frame:.1f} us per frame")
+
+
+if __name__ == "__main__":
+    run_check()
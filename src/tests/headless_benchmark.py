@@ -0,0 +1,61 @@
+import sys
+import os
+import time
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+
+VIDEOS_DIR = os.path.join(os.path.dirname(__file__), 'moves_videos')
+
+
+def run_video(video_path, headless):
+    """Process one video and return (detected moves, wall time, frames, render stage stats)"""
+    detected_moves = []
+
+    def movement_callback(movement, data):
+        detected_moves.append((movement, data["frame"]))
+
+    detector = MovementDetector(
+        config=MovementConfig(app_name="original"),
+        useCamera=False,
+        callback=movement_callback,
+        isTest=True,
+        headless=headless
+    )
+    start_time = time.perf_counter()
+    detector.start_camera(video_path)
+    elapsed = time.perf_counter() - start_time
+    return detected_moves, elapsed, detector.frame_counter, detector.stage_stats["render"]
+
+
+def run_benchmark():
+    """Compare the isTest path (renders but does not display) with headless mode"""
+    videos = sorted(name for name in os.listdir(VIDEOS_DIR) if name.endswith('.mp4'))
+    totals = {"test": [0.0, 0.0], "headless": [0.0, 0.0]}  # wall time, render time
+
+    for name in videos:
+        video_path = os.path.abspath(os.path.join(VIDEOS_DIR, name))
+        test_moves, test_time, frames, test_render = run_video(video_path, headless=False)
+        headless_moves, headless_time, _, _ = run_video(video_path, headless=True)
+
+        totals["test"][0] += test_time
+        totals["test"][1] += test_render.total
+        totals["headless"][0] += headless_time
+
+        same = "✓ same events" if test_moves == headless_moves else f"❌ events differ: {test_moves} vs {headless_moves}"
+        print(f"{name}: {frames} frames")
+        print(f"  isTest:   {test_time * 1000 / frames:6.2f} ms/frame "
+              f"(rendering {test_render.mean * 1000:.2f} ms/frame)")
+        print(f"  headless: {headless_time * 1000 / frames:6.2f} ms/frame")
+        print(f"  {same}")
+
+    print(f"\nTotal isTest: {totals['test'][0]:.2f} s (of which rendering {totals['test'][1]:.2f} s), "
+          f"headless: {totals['headless'][0]:.2f} s")
+
+
+if __name__ == "__main__":
+    run_benchmark()
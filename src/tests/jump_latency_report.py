@@ -0,0 +1,60 @@
+import json
+import sys
+import os
+from dataclasses import replace
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.apps.original.movement_analyzer import MovementAnalyzer
+from analyze_sequence_check import extract_recording
+from move_matching import pair_moves
+
+JUMP_DETECTORS = ("window", "onset")
+
+
+def run_report():
+    """Per-event latency (frames after from_frame) of the window and onset jump detectors on the tests.json videos"""
+    with open(os.path.join(os.path.dirname(__file__), 'tests.json'), 'r') as file:
+        test_config = json.load(file)
+
+    mp_pose = MovementDetector(config=MovementConfig(), useCamera=False, headless=True).pose_detector.mp_pose
+    latencies = {name: {} for name in JUMP_DETECTORS}
+    errors = {name: [0, 0] for name in JUMP_DETECTORS}
+    for test_name, test_data in test_config.items():
+        video_path = os.path.abspath(os.path.join(os.path.dirname(__file__), test_data["video_path"]))
+        if not os.path.exists(video_path):
+            print(f"{test_name}: skipped, {test_data['video_path']} not found")
+            continue
+
+        landmarks, timestamps = extract_recording(video_path, MovementConfig(app_name="original"))
+        print(f"{test_name}:")
+        for name in JUMP_DETECTORS:
+            config = replace(MovementConfig(app_name="original"), jump_detector=name)
+            detected = MovementAnalyzer(config, mp_pose).analyze_sequence(landmarks, timestamps)
+            move_latencies, _, false_positives = pair_moves(test_data["moves"], detected)
+            misses = move_latencies.count(None)
+            errors[name][0] += misses
+            errors[name][1] += false_positives
+
+            events = []
+            for move, latency in zip(test_data["moves"], move_latencies):
+                events.append(f"{move['move_key']}@{move['from_frame']}: "
+                              f"{'missed' if latency is None else f'{latency:+d}'}")
+                if latency is not None:
+                    latencies[name].setdefault(move["move_key"], []).append(latency)
+            print(f"  {name}: {', '.join(events)}; {misses} missed, {false_positives} false positives")
+
+    print("Mean frames after from_frame:")
+    for name in JUMP_DETECTORS:
+        per_move = ", ".join(f"{key} {np.mean(values):+.2f} ({len(values)})" for key, values in latencies[name].items())
+        print(f"  {name}: {per_move}; {errors[name][0]} missed, {errors[name][1]} false positives")
+
+
+if __name__ == "__main__":
+    run_report()
@@ -0,0 +1,57 @@
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mediapipe.framework.formats import landmark_pb2
+from src.landmark_array import new_landmark_array, extract_landmarks
+
+
+def _reference(landmarks, num_landmarks=33):
+    """x, y, z, visibility through the message API, visibility 0 for missing landmarks"""
+    expected = np.zeros((num_landmarks, 4), dtype=np.float32)
+    for index, landmark in enumerate(landmarks.landmark[:num_landmarks]):
+        expected[index] = (landmark.x, landmark.y, landmark.z, landmark.visibility)
+    return expected
+
+
+def _fill(landmarks, count, rng, skip_field=None):
+    for index in range(count):
+        fields = dict(x=rng.random(), y=rng.random(), z=rng.random() - 0.5,
+                      visibility=rng.random(), presence=rng.random())
+        if index == count // 2 and skip_field is not None:
+            del fields[skip_field]
+        landmarks.landmark.add(**fields)
+    return landmarks
+
+
+def run_check():
+    """Check extract_landmarks into a reused array against a fresh read through the message API"""
+    rng = np.random.default_rng(0)
+    cases = {
+        "MediaPipe output": _fill(landmark_pb2.NormalizedLandmarkList(), 33, rng),
+        "fewer landmarks": _fill(landmark_pb2.NormalizedLandmarkList(), 20, rng),
+        "more landmarks": _fill(landmark_pb2.NormalizedLandmarkList(), 40, rng),
+        "a landmark without presence": _fill(landmark_pb2.NormalizedLandmarkList(), 33, rng, "presence"),
+        "a landmark without visibility": _fill(landmark_pb2.NormalizedLandmarkList(), 33, rng, "visibility"),
+    }
+    special = _fill(landmark_pb2.NormalizedLandmarkList(), 33, rng)
+    special.landmark[0].x = float("nan")
+    special.landmark[1].y = -0.0
+    special.landmark[2].z = 1e30
+    cases["NaN, -0 and large values"] = special
+
+    out = new_landmark_array()
+    for name, landmarks in cases.items():
+        expected = _reference(landmarks)
+        actual = extract_landmarks(landmarks, out)
+        same = np.array_equal(actual.view(np.uint32), expected.view(np.uint32))
+        print(f"{'✓' if same else '❌'} {name}: {'bit-identical' if same else 'differs from the message API'}")
+
+
+if __name__ == "__main__":
+    run_check()
@@ -0,0 +1,89 @@
+import sys
+import os
+import timeit
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mediapipe.framework.formats import landmark_pb2
+from src.landmark_array import new_landmark_array, extract_landmarks
+from src.constants import (
+    NOSE_INDEX, LEFT_HIP_INDEX, RIGHT_HIP_INDEX, LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX,
+    LEFT_KNEE_INDEX, RIGHT_KNEE_INDEX, LEFT_SHOULDER_INDEX, RIGHT_SHOULDER_INDEX
+)
+
+REQUIRED_LANDMARKS = [
+    NOSE_INDEX, LEFT_HIP_INDEX, RIGHT_HIP_INDEX, LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX,
+    LEFT_KNEE_INDEX, RIGHT_KNEE_INDEX, LEFT_SHOULDER_INDEX, RIGHT_SHOULDER_INDEX
+]
+VISIBILITY_THRESHOLD = 0.5
+RUNS = 20000
+
+# Serialized NormalizedLandmarkList record: 0x0a <len=25> | 0x0d x | 0x15 y | 0x1d z | 0x25 visibility | 0x2d presence
+RECORD_SIZE = 27
+RECORD_TAGS = ((0, 0x0A), (1, 25), (2, 0x0D), (7, 0x15), (12, 0x1D), (17, 0x25), (22, 0x2D))
+
+
+def make_landmarks(with_presence=True):
+    """A pose landmark list shaped like MediaPipe output"""
+    rng = np.random.default_rng(0)
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for _ in range(33):
+        fields = dict(x=rng.random(), y=rng.random(), z=rng.random() - 0.5, visibility=0.5 + rng.random() / 2)
+        if with_presence:
+            fields["presence"] = 0.5 + rng.random() / 2
+        landmarks.landmark.add(**fields)
+    return landmarks
+
+
+def two_pass(landmarks):
+    """Previous code path: visibility loop, then a fresh array from a list comprehension"""
+    for landmark_idx in REQUIRED_LANDMARKS:
+        if landmark_idx >= len(landmarks.landmark) or landmarks.landmark[landmark_idx].visibility < VISIBILITY_THRESHOLD:
+            return None
+    return np.array([[lm.x, lm.y, lm.z] for lm in landmarks.landmark])
+
+
+def single_pass(landmarks, out, points):
+    """Current code path: one extraction into a reused array, a vectorized mask, then a reused float64 buffer"""
+    landmark_array = extract_landmarks(landmarks, out)
+    if float(landmark_array[REQUIRED_LANDMARKS, 3].min()) < VISIBILITY_THRESHOLD:
+        return None
+    np.copyto(points, landmark_array[:, :3])
+    return points
+
+
+def serialized_view(landmarks, out):
+    """Alternative not used: read x, y, z, visibility in place from the serialized bytes (None if the layout differs)"""
+    data = landmarks.SerializeToString()
+    num_landmarks = len(out)
+    if len(data) != num_landmarks * RECORD_SIZE or any(
+            data[column::RECORD_SIZE] != bytes((tag,)) * num_landmarks for column, tag in RECORD_TAGS):
+        return None
+    out[:] = np.ndarray((num_landmarks, 4), dtype="<f4", buffer=data, offset=3, strides=(RECORD_SIZE, 5))
+    return out
+
+
+def run_benchmark():
+    out = new_landmark_array()
+    points = np.zeros((len(out), 3))
+    for label, landmarks in (("MediaPipe output", make_landmarks()),
+                             ("without presence", make_landmarks(with_presence=False))):
+        assert np.array_equal(two_pass(landmarks), single_pass(landmarks, out, points))
+        old = timeit.timeit(lambda: two_pass(landmarks), number=RUNS) / RUNS
+        new = timeit.timeit(lambda: single_pass(landmarks, out, points), number=RUNS) / RUNS
+        print(f"{label}: two-pass {old * 1e6:.1f} us/frame, single-pass {new * 1e6:.1f} us/frame "
+              f"({old / new:.1f}x)")
+
+    landmarks = make_landmarks()
+    assert np.array_equal(serialized_view(landmarks, new_landmark_array()), extract_landmarks(landmarks, out))
+    api = timeit.timeit(lambda: extract_landmarks(landmarks, out), number=RUNS) / RUNS
+    wire = timeit.timeit(lambda: serialized_view(landmarks, out), number=RUNS) / RUNS
+    print(f"extraction alone: message API {api * 1e6:.1f} us/frame, serialized bytes in place {wire * 1e6:.1f} us/frame")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,61 @@
+import json
+import sys
+import os
+from dataclasses import replace
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.apps.original.movement_analyzer import MovementAnalyzer
+from analyze_sequence_check import extract_recording
+from move_matching import match_moves
+
+SETTINGS = {
+    "raw": {},
+    "smoothed": {"landmark_smoothing": True},
+    "smoothed, same parameters for all joints": {"landmark_smoothing": True, "one_euro_group_params": {}},
+}
+
+
+def run_check():
+    """Report detection latency and false positives of the original app with and without landmark smoothing"""
+    with open(os.path.join(os.path.dirname(__file__), 'tests.json'), 'r') as file:
+        test_config = json.load(file)
+
+    mp_pose = MovementDetector(config=MovementConfig(), useCamera=False, headless=True).pose_detector.mp_pose
+    totals = {name: [[], 0, 0, 0, 0] for name in SETTINGS}
+    for test_name, test_data in test_config.items():
+        video_path = os.path.abspath(os.path.join(os.path.dirname(__file__), test_data["video_path"]))
+        if not os.path.exists(video_path):
+            print(f"{test_name}: skipped, {test_data['video_path']} not found")
+            continue
+
+        landmarks, timestamps = extract_recording(video_path, MovementConfig(app_name="original"))
+        print(f"{test_name}: expected {[(move['move_key'], move['from_frame']) for move in test_data['moves']]}")
+        for name, overrides in SETTINGS.items():
+            config = replace(MovementConfig(app_name="original"), **overrides)
+            detected = MovementAnalyzer(config, mp_pose).analyze_sequence(landmarks, timestamps)
+            latencies, in_window, misses, false_positives = match_moves(test_data["moves"], detected)
+            total = totals[name]
+            total[0] += latencies
+            total[1] += in_window
+            total[2] += len(test_data["moves"])
+            total[3] += misses
+            total[4] += false_positives
+            print(f"  {name}: {detected}")
+            print(f"    latency {latencies} frames, {in_window} in window, {misses} missed, {false_positives} false positives")
+
+    print("Total:")
+    for name, (latencies, in_window, expected, misses, false_positives) in totals.items():
+        mean_latency = np.mean(latencies) if latencies else float("nan")
+        print(f"  {name}: {in_window}/{expected} in window, mean latency {mean_latency:+.2f} frames, "
+              f"{misses} missed, {false_positives} false positives")
+
+
+if __name__ == "__main__":
+    run_check()
@@ -0,0 +1,36 @@
+# Detections this many frames around an expected window still count as that move, early or late
+MATCH_MARGIN = 10
+
+
+def pair_moves(expected, detected):
+    """Pair each expected move with the first unused detection of the same key near its window
+
+    Returns:
+        (frames after from_frame of each expected move, None if missed; count in window, false positives)
+    """
+    used = set()
+    latencies = []
+    in_window = 0
+    for move in expected:
+        latency = None
+        for index, (frame, key) in enumerate(detected):
+            if index in used or key != move["move_key"]:
+                continue
+            if move["from_frame"] - MATCH_MARGIN <= frame <= move["to_frame"] + MATCH_MARGIN:
+                used.add(index)
+                latency = frame - move["from_frame"]
+                in_window += move["from_frame"] <= frame <= move["to_frame"]
+                break
+        latencies.append(latency)
+    return latencies, in_window, len(detected) - len(used)
+
+
+def match_moves(expected, detected):
+    """Match expected moves with detections, see pair_moves()
+
+    Returns:
+        (latencies of the matched moves in frames after from_frame, count in window, misses, false positives)
+    """
+    latencies, in_window, false_positives = pair_moves(expected, detected)
+    matched = [latency for latency in latencies if latency is not None]
+    return matched, in_window, len(expected) - len(matched), false_positives
@@ -0,0 +1,82 @@
+import json
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.apps.original.movement_analyzer import MovementAnalyzer
+from analyze_sequence_check import extract_recording, _LandmarkList
+
+# Runs per path; classes and rules alternate, so machine load drifts affect both alike
+REPEATS = 15
+
+def _streaming(config, mp_pose, frames, timestamps):
+    analyzer = MovementAnalyzer(config, mp_pose)
+    start_time = time.perf_counter()
+    events = []
+    for frame_index, frame in enumerate(frames):
+        if movement := analyzer.check_for_movment(frame, float(timestamps[frame_index])):
+            events.append((frame_index, movement))
+    return events, time.perf_counter() - start_time
+
+
+def _batch(config, mp_pose, landmarks, timestamps):
+    analyzer = MovementAnalyzer(config, mp_pose)
+    start_time = time.perf_counter()
+    events = analyzer.analyze_sequence(landmarks, timestamps)
+    return events, time.perf_counter() - start_time
+
+
+def run_check():
+    """Compare the rules file of the original app with its movement classes on the tests.json videos"""
+    with open(os.path.join(os.path.dirname(__file__), 'tests.json'), 'r') as file:
+        test_config = json.load(file)
+
+    for test_name, test_data in test_config.items():
+        video_path = os.path.abspath(os.path.join(os.path.dirname(__file__), test_data["video_path"]))
+        if not os.path.exists(video_path):
+            print(f"{test_name}: skipped, {test_data['video_path']} not found")
+            continue
+
+        landmarks, timestamps = extract_recording(video_path, MovementConfig(app_name="original"))
+        mp_pose = MovementDetector(config=MovementConfig(), useCamera=False, headless=True).pose_detector.mp_pose
+        frames = [None if np.isnan(rows).any() else _LandmarkList(rows) for rows in landmarks]
+
+        print(f"{test_name}:")
+        for time_based_windows in (False, True):
+            configs = {movement_rules: MovementConfig(app_name="original", movement_rules=movement_rules,
+                                                      time_based_windows=time_based_windows)
+                       for movement_rules in (False, True)}
+            runs = {movement_rules: ([], []) for movement_rules in configs}
+            for _ in range(REPEATS):
+                for movement_rules, config in configs.items():
+                    runs[movement_rules][0].append(_streaming(config, mp_pose, frames, timestamps))
+                    runs[movement_rules][1].append(_batch(config, mp_pose, landmarks, timestamps))
+            results = {
+                movement_rules: (
+                    streaming[0][0], batch[0][0],
+                    min(elapsed for _, elapsed in streaming) * 1e6 / len(landmarks),
+                    min(elapsed for _, elapsed in batch) * 1e6 / len(landmarks),
+                )
+                for movement_rules, (streaming, batch) in runs.items()
+            }
+
+            classes, rules = results[False], results[True]
+            identical = classes[0] == rules[0] and classes[1] == rules[1]
+            result = "✓ identical events" if identical else "❌ events differ"
+            print(f"  {'time' if time_based_windows else 'frame'} windows: {result} {rules[0]}")
+            if not identical:
+                print(f"    classes {classes[0]}, rules {rules[0]} (analyze_sequence {rules[1]})")
+            print(f"    streaming: classes {classes[2]:.1f} us/frame, rules {rules[2]:.1f} us/frame")
+            print(f"    analyze_sequence: classes {classes[3]:.1f} us/frame, rules {rules[3]:.1f} us/frame")
+
+
+if __name__ == "__main__":
+    run_check()
@@ -71,7 +71,8 @@ def run_movement_tests():
             config=config,
             useCamera=False,
             callback=movement_callback,
-            isTest=True
+            isTest=True,
+            headless=True
         )
         
         # Add debug info
@@ -0,0 +1,63 @@
+import sys
+import os
+import time
+from dataclasses import replace
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.apps.original.movement_analyzer import MovementAnalyzer
+from analyze_sequence_check import VIDEOS_DIR, extract_recording
+
+
+def _landmark_stats(landmarks, reference, visibility_threshold):
+    """Mean x, y distance to the reference and mean frame-to-frame acceleration, both in % of the frame"""
+    both = ~np.isnan(landmarks).any(axis=2) & ~np.isnan(reference).any(axis=2)
+    both &= (landmarks[:, :, 3] >= visibility_threshold) & (reference[:, :, 3] >= visibility_threshold)
+    error = np.hypot(*(landmarks[:, :, :2] - reference[:, :, :2]).transpose(2, 0, 1))[both].mean() * 100
+
+    def jitter(points):
+        # Second difference over three consecutive frames with the landmark visible in both runs
+        steady = both[2:] & both[1:-1] & both[:-2]
+        second = points[2:, :, :2] - 2 * points[1:-1, :, :2] + points[:-2, :, :2]
+        return np.hypot(second[..., 0], second[..., 1])[steady].mean() * 100
+
+    return error, jitter(landmarks), jitter(reference)
+
+
+def run_check():
+    """Compare person_crop landmarks and events with full-frame inference on every test video"""
+    mp_pose = MovementDetector(config=MovementConfig(), useCamera=False, headless=True).pose_detector.mp_pose
+    videos = sorted(name for name in os.listdir(VIDEOS_DIR) if name.endswith('.mp4'))
+    for name in videos:
+        path = os.path.join(VIDEOS_DIR, name)
+        config = MovementConfig(app_name="original")
+        start_time = time.perf_counter()
+        reference, timestamps = extract_recording(path, config)
+        full_time = (time.perf_counter() - start_time) / len(reference)
+        crop_config = replace(config, person_crop=True)
+        crop_detector = MovementDetector(config=crop_config, useCamera=False, headless=True)
+        start_time = time.perf_counter()
+        cropped, _ = extract_recording(path, crop_config, crop_detector)
+        crop_time = (time.perf_counter() - start_time) / len(cropped)
+
+        reference_events = MovementAnalyzer(config, mp_pose).analyze_sequence(reference, timestamps)
+        crop_events = MovementAnalyzer(config, mp_pose).analyze_sequence(cropped, timestamps)
+        error, jitter, reference_jitter = _landmark_stats(cropped, reference, config.visibility_threshold)
+        same = "✓ same events" if crop_events == reference_events else "❌ events differ"
+        print(f"{name}: {same}")
+        print(f"  full frame {reference_events}, {full_time * 1000:.1f} ms/frame")
+        print(f"  person_crop {crop_events}, {crop_time * 1000:.1f} ms/frame, "
+              f"crop region moved {crop_detector.pose_detector.crop_changes} times")
+        print(f"  landmark distance to full frame {error:.2f}% of the frame, "
+              f"jitter {jitter:.3f}% (full frame {reference_jitter:.3f}%), "
+              f"pose found on {(~np.isnan(cropped).any(axis=(1, 2))).sum()}/{len(cropped)} frames")
+
+
+if __name__ == "__main__":
+    run_check()
@@ -0,0 +1,97 @@
+import sys
+import os
+import time
+import pickle
+import zlib
+from importlib import import_module
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from analyze_sequence_check import VIDEOS_DIR, extract_recording, _LandmarkList
+
+CHUNK_FRAMES = 25
+
+
+class _Payload:
+    """Pickles to a call that marks it as executed"""
+    executed = False
+
+    def __reduce__(self):
+        return (setattr, (_Payload, "executed", True))
+
+
+def _check_tampered(analyzer):
+    """A pickle in place of a snapshot is rejected without being unpickled"""
+    try:
+        analyzer.restore(zlib.compress(pickle.dumps({"version": 2, "payload": _Payload()}), 1))
+        rejected = False
+    except ValueError:
+        rejected = True
+    ok = "✓" if rejected and not _Payload.executed else "❌"
+    print(f"{ok} pickled snapshot rejected: {rejected}, payload executed: {_Payload.executed}")
+
+
+def _stream(analyzer, landmarks, timestamps, first_frame=0):
+    events = []
+    for frame_index, rows in enumerate(landmarks, first_frame):
+        frame = None if np.isnan(rows).any() else _LandmarkList(rows)
+        if movement := analyzer.check_for_movment(frame, float(timestamps[frame_index - first_frame])):
+            events.append((frame_index, movement))
+    return events
+
+
+def run_check(app_name="original"):
+    """Resume analysis from snapshots, streaming and in chunks, and compare with uninterrupted runs"""
+    MovementAnalyzer = import_module(f"src.apps.{app_name}.movement_analyzer").MovementAnalyzer
+    config = MovementConfig(app_name=app_name)
+    mp_pose = MovementDetector(config=config, useCamera=False, headless=True).pose_detector.mp_pose
+    _check_tampered(MovementAnalyzer(config, mp_pose))
+    videos = sorted(name for name in os.listdir(VIDEOS_DIR) if name.endswith('.mp4'))
+    for name in videos:
+        landmarks, timestamps = extract_recording(os.path.join(VIDEOS_DIR, name), config)
+        reference = MovementAnalyzer(config, mp_pose).analyze_sequence(landmarks, timestamps)
+
+        # Streaming: stop halfway, continue in a fresh analyzer
+        half = len(landmarks) // 2
+        first = MovementAnalyzer(config, mp_pose)
+        events = _stream(first, landmarks[:half], timestamps[:half])
+        snapshot = first.snapshot()
+        second = MovementAnalyzer(config, mp_pose)
+        second.restore(snapshot)
+        events += _stream(second, landmarks[half:], timestamps[half:], half)
+        resumed = "✓" if events == reference else "❌"
+
+        # Chunks analyzed by a new analyzer each, handing the state over through snapshots
+        chunked_events = []
+        snapshot = None
+        sizes = []
+        seconds = []
+        for start in range(0, len(landmarks), CHUNK_FRAMES):
+            analyzer = MovementAnalyzer(config, mp_pose)
+            if snapshot is not None:
+                start_time = time.perf_counter()
+                analyzer.restore(snapshot)
+                seconds.append(time.perf_counter() - start_time)
+            chunk = slice(start, start + CHUNK_FRAMES)
+            chunked_events += [(start + index, movement) for index, movement
+                               in analyzer.analyze_sequence(landmarks[chunk], timestamps[chunk])]
+            start_time = time.perf_counter()
+            snapshot = analyzer.snapshot()
+            seconds[-1:] = [seconds[-1] + time.perf_counter() - start_time] if seconds else []
+            sizes.append(len(snapshot))
+        chunked = "✓" if chunked_events == reference else "❌"
+
+        print(f"{name}: {reference}")
+        print(f"  {resumed} resumed halfway while streaming, {chunked} chunks of {CHUNK_FRAMES} frames: {chunked_events}")
+        print(f"  snapshot {np.mean(sizes):.0f} bytes, "
+              f"restore + snapshot {np.mean(seconds) * 1e6 if seconds else 0:.0f} us")
+
+
+if __name__ == "__main__":
+    run_check(sys.argv[1] if len(sys.argv) > 1 else "original")
@@ -0,0 +1,53 @@
+import sys
+import os
+from importlib import import_module
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from analyze_sequence_check import VIDEOS_DIR, extract_recording, _LandmarkList
+
+# Capture clocks a real camera may run at, all close enough to 30 FPS to give the frame mode events
+CLOCKS = {
+    "30.00 fps": lambda count, rng: np.arange(count) / 30.0,
+    "30.01 fps": lambda count, rng: np.arange(count) / 30.01,
+    "29.97 fps": lambda count, rng: np.arange(count) / 29.97,
+    "30 fps, +-4 ms jitter": lambda count, rng: np.arange(count) / 30.0 + rng.uniform(-0.004, 0.004, count),
+}
+
+
+def run_check(app_name="original"):
+    """Compare time-based windows on near-30 FPS and jittered clocks with frame mode on every test video"""
+    MovementAnalyzer = import_module(f"src.apps.{app_name}.movement_analyzer").MovementAnalyzer
+    mp_pose = MovementDetector(config=MovementConfig(), useCamera=False, headless=True).pose_detector.mp_pose
+    videos = sorted(name for name in os.listdir(VIDEOS_DIR) if name.endswith('.mp4'))
+    rng = np.random.default_rng(0)
+
+    for name in videos:
+        config = MovementConfig(app_name=app_name)
+        landmarks, timestamps = extract_recording(os.path.join(VIDEOS_DIR, name), config)
+        frame_events = MovementAnalyzer(config, mp_pose).analyze_sequence(landmarks, timestamps)
+        print(f"{name}: frame mode {frame_events}")
+
+        time_config = MovementConfig(app_name=app_name, time_based_windows=True)
+        frames = [None if np.isnan(rows).any() else _LandmarkList(rows) for rows in landmarks]
+        for clock, make_times in CLOCKS.items():
+            times = make_times(len(landmarks), rng)
+            streaming = MovementAnalyzer(time_config, mp_pose)
+            streaming_events = []
+            for frame_index, frame in enumerate(frames):
+                if movement := streaming.check_for_movment(frame, float(times[frame_index])):
+                    streaming_events.append((frame_index, movement))
+            sequence_events = MovementAnalyzer(time_config, mp_pose).analyze_sequence(landmarks, times)
+            for path, events in (("streaming", streaming_events), ("analyze_sequence", sequence_events)):
+                result = "✓ same events" if events == frame_events else f"❌ events differ {events}"
+                print(f"  {clock}, {path}: {result}")
+
+
+if __name__ == "__main__":
+    run_check(sys.argv[1] if len(sys.argv) > 1 else "original")
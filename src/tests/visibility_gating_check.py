@@ -0,0 +1,81 @@
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path to import modules from src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.config import MovementConfig
+from src.movement_detector import MovementDetector
+from src.apps.original.movement_analyzer import MovementAnalyzer
+from src.constants import LEFT_KNEE_INDEX, RIGHT_KNEE_INDEX, LEFT_HEEL_INDEX, RIGHT_HEEL_INDEX
+from analyze_sequence_check import VIDEOS_DIR, extract_recording, _LandmarkList
+
+# Fraction of frames whose occluded landmarks drop below the visibility threshold
+OCCLUDED_FRACTION = 0.3
+# Length of the runs of frames a landmark stays occluded for
+OCCLUDED_RUN_FRAMES = 4
+
+OCCLUSIONS = {
+    "knees": [LEFT_KNEE_INDEX, RIGHT_KNEE_INDEX],
+    "heels": [LEFT_HEEL_INDEX, RIGHT_HEEL_INDEX],
+}
+
+
+def _stream(analyzer, landmarks, timestamps):
+    frames = [None if np.isnan(rows).any() else _LandmarkList(rows) for rows in landmarks]
+    events = []
+    for frame_index, frame in enumerate(frames):
+        if movement := analyzer.check_for_movment(frame, float(timestamps[frame_index])):
+            events.append((frame_index, movement))
+    return events
+
+
+def _occlude(landmarks, frames, joints, rng):
+    """Drop the joints' visibility on the frames and give them random coordinates, as a pose model guessing"""
+    occluded = landmarks.copy()
+    occluded[np.ix_(frames, joints, [3])] = 0.0
+    occluded[np.ix_(frames, joints, [0, 1, 2])] = rng.random((len(frames), len(joints), 3))
+    return occluded
+
+
+def run_check():
+    """Occlude landmarks on some frames and show which detectors keep running, streaming and in a batch
+
+    Occluded landmarks get random coordinates, twice with different values:
+    a hidden landmark's coordinates must not change any event.
+    """
+    mp_pose = MovementDetector(config=MovementConfig(), useCamera=False, headless=True).pose_detector.mp_pose
+    rng = np.random.default_rng(0)
+    videos = sorted(name for name in os.listdir(VIDEOS_DIR) if name.endswith('.mp4'))
+    for name in videos:
+        landmarks, timestamps = extract_recording(os.path.join(VIDEOS_DIR, name), MovementConfig(app_name="original"))
+        for movement_rules in (False, True):
+            config = MovementConfig(app_name="original", movement_rules=movement_rules)
+            reference = MovementAnalyzer(config, mp_pose).analyze_sequence(landmarks, timestamps)
+            print(f"{name} ({'rules' if movement_rules else 'classes'}): {reference}")
+
+            for occlusion, joints in OCCLUSIONS.items():
+                # Runs of occluded frames, so landmarks come back after being hidden for a while
+                starts = rng.random(len(landmarks)) < OCCLUDED_FRACTION / OCCLUDED_RUN_FRAMES
+                frames = np.flatnonzero(np.convolve(starts, np.ones(OCCLUDED_RUN_FRAMES), "full")[:len(landmarks)] > 0)
+                occluded = _occlude(landmarks, frames, joints, rng)
+                reoccluded = _occlude(landmarks, frames, joints, rng)
+
+                analyzer = MovementAnalyzer(config, mp_pose)
+                batch_events = analyzer.analyze_sequence(occluded, timestamps)
+                streaming_events = _stream(MovementAnalyzer(config, mp_pose), occluded, timestamps)
+                other_events = MovementAnalyzer(config, mp_pose).analyze_sequence(reoccluded, timestamps)
+                consistent = "✓" if batch_events == streaming_events else "❌ streaming differs,"
+                independent = "✓" if batch_events == other_events else f"❌ hidden coordinates leak: {other_events},"
+                blocked = [detector.name for detector in analyzer.movement_detectors
+                           if set(joints) & set(detector.required_joints)]
+                print(f"  {occlusion} occluded on {len(frames)} frames: {consistent} {independent} {batch_events}")
+                print(f"    {'same as unoccluded' if batch_events == reference else 'differs from unoccluded'}, "
+                      f"detectors gated on those frames: {blocked or 'none'}")
+
+
+if __name__ == "__main__":
+    run_check()